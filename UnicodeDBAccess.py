@@ -0,0 +1,2095 @@
+#!/usr/bin/env python3
+#
+# UnicodeDBAccess.py: Load and query the Unicode Character Database.
+# 2021-04-08: Written by Steven J. DeRose (as part of strfchr.py).
+#
+import sys
+import os
+import codecs
+import io
+import re
+import json
+import hashlib
+import mmap
+import zipfile
+from xml.etree import ElementTree
+from array import array
+from bisect import bisect_right
+from collections import OrderedDict
+from typing import Dict, List, Iterable, Iterator, Tuple
+import logging
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+lg = logging.getLogger("UnicodeDBAccess")
+
+__metadata__ = {
+    "title"        : "UnicodeDBAccess",
+    "description"  : "Load and query the Unicode Character Database.",
+    "rightsHolder" : "Steven J. DeRose",
+    "creator"      : "http://viaf.org/viaf/50334488",
+    "type"         : "http://purl.org/dc/dcmitype/Software",
+    "language"     : "Python 3.7",
+    "created"      : "2021-04-08",
+    "modified"     : "2026-10-17",
+    "publisher"    : "http://github.com/sderose",
+    "license"      : "https://creativecommons.org/licenses/by-sa/3.0/"
+}
+__version__ = __metadata__["modified"]
+
+descr = """
+=Name=
+
+UnicodeDBAccess: Load and query the Unicode Character Database.
+
+
+=Description=
+
+Load the Unicode Character Database ("UCD"), from either the XML form
+[https://www.unicode.org/reports/tr42/] or the semicolon-delimited
+`UnicodeData.txt` form [https://www.unicode.org/reports/tr44/], and
+provide access to the properties of each character.
+
+The text form is spread over several files: given a directory,
+`readUcdDirectory()` loads `UnicodeData.txt` (keeping `<..., First>` and
+`<..., Last>` pairs as single ranges), then whichever of `PropList.txt`,
+`DerivedCoreProperties.txt`, `Scripts.txt`, `Blocks.txt`, `LineBreak.txt`,
+etc. are there (see PROPERTY_FILES), all through `readSemicolonFile()`.
+If `PropertyAliases.txt` and `PropertyValueAliases.txt` are there, too,
+properties and values are stored under their short names, as in the XML.
+
+To compare versions (say, the one a corpus was checked against, and the
+current one), load them side by side into a `UcdVersions`. The versions
+share one table of interned values per property, so `diff()` can compare
+value codes run by run. It returns RangeSets of the code points that were
+`added`, `removed`, or `changed` for that property, plus the list of
+changed ranges with their old and new values:
+
+    uv = UcdVersions()
+    uv.load("5.2", [ "ucd-5.2.0/ucd.nounihan.grouped.zip" ])
+    uv.load("15.1", [ "ucd-15.1.0/ucd.nounihan.grouped.zip" ])
+    d = uv.diff("lb", "5.2", "15.1")
+    print(d.toString(), d.changed.toString())
+    uv.diffAll("5.2", "15.1")  # { prop: PropertyDiff } for all that differ
+
+From the command line, use `--diffWith` for the older version's file(s).
+
+Unihan is big, and usually only a few of its fields are needed, for a few
+characters. `openUnihan()` gives a `UnihanShards`, which indexes
+`Unihan.zip` once (keeping the index under `~/.strfchr/ucd/`), and then
+loads a field for a run of 256 code points only when one of them is asked
+for (keeping the most recently used ones):
+
+    udb.openUnihan("Unihan.zip")
+    udb.getUnihan(0x4E00, "kDefinition")
+    udb.unihanShards.lookup(0x4E00)  # { field: value } for all its fields
+
+(The `ucd.unihan.*` XML files can instead be read with `readUdbXml()`,
+with `keep` naming just the fields needed.)
+
+The data is kept by column: for each property there is a sorted array of
+the code points where its value changes, and a parallel array of small
+integer codes for the values from there on. The distinct values of each
+property are interned, and the codes index into that list. Looking up a
+character is a binary search; and since neighboring characters mostly
+share values, most properties take a few kilobytes rather than megabytes
+(names and other per-character properties are the exception). Ranges such
+as `<char first-cp="4E00" last-cp="9FFF" .../>` stay single runs.
+
+Per-character access works as before, via `charEntries`:
+
+    udb = UnicodeDBAccess()
+    udb.readUdbXml("ucd.nounihan.grouped.xml")
+    print(udb.charEntries[0x2022]["na"])
+    print(udb.charEntries.findAll("lb", "BA"))
+
+For "which characters have X=Y" questions, `where()` returns a `RangeSet`
+from an inverted index (value to ranges of code points), built per
+property on first use. RangeSets combine with `&`, `|`, `-`, `^`, and `~`,
+working on the ranges rather than on individual characters, and `query()`
+takes the same thing as a string:
+
+    udb.where("lb", "BA") & ~udb.where("gc", "Zs")
+    udb.query("(Dash | Hyphen) - gc=Pd")
+
+Parsing the UCD takes a while, so `load()` compiles the tables into a binary
+snapshot file (by default under `~/.strfchr/ucd/`), and on later runs just
+maps it in with `mmap`: there's no parsing (beyond the lists of distinct
+values), and processes using the same snapshot share its pages. A snapshot
+is only used if the source files' paths, sizes, and mtimes (and the UCD
+version, if one is asked for) match what it was made from; otherwise the
+files are parsed again and the snapshot rewritten.
+
+    udb = UnicodeDBAccess()
+    udb.load([ "ucd.nounihan.grouped.zip" ])
+
+For lookups in tight loops, `compileTable()` turns a property into a
+`TwoStageTable` (as CPython's `unicodedata` does internally): blocks of
+code points that share values are stored once, and a lookup is a couple of
+array indexes. `TwoStageTable.fromFunction()` does the same for any
+function of a character, such as `unicodedata.east_asian_width`.
+`lookupMany()` looks up a whole array of code points at once, vectorized
+if `numpy` is available.
+
+    gcTable = udb.compileTable("gc")
+    gcTable.lookup(0x2022)                # "Po"
+    eaTable = TwoStageTable.fromFunction(unicodedata.east_asian_width)
+
+Each `charEntries[cp]` makes a new `UdbEntry` dict of that character's
+properties; changing it does not change the store.
+
+The XML is read incrementally, so even `ucd.all.flat.zip` can be loaded
+without building a DOM; pass `keep=[...]` to `readUdbXml()` to load only
+the properties you need.
+
+
+=Related Commands=
+
+`strfchr.py`, which used to contain this code.
+
+`CharDisplay.py` (in my PYTHONLIBS repo), `ord`.
+
+
+=Known bugs and Limitations=
+
+Code points must be loaded in increasing order (as they are in the
+data files).
+
+
+=History=
+
+* 2021-04-08: Written by Steven J. DeRose, as part of `strfchr.py`.
+* 2021-10-28: Support loading from XML or CSV(ish).
+* 2026-10-17: Split out of `strfchr.py`. Store properties by column, with
+interned values.
+* 2026-10-17: Read the XML incrementally (and from zip files), with an optional list
+of properties to keep.
+* 2026-10-17: Store each property as runs of identical values, rather than
+one entry per character.
+* 2026-10-17: Add RangeSet, an inverted index per property, and `where()`
+and `query()` (also `--where`).
+* 2026-10-17: Add `load()`, with memory-mapped snapshots of the tables.
+* 2026-10-17: Add TwoStageTable, and `compileTable()`.
+* 2026-10-17: Stream UnicodeData.txt, keeping First/Last ranges, with typed
+values. Add `readSemicolonFile()`, and loading of PropList.txt, Scripts.txt,
+Blocks.txt, etc., and the aliases files. Convert string values to those
+types in `where()` and `query()` (so "ccc=230" works).
+* 2026-10-17: Add UcdVersions, with value tables shared between versions,
+and per-property diffs. Add `--diffWith` and `--diffProperty`.
+* 2026-10-17: Add UnihanShards, for lazy access to Unihan by field and shard
+of code points. Add `--unihan`, `--unihanChar`, and `--unihanField`.
+
+
+=Rights=
+
+Copyright 2021-04-08 by Steven J. DeRose. This work is licensed under a
+Creative Commons Attribution-Share-alike 3.0 unported license.
+See [http://creativecommons.org/licenses/by-sa/3.0/] for more information.
+
+For the most recent version, see [http://www.derose.net/steve/utilities]
+or [https://github.com/sderose].
+
+
+=Options=
+"""
+
+verbose = 0
+def log(lvl:int, msg:str) -> None:
+    if (verbose >= lvl): sys.stderr.write(msg+"\n")
+
+
+###############################################################################
+#
+# typename      must match         tgt type
+UNKNOWN = (str, r".*",             str,   )
+UBOOL   = (str, r"^[NY]$",         bool,  )
+UDECINT = (str, r"^[\d]{1,8}$",    int,   )
+UHEXINT = (str, r"^[\dA-F]{1,5}$", int,   )
+OHEXINT = (str, r"^([\dA-F]{1,5}|#)$", str,   )   # Optional UHEXINT
+UHEXINTS = (str, r"^([\dA-F]{1,5})(\s+[\dA-F]{1,5})*$", int,   )  # 1 or more
+UTOKEN  = (str, r"^\w+$",          str,   )
+UTBOOL  = (str, r"%[NYM]$",        str,   )
+UGCAT   = (str, r"^[A-Z][a-z]$",   str,   )
+OCTO    = True  # Signals that "#" is ok
+
+# ??  Prepended_Concatenation_Mark; "InPC" ??
+# Many more unihan properties, all starting with "k".
+#
+UnicodeProperties = {
+    # Attribute name   (  freq, ),  #
+    "AHex":            (   254, None, UBOOL,   ),  # ASCII_Hex_Digit
+    "Alpha":           (  2122, None, UBOOL,   ),  # Alphabetic
+    "Bidi_C":          (   239, None, UBOOL,   ),  # Bidi_Control
+    "Bidi_M":          (   595, None, UBOOL,   ),  # mirrored
+    "CE":              (   310, None, UBOOL,   ),  # Composition_Exclusion
+    "CI":              (  1136, None, UBOOL,   ),  # Case_Ignorable
+    "CWCF":            (  1302, None, UBOOL,   ),  # Changes_When_Casefolded
+    "CWCM":            (   682, None, UBOOL,   ),  # Changes_When_Casemapped
+    "CWKCF":           (  1637, None, UBOOL,   ),  # Changes_When_NFKC_Casefolded
+    "CWL":             (  1255, None, UBOOL,   ),  # Changes_When_Lowercased
+    "CWT":             (  1278, None, UBOOL,   ),  # Changes_When_Titlecased
+    "CWU":             (  1256, None, UBOOL,   ),  # Changes_When_Uppercased
+    "Cased":           (   742, None, UBOOL,   ),  # Cased
+    "Comp_Ex":         (   363, None, UBOOL,   ),  # Full_Composition_Exclusion
+    "DI":              (   276, None, UBOOL,   ),  # Default_Ignorable_Code_Point
+    "Dash":            (   257, None, UBOOL,   ),  # Dash
+    "Dep":             (   247, None, UBOOL,   ),  #
+    "Dia":             (   683, None, UBOOL,   ),  # Diacritic
+    # Emoji properties
+    "Emoji":           (   683, None, UBOOL,   ),  #
+    "EPres":           (   683, None, UBOOL,   ),  #
+    "EMod":            (   683, None, UBOOL,   ),  #
+    "EBase":           (   683, None, UBOOL,   ),  #
+    "EComp":           (   683, None, UBOOL,   ),  #
+    "ExtPict":         (   683, None, UBOOL,   ),  #
+    #
+    "EqUIdeo":         (     0, None, UHEXINT, ),  # Equivalent_Unified_Ideograph
+    "Ext":             (   260, None, UBOOL,   ),  # Extender
+    "FC_NFKC":         (   840, None,    "",   ),  #
+    "GCB":             (  1672, None,   str,   ),  # Grapheme_Cluster_Break (2-3 letter code  )
+    "Gr_Base":         (  1429, None, UBOOL,   ),  # Grapheme_Base
+    "Gr_Ext":          (   921, None, UBOOL,   ),  # Grapheme_Extend
+    "Gr_Link":         (   259, None, UBOOL,   ),  # Grapheme_Link
+    "Hex":             (   276, None, UBOOL,   ),  # Hex_Digit
+    "Hyphen":          (   243, None, UBOOL,   ),  # Hyphen
+    "IDC":             (  1482, None, UBOOL,   ),  # ID_Continue,
+    "IDS":             (  2472, None, UBOOL,   ),  # ID_Start
+    "IDSB":            (   235, None, UBOOL,   ),  # IDS_Binary_Operator
+    "IDST":            (   234, None, UBOOL,   ),  # IDS_Trinary_Operator
+    "Ideo":            (   254, None, UBOOL,   ),  # Ideographic
+    "InSC":            (     0, None, UTOKEN,  ),  # Indic_Syllabic_Category
+    "JSN":             (   298, None, UTOKEN,  ),  # Jamo_Short_Name r"[A-Z]{0,3}"?
+    "Join_C":          (   234, None, UBOOL,   ),  # Join_Control
+    "LOE":             (   247, None, UBOOL,   ),  # Logical_Order_Exception
+    "Lower":           (  1805, None, UBOOL,   ),  # Lower_Case
+    "Math":            (   521, None, UBOOL,   ),  # Math
+    "NChar":           (   250, None, UBOOL,   ),  #
+    # Normal forms
+    "NFC_QC":          (   466, None, UTBOOL,  ),  # ..._Quick_Check { "Y" | "N" | "M" }?
+    "NFD_QC":          (   754, None, UBOOL,   ),  # ..._Quick_Check { "Y" | "N" }?
+    "NFKC_CF":         (  5952, OCTO, OHEXINT, ),  #  NKFC_Casefold { "#" | code-points }?
+    "NFKC_QC":         (   822, None, UTBOOL,  ),  # ..._Quick_Check { "Y" | "N" | "M" }?
+    "NFKD_QC":         (  1048, None, UBOOL,   ),  # ..._Quick_Check { "Y" | "N" }?
+    #
+    "OAlpha":          (   959, None, UBOOL,   ),  # Other_Alphabetic
+    "ODI":             (   242, None, UBOOL,   ),  # Other_Default_Ignorable_Code_Point
+    "OGr_Ext":         (   255, None, UBOOL,   ),  # Other_Grapheme_Extend
+    "OIDC":            (   243, None, UBOOL,   ),  # Other_ID_Continue
+    "OIDS":            (   236, None, UBOOL,   ),  # Other_ID_Start
+    "OLower":          (   381, None, UBOOL,   ),  # Other_Lower_Case
+    "OMath":           (   484, None, UBOOL,   ),  # Other_Math
+    "OUpper":          (   274, None, UBOOL,   ),  # Other_Upper_Case
+    "Pat_Syn":         (   384, None, UBOOL,   ),  # Pattern_Syntax
+    "Pat_WS":          (   243, None, UBOOL,   ),  # Pattern_White_Space
+    "QMark":           (   261, None, UBOOL,   ),  # Quotation_Mark
+    "Radical":         (   235, None, UBOOL,   ),  # Radical
+    "RI":              (     0, None, UBOOL,   ),  # Regional_Indicator
+    "SB":              (  4514, None,   str,   ),  # Sentence_Break (2 letter code  )
+    "SD":              (   278, None, UBOOL,   ),  # Soft_Dotted
+    "STerm":           (   298, None, UBOOL,   ),  # Sentence_Terminal
+    "Term":            (   393, None, UBOOL,   ),  # Terminal_Punctuation
+    "UIdeo":           (   248, None, UBOOL,   ),  # Unified_Ideograph
+    "Upper":           (  1701, None, UBOOL,   ),  # Upper_Case
+    "VS":              (   235, None, UBOOL,   ),  #
+    "WB":              (  2933, None,  str,    ),  # Word_Break (2-8 letter code)
+    "WSpace":          (   258, None, UBOOL,   ),  # White_Space
+    "XIDC":            (  1501, None, UBOOL,   ),  # XID_Continue
+    "XIDS":            (  2493, None, UBOOL,   ),  # XID_Start
+    "XO_NFC":          (   314, None, UBOOL,   ),  #
+    "XO_NFD":          (   729, None, UBOOL,   ),  #
+    "XO_NFKC":         (   818, None, UBOOL,   ),  #
+    "XO_NFKD":         (  1205, None, UBOOL,   ),  #
+    "age":             (  2213, None,  "1.1",  ),  # Version introduced, as \d+\.\d+
+    "bc":              (  1745, None,  "BN",   ),  # bidirectional class
+    "blk":             (                       ),  # Block name (_ not space)
+    "bmg":             (   594, None, UHEXINT, ),  # code point of mirror character
+    "bpb":             (     0,                ),  # bidi paired bracket
+    "bpt":             (     0,                ),  # bidi paired bracket type
+    "ccc":             (   694, None, UDECINT, ),  # decimal representation of the combining class.
+    "cf":              (  1349, OCTO, UHEXINT, ),  # Case_Folding { "#" | code-points }?
+    "cp":              ( 33248, None, UHEXINT, ),  # code point (hex)
+    "cps":             (   511, None, UNKNOWN, ),  #
+    "desc":            (    93, None, UNKNOWN, ),  #
+    "dm":              ( 17062, OCTO,     "#", ),  # decomposition mapping { "#"|code-points }?
+    "dt":              (  1968, None,     str, ),  # decomposition type { "can" |"com"|"enc"|"fin"
+    #|"font"|"fra"|"init"|"iso"|"med"|"nar" |"nb"  |"sml"|"sqr" |"sub"|"sup"|"vert"|"wide"|"none"}?
+    "ea":              (   929, None, UBOOL,   ),  # East Asian Width { "A"|"F"|"H"|"N"|"Na"|"W" }?
+    "first-cp":        (   631, None, UNKNOWN, ),  #
+    "gc":              (  4986, None,  UGCAT,  ),  # General Category (Lu, etc.)
+    "hst":             (   658, None,  "NA",   ),  # Hangul_Syll_Type { L|LV|LVT|T|V|NA }?
+    "ideograph":       (   237, None, UNKNOWN, ),  #
+    "isc":             (   232, None,   str,   ),  # ISO 10646 comment
+    "jg":              (   460, None,   str,   ),  # joining group (bug enum)
+    "jt":              (  1093, None,   str,   ),  # joining class { "U"|"C"|"T"|"D"|"L"|"R" }?
+    "last-cp":         (   631, None, UNKNOWN, ),  #
+    "lb":              (  3254, None,   str,   ),  # Line_Break  (big enum of 2-3 letter codes)
+    "lc":              (  1261, OCTO,   "#",   ),  #
+    "na":              ( 32416, None,    "",   ),  # Current name
+    "na1":             (  2236, None, UNKNOWN, ),  # Name in 1.0
+    "name":            (   615, None, UNKNOWN, ),  #
+    "new":             (     6, None, UNKNOWN, ),  #
+    "nt":              (  1120, None,  "None", ),  # numeric type { "None"|"De"|"Di"|"Nu" }?
+    "number":          (   237, None, UNKNOWN, ),  #
+    "nv":              (  1384, None,    "",   ),  # numeric value, represented as a fraction
+    "old":             (     6, None, UNKNOWN, ),  #
+    "radical":         (   237, None, UNKNOWN, ),  #
+    "sc":              (  1371, None,  "Zyyy", ),  # script (big enum of 4-char abbrs)
+    "scf":             (  1273, None, OHEXINT, ),  # Simple_Case_Folding
+    "slc":             (  1261, OCTO,  "#",    ),  #
+    "scx":             (     0, None,          ),  # script extension { list { script + }}?
+    "stc":             (  1269, OCTO,  "#",    ),  #
+    "suc":             (  1269, OCTO,  "#",    ),  #
+    "tc":              (  1317, OCTO,  "#",    ),  #
+    "uc":              (  1344, OCTO,  "#",    ),  #
+    "version":         (     6, None, UNKNOWN, ),  #
+    "vo":              (     0, None, str,     ),  # Vertical_Orientation { "U"|"R"|"Tu"|"Tr" }?
+    "when":            (    93, None, UNKNOWN, ),  #
+    "xmlns":           (     1, None, UNKNOWN, ),  #
+}
+
+
+# The fields of UnicodeData.txt, by the corresponding XML attribute names
+# where there is one. See [https://www.unicode.org/reports/tr44/#UnicodeData.txt].
+#
+UNICODEDATA_FIELDS = [
+    "cp",       # Code point (hex)
+    "na",       # Name
+    "gc",       # General category
+    "ccc",      # Canonical combining class
+    "bc",       # Bidi class
+    "dm",       # Decomposition type and mapping, like "<compat> 0020 0308"
+    "nv_De",    # Numeric value, if Decimal
+    "nv_Di",    # Numeric value, if Digit
+    "nv",       # Numeric value, as a fraction
+    "Bidi_M",   # Mirrored
+    "na1",      # Unicode 1.0 name
+    "isc",      # ISO 10646 comment
+    "suc",      # Simple uppercase mapping
+    "slc",      # Simple lowercase mapping
+    "stc",      # Simple titlecase mapping
+]
+
+# Properties whose values are stored as something other than strings.
+# Missing or empty values are None either way.
+PROPERTY_TYPES = {
+    "ccc":      int,
+    "nv_De":    int,
+    "nv_Di":    int,
+}
+
+# UCD files in the "XXXX..YYYY ; value" form, and the property each gives
+# (by short name). For those mapped to None, the second field is the name of
+# a (usually binary) property, and the third (if any) is its value.
+PROPERTY_FILES = {
+    "Blocks.txt":                   "blk",
+    "DerivedAge.txt":               "age",
+    "EastAsianWidth.txt":           "ea",
+    "GraphemeBreakProperty.txt":    "GCB",
+    "HangulSyllableType.txt":       "hst",
+    "LineBreak.txt":                "lb",
+    "Scripts.txt":                  "sc",
+    "SentenceBreakProperty.txt":    "SB",
+    "WordBreakProperty.txt":        "WB",
+    "DerivedCoreProperties.txt":    None,
+    "PropList.txt":                 None,
+    "emoji-data.txt":               None,
+}
+
+def readSemicolonFile(path:str) -> Iterator[Tuple[int, int, List[str]]]:
+    """Read one of the UCD's semicolon-delimited files, such as Scripts.txt:
+        0041..005A    ; Latin # L&  [26] LATIN CAPITAL LETTER A..
+    Generate (first, last, fields) for each record, where first and last
+    are the (inclusive) code point range from the first field (a single
+    code point has first == last), and fields are the rest, stripped.
+    Comments and blank lines are skipped. Lines are read one at a time.
+    """
+    with open(path, "r", encoding="utf-8") as ifh:
+        for rec in ifh:
+            rec = rec.partition("#")[0].strip()
+            if (not rec): continue
+            fields = [ f.strip() for f in rec.split(";") ]
+            first, _, last = fields[0].partition("..")
+            firstN = int(first, 16)
+            yield firstN, (int(last, 16) if last else firstN), fields[1:]
+
+def typedValue(prop:str, value):
+    """Convert a property value given as a string (say, from a query) to how
+    it's stored (see PROPERTY_TYPES), so "230" finds ccc 230. Returns None if
+    it can't be converted (so matches nothing).
+    """
+    if (prop not in PROPERTY_TYPES or not isinstance(value, str)): return value
+    try:
+        return PROPERTY_TYPES[prop](value)
+    except ValueError:
+        return None
+
+def looseName(s:str) -> str:
+    """Normalize a property or value name for loose matching (UAX #44 LM3):
+    ignore case, whitespace, underscores, and hyphens.
+    """
+    return re.sub(r"[\s_-]+", "", s).lower()
+
+
+###############################################################################
+#
+class UdbEntry(dict):
+    """A class intended to represent instances of entries from the Unicode
+    Database (see https://unicode.org/ucd/)
+    Keyed on the integer codepoint.
+    TODO: Better as a namedtuple?
+    """
+    def __init__(self, props:dict):
+        super(UdbEntry, self).__init__()
+        for k, v in props.items():
+            self[k] = v
+
+
+###############################################################################
+#
+class InternTable:
+    """Assign each distinct value of a property a small integer code, and
+    map codes back to values. Code 0 is always None (no value).
+    """
+    def __init__(self):
+        self.values = [ None ]
+        self.codes = { None: 0 }
+
+    @staticmethod
+    def fromValues(values:List) -> "InternTable":
+        vt = InternTable()
+        vt.values = list(values)
+        vt.codes = { v: i for i, v in enumerate(vt.values) }
+        return vt
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def intern(self, value) -> int:
+        try:
+            return self.codes[value]
+        except KeyError:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+            return code
+
+# Smallest array typecode that can hold the codes for a table of a given size.
+def codeTypeFor(nValues:int) -> str:
+    if (nValues <= 0x100): return "B"
+    if (nValues <= 0x10000): return "H"
+    return "I"
+
+
+###############################################################################
+#
+MAX_CP = 0x110000  # One past the last code point
+
+class RangeSet:
+    """An immutable set of code points, kept as a sorted array of boundaries:
+    [ start0, end0, start1, end1, ... ], where each [start, end) is a
+    half-open range in the set. A code point is in the set iff an odd number
+    of boundaries are <= it, so membership is one binary search, and
+    &, |, -, ^, and ~ (relative to the whole codespace) are a single merge
+    of the two boundary lists -- independent of how many code points are in
+    the sets.
+    """
+    def __init__(self, ranges:Iterable[Tuple[int, int]]=()):
+        """Make a set from (first, last) pairs (inclusive), in order.
+        Adjacent or overlapping ranges are merged.
+        """
+        self.bounds = array("I")
+        for first, last in ranges:
+            if (self.bounds and first <= self.bounds[-1]):
+                if (first < self.bounds[-2]):
+                    raise ValueError("Range U+%04x..U+%04x out of order." %
+                        (first, last))
+                self.bounds[-1] = max(self.bounds[-1], last + 1)
+            else:
+                self.bounds.append(first)
+                self.bounds.append(last + 1)
+
+    @staticmethod
+    def fromBounds(bounds:Iterable[int]) -> "RangeSet":
+        rs = RangeSet()
+        rs.bounds = array("I", bounds)
+        return rs
+
+    @staticmethod
+    def fromCodePoints(cps:Iterable[int]) -> "RangeSet":
+        return RangeSet((cp, cp) for cp in sorted(set(cps)))
+
+    def __contains__(self, cp:int) -> bool:
+        return bisect_right(self.bounds, cp) & 1 == 1
+
+    def __len__(self) -> int:
+        """The number of code points in the set.
+        """
+        b = self.bounds
+        return sum(b[1::2]) - sum(b[0::2])
+
+    def __bool__(self) -> bool:
+        return len(self.bounds) > 0
+
+    def __iter__(self) -> Iterator[int]:
+        b = self.bounds
+        for i in range(0, len(b), 2):
+            yield from range(b[i], b[i+1])
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, RangeSet) and self.bounds == other.bounds
+
+    def __hash__(self) -> int:
+        return hash(self.bounds.tobytes())
+
+    def __repr__(self) -> str:
+        return "RangeSet(%s)" % (self.toString())
+
+    def ranges(self) -> Iterator[Tuple[int, int]]:
+        """Generate the (first, last) ranges (inclusive), in order.
+        """
+        b = self.bounds
+        for i in range(0, len(b), 2):
+            yield b[i], b[i+1] - 1
+
+    def rangeCount(self) -> int:
+        return len(self.bounds) >> 1
+
+    def toString(self) -> str:
+        """Show as, e.g., "0009..000D 0020 0085".
+        """
+        return " ".join([ ("%04X" % (f)) if f == l else ("%04X..%04X" % (f, l))
+            for f, l in self.ranges() ])
+
+    def combine(self, other:"RangeSet", op) -> "RangeSet":
+        """Merge two sets' boundaries, keeping the code points for which
+        op(inSelf, inOther) is true.
+        """
+        keep = [ bool(op(False, False)), bool(op(False, True)),
+            bool(op(True, False)), bool(op(True, True)) ]
+        a, b = self.bounds, other.bounds
+        na, nb = len(a), len(b)
+        i = j = 0
+        inA = inB = 0
+        inOut = False
+        out = array("I")
+        while (i < na or j < nb):
+            if (j >= nb or (i < na and a[i] < b[j])):
+                pos = a[i]
+            elif (i >= na or b[j] < a[i]):
+                pos = b[j]
+            else:
+                pos = a[i]
+            while (i < na and a[i] == pos):
+                inA ^= 2
+                i += 1
+            while (j < nb and b[j] == pos):
+                inB ^= 1
+                j += 1
+            now = keep[inA | inB]
+            if (now != inOut):
+                out.append(pos)
+                inOut = now
+        return RangeSet.fromBounds(out)
+
+    def __and__(self, other:"RangeSet") -> "RangeSet":
+        return self.combine(other, lambda x, y: x and y)
+
+    def __or__(self, other:"RangeSet") -> "RangeSet":
+        return self.combine(other, lambda x, y: x or y)
+
+    def __sub__(self, other:"RangeSet") -> "RangeSet":
+        return self.combine(other, lambda x, y: x and not y)
+
+    def __xor__(self, other:"RangeSet") -> "RangeSet":
+        return self.combine(other, lambda x, y: x != y)
+
+    def __invert__(self) -> "RangeSet":
+        """Complement relative to the whole codespace. This just adds or
+        drops the boundaries at 0 and MAX_CP.
+        """
+        b = self.bounds
+        inv = b[1:] if (b and b[0] == 0) else array("I", [ 0 ]) + b
+        if (inv and inv[-1] == MAX_CP): return RangeSet.fromBounds(inv[:-1])
+        inv.append(MAX_CP)
+        return RangeSet.fromBounds(inv)
+
+
+###############################################################################
+#
+class UdbColumn:
+    """The values of one property, as runs of code points with the same
+    value. Run i covers code points from starts[i] up to (but not including)
+    starts[i+1] (or `end`, for the last run), and all have the value whose
+    code is codes[i]. Code 0 (None) fills any code points not loaded, so the
+    runs always cover everything from 0 to `end`.
+
+    Since neighboring characters mostly share values (and the grouped XML
+    is organized that way), most properties need only a few hundred or a
+    few thousand runs, not one entry per character.
+    """
+    def __init__(self, name:str, end:int=0, valueTable:InternTable=None):
+        self.name = name
+        self.valueTable = valueTable or InternTable()
+        self.starts = array("I", [ 0 ])
+        self.codes = array(codeTypeFor(len(self.valueTable)), [ 0 ])
+        self.end = end
+
+    def __len__(self) -> int:
+        """The number of runs (not code points).
+        """
+        return len(self.starts)
+
+    def setRange(self, first:int, last:int, value) -> None:
+        """Give code points first...last (inclusive) the value. Ranges must be
+        set in increasing order, since they're only ever added at the end.
+        """
+        code = self.valueTable.intern(value)
+        if (code == self.codes[-1] and first == self.end):  # Most common case
+            self.end = last + 1
+            return
+        if (code >= (1 << (8 * self.codes.itemsize))):
+            self.codes = array(codeTypeFor(code+1), self.codes)
+        if (first > self.end and self.codes[-1] != 0):
+            self.starts.append(self.end)
+            self.codes.append(0)
+        if (self.codes[-1] != code):
+            if (self.starts[-1] == first): self.codes[-1] = code
+            else:
+                self.starts.append(first)
+                self.codes.append(code)
+        self.end = last + 1
+
+    def runAt(self, cp:int) -> int:
+        return bisect_right(self.starts, cp) - 1
+
+    def valueAt(self, cp:int):
+        if (cp < 0 or cp >= self.end): return None
+        return self.valueTable.values[self.codes[bisect_right(self.starts, cp) - 1]]
+
+    def codeOf(self, value) -> int:
+        """Return the code for a value, or -1 if it never occurs.
+        """
+        return self.valueTable.codes.get(value, -1)
+
+    def runs(self) -> Iterator[Tuple[int, int, object]]:
+        """Generate (first, last, value) for each run that has a value.
+        """
+        starts, codes, values = self.starts, self.codes, self.valueTable.values
+        n = len(starts)
+        for i in range(n):
+            if (codes[i] == 0): continue
+            yield (starts[i], (starts[i+1] if i+1 < n else self.end) - 1,
+                values[codes[i]])
+
+    def nbytes(self) -> int:
+        return (len(self.starts) * self.starts.itemsize
+            + len(self.codes) * self.codes.itemsize)
+
+
+###############################################################################
+#
+class UdbColumns:
+    """A column store of UCD properties, keyed by code point.
+    `firsts` and `lasts` hold the (inclusive) ranges of code points that
+    have been loaded, in order; each UdbColumn holds the runs of values of
+    one property. Supports the dict-like access that
+    UnicodeDBAccess.charEntries used to provide, plus column scans.
+    `valueTables` (property name -> InternTable) may be shared with other
+    stores (see UcdVersions), so equal values get equal codes in all of them.
+    """
+    def __init__(self, valueTables:Dict[str, InternTable]=None):
+        self.firsts = array("I")
+        self.lasts = array("I")
+        self.columns = {}  # property name -> UdbColumn
+        self.indexes = {}  # property name -> { value: RangeSet }
+        self.valueTables = {} if valueTables is None else valueTables
+
+    def valueTableFor(self, prop:str) -> InternTable:
+        if (prop not in self.valueTables): self.valueTables[prop] = InternTable()
+        return self.valueTables[prop]
+
+    def __len__(self) -> int:
+        """The number of code points loaded.
+        """
+        return sum(self.lasts) - sum(self.firsts) + len(self.firsts)
+
+    def __contains__(self, cp:int) -> bool:
+        i = bisect_right(self.firsts, cp) - 1
+        return i >= 0 and cp <= self.lasts[i]
+
+    def __getitem__(self, cp:int) -> "UdbEntry":
+        if (cp not in self): raise KeyError("Code point U+%04x not loaded." % (cp))
+        return self.entryFor(cp)
+
+    def get(self, cp:int, default=None):
+        if (cp not in self): return default
+        return self.entryFor(cp)
+
+    def entryFor(self, cp:int) -> "UdbEntry":
+        props = { "cp": "%04X" % (cp) }
+        for name, col in self.columns.items():
+            val = col.valueAt(cp)
+            if (val is not None): props[name] = val
+        return UdbEntry(props)
+
+    def ranges(self) -> Iterator[Tuple[int, int]]:
+        """Generate the (first, last) ranges of loaded code points.
+        """
+        return zip(self.firsts, self.lasts)
+
+    def keys(self) -> Iterator[int]:
+        for first, last in self.ranges():
+            yield from range(first, last+1)
+
+    __iter__ = keys
+
+    def items(self) -> Iterator[Tuple[int, "UdbEntry"]]:
+        for cp in self.keys():
+            yield cp, self.entryFor(cp)
+
+    def addEntry(self, cp:int, props:Dict) -> None:
+        self.addRange(cp, cp, props)
+
+    def addRange(self, first:int, last:int, props:Dict) -> None:
+        """Add a range of code points (inclusive) that all have the same
+        properties. Ranges must come in increasing order. Properties not
+        given are left as None. "cp" itself is not stored as a column
+        (it's the key).
+        """
+        if (not isinstance(self.lasts, array)): self.thaw()
+        if (self.lasts and first <= self.lasts[-1]):
+            raise KeyError("Code point U+%04x out of order (after U+%04x)." %
+                (first, self.lasts[-1]))
+        if (self.indexes): self.indexes.clear()
+        end = self.lasts[-1] + 1 if self.lasts else 0
+        for name in props:
+            if (name not in self.columns and name != "cp"):
+                self.columns[name] = UdbColumn(name, end=end,
+                    valueTable=self.valueTableFor(name))
+        for name, col in self.columns.items():
+            col.setRange(first, last, props.get(name))
+        if (self.lasts and first == end): self.lasts[-1] = last
+        else:
+            self.firsts.append(first)
+            self.lasts.append(last)
+
+    def setColumn(self, prop:str, ranges:Iterable[Tuple[int, int, object]]) -> None:
+        """Replace (or add) the whole column for one property, from
+        (first, last, value) ranges in any order (as in files like
+        Scripts.txt, which group by value). This doesn't change which code
+        points count as loaded.
+        """
+        if (not isinstance(self.lasts, array)): self.thaw()
+        col = UdbColumn(prop, valueTable=self.valueTableFor(prop))
+        for first, last, value in sorted(ranges, key=lambda r: r[0]):
+            if (first < col.end):
+                raise KeyError("Overlapping ranges for '%s' at U+%04x." % (prop, first))
+            col.setRange(first, last, value)
+        self.columns[prop] = col
+        self.indexes.pop(prop, None)
+
+    def thaw(self) -> None:
+        """Copy tables mapped from a (read-only) snapshot into arrays, so
+        more data can be added.
+        """
+        self.firsts = array("I", self.firsts)
+        self.lasts = array("I", self.lasts)
+        for col in self.columns.values():
+            col.starts = array("I", col.starts)
+            col.codes = array(col.codes.format, col.codes)
+
+    def getValue(self, cp:int, prop:str):
+        """Get just one property of a code point, without making a UdbEntry.
+        """
+        if (prop not in self.columns): return None
+        return self.columns[prop].valueAt(cp)
+
+    def column(self, prop:str) -> Iterator[Tuple[int, object]]:
+        """Scan a whole column, generating (cp, value) for each code point
+        that has a value for it.
+        """
+        for first, last, value in self.columns[prop].runs():
+            for cp in range(first, last+1): yield cp, value
+
+    def findAll(self, prop:str, value) -> List[int]:
+        """Return a list of all the code points with the given property value.
+        """
+        if (prop not in self.columns): return []
+        return list(self.where(prop, value))
+
+    def valueIndex(self, prop:str) -> Dict:
+        """Return the inverted index for a property: a dict from each of its
+        values to the RangeSet of code points that have it. Built (in one
+        pass over the runs) the first time it's asked for, and kept until
+        more data is loaded.
+        """
+        if (prop not in self.indexes):
+            if (prop not in self.columns):
+                raise KeyError("Property '%s' not loaded." % (prop))
+            rangesByValue = {}
+            for first, last, value in self.columns[prop].runs():
+                rangesByValue.setdefault(value, []).append((first, last))
+            self.indexes[prop] = {
+                value: RangeSet(ranges) for value, ranges in rangesByValue.items() }
+        return self.indexes[prop]
+
+    def where(self, prop:str, value) -> RangeSet:
+        """Return the RangeSet of code points with the given property value
+        (which may be given as a string even if it's stored as an int).
+        """
+        return self.valueIndex(prop).get(typedValue(prop, value)) or RangeSet()
+
+    def valueCounts(self, prop:str) -> Dict:
+        """Return a dict of how many code points have each value of a property.
+        """
+        counts = {}
+        for first, last, value in self.columns[prop].runs():
+            counts[value] = counts.get(value, 0) + last + 1 - first
+        return counts
+
+
+###############################################################################
+#
+def compressBlocks(codes, shift:int) -> Tuple[array, array]:
+    """Cut an array into blocks of 2**shift entries, and keep just one copy of
+    each distinct block. Returns (index, blocks), where index[i] is the
+    (block) offset of the i-th block's copy in blocks; so
+        codes[n] == blocks[(index[n >> shift] << shift) + (n & mask)]
+    `codes` must be a multiple of the block size long.
+    """
+    size = 1 << shift
+    blocks = array(codes.typecode)
+    seen = {}
+    indexes = []
+    raw = codes.tobytes()
+    nbytes = size * codes.itemsize
+    for b in range(0, len(raw), nbytes):
+        key = raw[b:b+nbytes]
+        bi = seen.get(key)
+        if (bi is None):
+            bi = seen[key] = len(seen)
+            blocks.frombytes(key)
+        indexes.append(bi)
+    return array(codeTypeFor(len(seen)), indexes), blocks
+
+class TwoStageTable:
+    """Compile a property into the kind of multi-stage table CPython's
+    unicodedata uses: the code points are cut into blocks, identical blocks
+    are stored once, and a first-stage index says which block each range of
+    code points uses. A lookup is then two (or, with levels=3, three) array
+    indexing operations and a list index, with no hashing or searching.
+    For example, the whole codespace for "gc" takes a few tens of KB.
+
+    The values are interned (code 0 is None, for code points not covered),
+    and `lookupMany()` does a whole array of code points at once (using
+    numpy if it's installed).
+    """
+    def __init__(self, codes:array, values:List, shift:int=7, levels:int=2):
+        """Compile from a flat array of value codes (one per code point from
+        0, padded as needed) and the values they stand for.
+        Use fromFunction() or UnicodeDBAccess.compileTable() to make one.
+        """
+        if (levels not in (2, 3)):
+            raise ValueError("TwoStageTable levels must be 2 or 3, not %s." % (levels))
+        self.values = list(values)
+        self.shift = shift
+        self.mask = (1 << shift) - 1
+        self.levels = levels
+        size = 1 << shift
+        codes = array(codes.typecode, codes)
+        codes.extend([ 0 ] * (-len(codes) % size))
+        self.maxCp = len(codes)
+        self.index1, self.stage2 = compressBlocks(codes, shift)
+        self.stage0 = None
+        if (levels == 3):
+            # Split the first stage the same way.
+            self.index1.extend([ 0 ] * (-len(self.index1) % size))
+            self.stage0, self.index1 = compressBlocks(self.index1, shift)
+
+    @staticmethod
+    def fromFunction(func, shift:int=7, levels:int=2, takesChar:bool=True,
+        maxCp:int=MAX_CP) -> "TwoStageTable":
+        """Compile a table from a function that gives the value for each
+        character (like unicodedata.category) or, if takesChar is False, for
+        each code point (as an int).
+        """
+        vt = InternTable()
+        codes = array("B")
+        for n in range(maxCp):
+            code = vt.intern(func(chr(n) if takesChar else n))
+            if (code >= (1 << (8 * codes.itemsize))):
+                codes = array(codeTypeFor(code+1), codes)
+            codes.append(code)
+        return TwoStageTable(codes, vt.values, shift=shift, levels=levels)
+
+    @staticmethod
+    def fromRuns(runs:Iterable[Tuple[int, int, object]], shift:int=7,
+        levels:int=2) -> "TwoStageTable":
+        """Compile a table from (first, last, value) runs, such as
+        UdbColumn.runs() generates.
+        """
+        vt = InternTable()
+        runList = [ (first, last, vt.intern(value)) for first, last, value in runs ]
+        maxCp = runList[-1][1] + 1 if runList else 0
+        codes = array(codeTypeFor(len(vt)), bytes(maxCp * array(codeTypeFor(len(vt))).itemsize))
+        for first, last, code in runList:
+            codes[first:last+1] = array(codes.typecode, [ code ]) * (last + 1 - first)
+        return TwoStageTable(codes, vt.values, shift=shift, levels=levels)
+
+    def codeOf(self, cp:int) -> int:
+        if (cp < 0 or cp >= self.maxCp): return 0
+        sh = self.shift
+        if (self.stage0 is None):
+            block = self.index1[cp >> sh]
+        else:
+            hi = cp >> sh
+            block = self.index1[(self.stage0[hi >> sh] << sh) + (hi & self.mask)]
+        return self.stage2[(block << sh) + (cp & self.mask)]
+
+    def lookup(self, cp:int):
+        """Return the value for a code point (or None).
+        """
+        return self.values[self.codeOf(cp)]
+
+    __getitem__ = lookup
+
+    def lookupMany(self, cps, codesOnly:bool=False):
+        """Look up a whole sequence (list, array, numpy array) of code points.
+        With numpy, this returns a numpy array (of codes, or of values with
+        dtype object); without, a list.
+        """
+        if (np is not None):
+            cpa = np.asarray(cps, dtype=np.int64)
+            inRange = (cpa >= 0) & (cpa < self.maxCp)
+            cpa = np.where(inRange, cpa, 0)
+            sh = self.shift
+            hi = cpa >> sh
+            if (self.stage0 is None):
+                block = np.asarray(self.index1)[hi]
+            else:
+                block = np.asarray(self.index1)[
+                    (np.asarray(self.stage0)[hi >> sh].astype(np.int64) << sh)
+                    + (hi & self.mask)]
+            codes = np.asarray(self.stage2)[
+                (block.astype(np.int64) << sh) + (cpa & self.mask)]
+            codes = np.where(inRange, codes, 0)
+            if (codesOnly): return codes
+            return np.asarray(self.values, dtype=object)[codes]
+        codeOf = self.codeOf
+        if (codesOnly): return [ codeOf(cp) for cp in cps ]
+        values = self.values
+        return [ values[codeOf(cp)] for cp in cps ]
+
+    def nbytes(self) -> int:
+        n = (len(self.index1) * self.index1.itemsize
+            + len(self.stage2) * self.stage2.itemsize)
+        if (self.stage0 is not None):
+            n += len(self.stage0) * self.stage0.itemsize
+        return n
+
+
+###############################################################################
+#
+class UnicodeDBAccess:  # TODO: Unfinished
+    """The "grouped" XML looks like the sample below.
+    The attributes appear to inherit in the obvious manner; documentation
+    is at [https://www.unicode.org/reports/tr42/].
+
+    <group age="1.1" na="" JSN="" gc="Cc" ccc="0" dt="none" dm="#" nt="None"
+    nv="" bc="BN" Bidi_M="N" bmg="" suc="#" slc="#" stc="#" uc="#" lc="#"
+    tc="#" scf="#" cf="#" jt="U" jg="No_Joining_Group" ea="N" lb="CM" sc="Zyyy"
+    Dash="N" WSpace="N" Hyphen="N" QMark="N" Radical="N" Ideo="N" UIdeo="N"
+    IDSB="N" IDST="N" hst="NA" DI="N" ODI="N" Alpha="N" OAlpha="N" Upper="N"
+    OUpper="N" Lower="N" OLower="N" Math="N" OMath="N" Hex="N" AHex="N"
+    NChar="N" VS="N" Bidi_C="N" Join_C="N" Gr_Base="N" Gr_Ext="N" OGr_Ext="N"
+    Gr_Link="N" STerm="N" Ext="N" Term="N" Dia="N" Dep="N" IDS="N" OIDS="N"
+    XIDS="N" IDC="N" OIDC="N" XIDC="N" SD="N" LOE="N" Pat_WS="N" Pat_Syn="N"
+    GCB="CN" WB="XX" SB="XX" CE="N" Comp_Ex="N" NFC_QC="Y" NFD_QC="Y"
+    NFKC_QC="Y" NFKD_QC="Y" XO_NFC="N" XO_NFD="N" XO_NFKC="N" XO_NFKD="N"
+    FC_NFKC="" CI="N" Cased="N" CWCF="N" CWCM="N" CWKCF="N" CWL="N" CWT="N"
+    CWU="N" NFKC_CF="#" isc="">
+
+    <char cp="0000" na1="NULL"/>
+    <char cp="0001" na1="START OF HEADING"/>
+    <char cp="0002" na1="START OF TEXT"/>
+    <char cp="0003" na1="END OF TEXT"/>
+    <char cp="0004" na1="END OF TRANSMISSION"/>
+    <char cp="0005" na1="ENQUIRY"/>
+    <char cp="0006" na1="ACKNOWLEDGE"/>
+    <char cp="0007" na1="BELL"/>
+    <char cp="0008" na1="BACKSPACE"/>
+    <char cp="0009" bc="S" lb="BA" WSpace="Y" Pat_WS="Y" SB="SP"
+        na1="CHARACTER TABULATION"/>
+    <char cp="000A" bc="B" lb="LF" WSpace="Y" Pat_WS="Y" GCB="LF" WB="LF" SB="LF"
+        na1="LINE FEED (LF)"/>
+    <char cp="000B" bc="S" lb="BK" WSpace="Y" Pat_WS="Y" WB="NL" SB="SP"
+        na1="LINE TABULATION"/>
+    <char cp="000C" bc="WS" lb="BK" WSpace="Y" Pat_WS="Y" WB="NL" SB="SP"
+        na1="FORM FEED (FF)"/>
+    <char cp="000D" bc="B" lb="CR" WSpace="Y" Pat_WS="Y" GCB="CR" WB="CR" SB="CR"
+        na1="CARRIAGE RETURN (CR)"/>
+    <char cp="000E" na1="SHIFT OUT"/>
+    <char cp="000F" na1="SHIFT IN"/>
+    <char cp="0010" na1="DATA LINK ESCAPE"/>
+    <char cp="0011" na1="DEVICE CONTROL ONE"/>
+    <char cp="0012" na1="DEVICE CONTROL TWO"/>
+    <char cp="0013" na1="DEVICE CONTROL THREE"/>
+    <char cp="0014" na1="DEVICE CONTROL FOUR"/>
+    <char cp="0015" na1="NEGATIVE ACKNOWLEDGE"/>
+    <char cp="0016" na1="SYNCHRONOUS IDLE"/>
+    <char cp="0017" na1="END OF TRANSMISSION BLOCK"/>
+    <char cp="0018" na1="CANCEL"/>
+    <char cp="0019" na1="END OF MEDIUM"/>
+    <char cp="001A" na1="SUBSTITUTE"/>
+    <char cp="001B" na1="ESCAPE"/>
+    <char cp="001C" bc="B" na1="INFORMATION SEPARATOR FOUR"/>
+    <char cp="001D" bc="B" na1="INFORMATION SEPARATOR THREE"/>
+    <char cp="001E" bc="B" na1="INFORMATION SEPARATOR TWO"/>
+    <char cp="001F" bc="S" na1="INFORMATION SEPARATOR ONE"/></group>
+    ...
+    """
+    NORMATIVE_BASE_URI = "https://www.unicode.org/Public/5.2.0/ucdxml/"
+    NORMATIVE_XML_FILES = [
+        "ucd.all.flat.zip",             # 2009-09-28 19:35  6.6M
+        "ucd.all.grouped.zip",          # 2009-09-28 19:35  5.6M
+        "ucd.nounihan.flat.zip",        # 2009-09-28 19:35  563K
+        "ucd.nounihan.grouped.zip",     # 2009-09-28 19:35  359K
+        "ucd.unihan.flat.zip",          # 2009-09-28 19:36  5.3M
+        "ucd.unihan.grouped.zip",       # 2009-09-28 19:36  5.3M
+        "ucdxml.readme.txt",            # 2009-09-28 19:36  5.3M
+        "ucd.unihan.grouped.zip",       # 2009-09-28 19:38  1.0K
+    ]
+
+    NORMATIVE_CSV_FILES = [
+        "ArabicShaping.txt",        # 2009-08-17 13:39  13K
+        "BidiMirroring.txt",        # 2009-05-22 15:10  23K
+        "BidiTest.txt",             # 2009-06-03 12:17  3.2M
+        "Blocks.txt",               # 2009-05-19 18:24  6.6K
+        "CJKRadicals.txt",          # 2009-05-28 13:52  4.7K
+        "CaseFolding.txt",          # 2009-05-28 18:25  63K
+        "CompositionExclusions.txt",# 2009-05-22 15:10  7.9K
+        "DerivedAge.txt",           # 2009-09-21 14:01  71K
+        "DerivedCoreProperties.txt",# 2009-08-26 12:39  752K
+        "DerivedNormalizationProps.txt",# 2009-08-31 14:48  737K
+        "EastAsianWidth.txt",       # 2009-06-09 19:49  779K
+        "HangulSyllableType.txt",   # 2009-05-22 18:28  50K
+        "Index.txt",                # 2009-07-09 13:56  148K
+        "Jamo.txt",                 # 2009-05-22 15:10  3.2K
+        "LineBreak.txt",            # 2009-08-17 14:24  835K
+        "NameAliases.txt",          # 2009-05-22 15:10  1.1K
+        "NamedSequences.txt",       # 2009-09-14 14:50  15K
+        "NamedSequencesProv.txt",   # 2009-09-14 14:50  2.5K
+        "NamesList.html",           # 2009-09-15 17:01  21K
+        "NamesList.txt",            # 2009-09-04 12:28  1.0M
+        "NormalizationCorrections.txt", # 2009-05-22 16:07  2.0K
+        "NormalizationTest.txt",    # 2009-08-24 16:03  2.2M
+        "PropList.txt",             # 2009-08-24 16:02  90K
+        "PropertyAliases.txt",      # 2009-08-24 19:00  5.9K
+        "PropertyValueAliases.txt", # 2009-08-24 19:00  36K
+        "ReadMe.txt",               # 2009-09-30 18:33  410
+        "Scripts.txt",              # 2009-08-24 16:03  119K
+        "SpecialCasing.txt",        # 2009-09-22 20:05  16K
+        "StandardizedVariants.html",# 2009-09-28 18:25  33K
+        "StandardizedVariants.txt", # 2008-09-18 19:45  7.5K
+        "UnicodeData.txt",          # 2009-08-17 13:38  1.2M
+        "Unihan.zip",               # 2009-08-31 15:58  5.9M
+    ]
+
+    # Elements that describe code points, in the UCD XML's <repertoire>.
+    # <reserved>, <noncharacter>, and <surrogate> get <group> properties, too.
+    CODE_POINT_TAGS = ( "char", "reserved", "noncharacter", "surrogate" )
+
+    EXPECTEDFIELDS = 15
+    #FILENAME = "ucd.nounihan.flat.xml"
+    #FILENAME2 = "ucd.unihan.flat.xml"
+    _TYPES = [ ]
+
+    def __init__(self, valueTables:Dict[str, InternTable]=None):
+        """Load and provide access to the Unicode database.
+        A lot of the data is in Python lib unicodedata, but not all, afaict.
+        The official site provides the data in XML and in a CSV-ish form using
+        ";" delimiters, "#" comments, and special meaning for indented lines.
+        I'm going with the XML.
+
+        https://www.unicode.org/Public/5.2.0/ucdxml/
+        https://www.unicode.org/reports/tr44/
+
+        `valueTables` lets several instances share interned values (see
+        UcdVersions).
+        """
+        self.version = None
+        self.valueTables = {} if valueTables is None else valueTables
+        self.charEntries = UdbColumns(self.valueTables)
+        self.snapshotMap = None
+        self.unihanShards = None
+        self.propertyAliases = {}  # loose name -> short property name
+        self.valueAliases = {}     # short property name -> { loose value: short }
+
+    def compileTable(self, prop:str, shift:int=7, levels:int=2) -> TwoStageTable:
+        """Compile a loaded property into a TwoStageTable, for fast lookups.
+        """
+        if (prop not in self.charEntries.columns):
+            raise KeyError("Property '%s' not loaded." % (prop))
+        return TwoStageTable.fromRuns(
+            self.charEntries.columns[prop].runs(), shift=shift, levels=levels)
+
+    def openUnihan(self, path:str, **kwargs) -> "UnihanShards":
+        """Set up lazy access to Unihan data (see UnihanShards, which gets
+        any keyword arguments). This reads no more than the index.
+        """
+        self.unihanShards = UnihanShards(path, **kwargs)
+        return self.unihanShards
+
+    def getUnihan(self, cp:int, field:str, default:str=None) -> str:
+        """Get a Unihan field (such as "kDefinition") of a character.
+        """
+        if (self.unihanShards is None):
+            raise KeyError("No Unihan data open (see openUnihan()).")
+        return self.unihanShards.get(cp, field, default)
+
+    def where(self, prop:str, value) -> RangeSet:
+        """Return the RangeSet of code points where `prop` is `value`.
+        RangeSets combine with & | - ^ and ~, so for example:
+            udb.where("lb", "BA") & ~udb.where("gc", "Zs")
+        """
+        return self.charEntries.where(prop, value)
+
+    queryTokenExpr = re.compile(
+        r"\s*(?:([~&|()-])|([\w.#]+)\s*(?:=\s*([\w.#]*))?)")
+
+    def query(self, expr:str) -> RangeSet:
+        """Evaluate a boolean expression of property tests, such as
+            "lb=BA | lb=BB & ~gc=Zs"
+            "(Dash | Hyphen) - gc=Pd"
+        `P=V` is the code points where property P has value V; a bare `P`
+        means `P=Y` (for the binary properties). `~` is NOT (relative to the
+        whole codespace), `&` is AND, `-` is AND NOT, and `|` is OR;
+        they bind in that order, and parentheses group.
+        """
+        tokens = []
+        pos = 0
+        expr = expr.strip()
+        while (pos < len(expr)):
+            mat = UnicodeDBAccess.queryTokenExpr.match(expr, pos)
+            if (not mat or mat.end() == pos):
+                raise ValueError("Bad query syntax at '%s'." % (expr[pos:]))
+            if (mat.group(1)): tokens.append(mat.group(1))
+            else: tokens.append((mat.group(2),
+                "Y" if mat.group(3) is None else mat.group(3)))
+            pos = mat.end()
+        tokens.append(None)
+
+        def parseOr(i:int) -> Tuple[RangeSet, int]:
+            rs, i = parseAnd(i)
+            while (tokens[i] == "|"):
+                rs2, i = parseAnd(i+1)
+                rs = rs | rs2
+            return rs, i
+
+        def parseAnd(i:int) -> Tuple[RangeSet, int]:
+            rs, i = parseNot(i)
+            while (tokens[i] in ("&", "-")):
+                op = tokens[i]
+                rs2, i = parseNot(i+1)
+                rs = (rs & rs2) if op == "&" else (rs - rs2)
+            return rs, i
+
+        def parseNot(i:int) -> Tuple[RangeSet, int]:
+            tok = tokens[i]
+            if (tok == "~"):
+                rs, i = parseNot(i+1)
+                return ~rs, i
+            if (tok == "("):
+                rs, i = parseOr(i+1)
+                if (tokens[i] != ")"): raise ValueError("Missing ')' in query.")
+                return rs, i+1
+            if (isinstance(tok, tuple)):
+                return self.where(*tok), i+1
+            raise ValueError("Unexpected '%s' in query." % (tok))
+
+        result, i = parseOr(0)
+        if (tokens[i] is not None):
+            raise ValueError("Unexpected '%s' in query." % (tokens[i]))
+        return result
+
+    def readUdbXml(self, path:str, keep:Iterable[str]=None) -> int:
+        """Load the UCD XML, flat or grouped, plain or zipped (the first
+        .xml member is used). The file is read incrementally (iterparse),
+        applying <group> attributes to the <char>s inside as they go by, and
+        discarding each element once it's been used. If `keep` is given,
+        only those properties are loaded (so memory use depends on what is
+        kept, not on the size of the file).
+        Returns the number of code points loaded.
+        """
+        keepSet = set(keep) if keep else None
+        ifh = UnicodeDBAccess.openMaybeZipped(path, ".xml")
+        groupProperties = {}
+        container = None  # The element whose finished children we discard
+        lastCpInt = -1
+        nLoaded = 0
+        for event, el in ElementTree.iterparse(ifh, events=("start", "end")):
+            tag = el.tag.rpartition("}")[2]
+            if (event == "start"):
+                if (tag == "group"):
+                    groupProperties = UnicodeDBAccess.pickProperties(
+                        el.attrib, keepSet)
+                elif (tag == "repertoire"):
+                    container = el
+                continue
+
+            if (tag in UnicodeDBAccess.CODE_POINT_TAGS):
+                charProperties = { **groupProperties,
+                    **UnicodeDBAccess.pickProperties(el.attrib, keepSet) }
+                for prop, typ in PROPERTY_TYPES.items():
+                    if (charProperties.get(prop)):
+                        charProperties[prop] = typ(charProperties[prop])
+                if ("cp" in el.attrib):
+                    first = last = int(el.attrib["cp"], 16)
+                else:
+                    first = int(el.attrib["first-cp"], 16)
+                    last = int(el.attrib["last-cp"], 16)
+                if (first <= lastCpInt):
+                    raise ValueError("Code point U+%04x out of order in '%s'." %
+                        (first, path))
+                self.charEntries.addRange(first, last, charProperties)
+                nLoaded += last + 1 - first
+                lastCpInt = last
+            elif (tag == "group"):
+                groupProperties = {}
+            elif (tag == "description"):
+                self.version = el.text
+            elif (tag == "repertoire"):
+                container = None
+            else:
+                continue  # Parts of <char>, or things we don't use (yet)
+            el.clear()
+            if (container is not None): container.clear()
+        ifh.close()
+        return nLoaded
+
+    @staticmethod
+    def pickProperties(attrs:Dict, keepSet:set=None) -> Dict:
+        if (keepSet is None):
+            return { k: v for k, v in attrs.items()
+                if k not in ("first-cp", "last-cp") }
+        return { k: v for k, v in attrs.items() if k in keepSet }
+
+    @staticmethod
+    def openMaybeZipped(path:str, extension:str):
+        """Open a file for binary reading. If it's a zip, open the first
+        member whose name ends with the given extension instead.
+        """
+        if (zipfile.is_zipfile(path)):
+            zf = zipfile.ZipFile(path)
+            for member in zf.namelist():
+                if (member.endswith(extension)): return zf.open(member)
+            raise KeyError("No '*%s' file found in zip '%s'." % (extension, path))
+        return open(path, "rb")
+
+    def readUdbTextish(self, path:str) -> int:
+        """Load UnicodeData.txt. Records are read one at a time; empty fields
+        are left as None, and those in PROPERTY_TYPES are converted (so "ccc"
+        is an int). Pairs of records with names like "<CJK Ideograph, First>"
+        and "<CJK Ideograph, Last>" are loaded as one range, with no "na".
+        Returns the number of code points loaded.
+        """
+        props = UNICODEDATA_FIELDS[1:]
+        lastN = -1
+        rangeStart = None
+        nLoaded = 0
+        with open(path, "r", encoding="utf-8") as ufh:
+            for recnum, rec in enumerate(ufh):
+                if (rec[0] in "@#"): continue
+                rec = rec.rstrip("\r\n")
+                if (rec.strip() == ""): continue
+                fields = rec.split(";")
+                if (len(fields) != UnicodeDBAccess.EXPECTEDFIELDS):
+                    log(0, "Record %d: expected %d fields but found %d: '%s'\n" %
+                        (recnum, UnicodeDBAccess.EXPECTEDFIELDS, len(fields), rec))
+                    continue
+                n = int(fields[0], 16)
+                if (n <= lastN):
+                    raise ValueError("Record %d: U+%04x out of order in '%s'." %
+                        (recnum, n, path))
+                lastN = n
+                charProperties = {}
+                for prop, val in zip(props, fields[1:]):
+                    if (val == ""): continue
+                    charProperties[prop] = (PROPERTY_TYPES[prop](val)
+                        if prop in PROPERTY_TYPES else val)
+                name = fields[1]
+                if (name.startswith("<") and name.endswith(", First>")):
+                    rangeStart = n
+                    continue
+                if (name.startswith("<") and name.endswith(", Last>")):
+                    if (rangeStart is None):
+                        raise ValueError("Record %d: range end without start." % (recnum))
+                    del charProperties["na"]
+                    self.charEntries.addRange(rangeStart, n, charProperties)
+                    nLoaded += n + 1 - rangeStart
+                    rangeStart = None
+                    continue
+                self.charEntries.addEntry(n, charProperties)
+                nLoaded += 1
+        return nLoaded
+
+    def readAliases(self, dirPath:str) -> None:
+        """Load PropertyAliases.txt and PropertyValueAliases.txt from a
+        directory (if they're there), so readPropertyFile() can store
+        properties and values by their short names (as the XML has them).
+        """
+        for line in UnicodeDBAccess.readAliasLines(
+            os.path.join(dirPath, "PropertyAliases.txt")):
+            for alias in line:
+                self.propertyAliases[looseName(alias)] = line[0]
+        for line in UnicodeDBAccess.readAliasLines(
+            os.path.join(dirPath, "PropertyValueAliases.txt")):
+            prop = self.propertyAliases.get(looseName(line[0]), line[0])
+            if (prop == "ccc"):  # ccc; 230; A; Above
+                short, aliases = int(line[1]), line[1:]
+            else:
+                short, aliases = line[1], line[1:]
+            valueMap = self.valueAliases.setdefault(prop, {})
+            for alias in aliases:
+                valueMap[looseName(alias)] = short
+
+    @staticmethod
+    def readAliasLines(path:str) -> Iterator[List[str]]:
+        if (not os.path.isfile(path)): return
+        with open(path, "r", encoding="utf-8") as ifh:
+            for rec in ifh:
+                rec = rec.partition("#")[0].strip()
+                if (rec): yield [ f.strip() for f in rec.split(";") ]
+
+    def readPropertyFile(self, path:str, prop:str=None) -> int:
+        """Load one of the "XXXX..YYYY ; value" files, such as Scripts.txt or
+        PropList.txt, as a column (or, for PropList-style files, a column per
+        property named in it). Binary properties get the value "Y" where
+        listed. If aliases have been loaded (see readAliases()), property
+        names and values are stored in their short forms.
+        Returns the number of records read.
+        """
+        if (prop is None):
+            prop = PROPERTY_FILES.get(os.path.basename(path))
+        rangesByProp = {}
+        nRecs = 0
+        for first, last, fields in readSemicolonFile(path):
+            nRecs += 1
+            if (prop is None):
+                thisProp = self.shortPropertyName(fields[0])
+                value = fields[1] if len(fields) > 1 else "Y"
+            else:
+                thisProp = prop
+                value = fields[0]
+            valueMap = self.valueAliases.get(thisProp)
+            if (valueMap): value = valueMap.get(looseName(value), value)
+            rangesByProp.setdefault(thisProp, []).append((first, last, value))
+        for thisProp, ranges in rangesByProp.items():
+            self.charEntries.setColumn(thisProp, ranges)
+        return nRecs
+
+    def shortPropertyName(self, name:str) -> str:
+        return self.propertyAliases.get(looseName(name), name)
+
+    def readUcdDirectory(self, dirPath:str) -> int:
+        """Load the UCD text files from a directory: UnicodeData.txt, then
+        any of the files in PROPERTY_FILES that are there, using the aliases
+        files (if present) to get short names.
+        Returns the number of code points loaded from UnicodeData.txt.
+        """
+        self.readAliases(dirPath)
+        nLoaded = 0
+        udPath = os.path.join(dirPath, "UnicodeData.txt")
+        if (os.path.isfile(udPath)):
+            nLoaded = self.readUdbTextish(udPath)
+        for fileName in UnicodeDBAccess.ucdDirectoryFiles(dirPath):
+            if (fileName in PROPERTY_FILES):
+                self.readPropertyFile(os.path.join(dirPath, fileName))
+        return nLoaded
+
+    @staticmethod
+    def ucdDirectoryFiles(dirPath:str) -> List[str]:
+        """The files readUcdDirectory() uses, that are actually there.
+        """
+        want = [ "UnicodeData.txt", "PropertyAliases.txt",
+            "PropertyValueAliases.txt" ] + sorted(PROPERTY_FILES.keys())
+        return [ f for f in want if os.path.isfile(os.path.join(dirPath, f)) ]
+
+    def readFile(self, path:str, keep:Iterable[str]=None) -> int:
+        """Load a UCD file (or directory of them), by what it looks like.
+        """
+        if (os.path.isdir(path)): return self.readUcdDirectory(path)
+        if (path.endswith((".xml", ".zip"))): return self.readUdbXml(path, keep=keep)
+        if (os.path.basename(path) in PROPERTY_FILES): return self.readPropertyFile(path)
+        return self.readUdbTextish(path)
+
+    ###########################################################################
+    # Snapshots: the loaded tables, compiled to a binary file that later runs
+    # just map into memory (read-only, so processes share the pages).
+    #
+    # Layout: SNAPSHOT_MAGIC; header length (8 bytes, little-endian); the
+    # header (JSON: sources, version, and where each array is); padding to a
+    # multiple of 8; then the arrays, each starting on a multiple of 8.
+    #
+    SNAPSHOT_MAGIC = b"UCDSNAP\x01"
+    SNAPSHOT_DIR = os.path.expanduser("~/.strfchr/ucd")
+
+    def load(self, paths:List[str], keep:Iterable[str]=None,
+        snapshotPath:str=None, useSnapshot:bool=True, version:str=None) -> bool:
+        """Load UCD file(s) (see readFile()), via a
+        snapshot if there's an up-to-date one. Otherwise parse them, and
+        write a snapshot for next time. A snapshot is stale if any source
+        file's path, size, or mtime has changed, or (if `version` is given)
+        if it holds a different UCD version.
+        Returns True if the data came from a snapshot.
+        """
+        sources = UnicodeDBAccess.describeSources(paths)
+        keepList = sorted(keep) if keep else None
+        if (snapshotPath is None):
+            snapshotPath = UnicodeDBAccess.defaultSnapshotPath(sources, keepList)
+        if (useSnapshot and self.readSnapshot(snapshotPath, sources, keepList, version)):
+            return True
+        for path in paths:
+            self.readFile(path, keep=keep)
+        if (useSnapshot):
+            try:
+                self.writeSnapshot(snapshotPath, sources, keepList)
+            except OSError as e:
+                log(0, "Could not write snapshot '%s': %s" % (snapshotPath, e))
+        return False
+
+    @staticmethod
+    def describeSources(paths:List[str]) -> List[Dict]:
+        sources = []
+        for path in paths:
+            if (os.path.isdir(path)):
+                sources.extend(UnicodeDBAccess.describeSources(
+                    [ os.path.join(path, f)
+                    for f in UnicodeDBAccess.ucdDirectoryFiles(path) ]))
+                continue
+            st = os.stat(path)
+            sources.append({ "path": os.path.abspath(path),
+                "size": st.st_size, "mtime": st.st_mtime_ns })
+        return sources
+
+    @staticmethod
+    def defaultSnapshotPath(sources:List[Dict], keepList:List[str]=None) -> str:
+        key = json.dumps([ [ s["path"] for s in sources ], keepList ])
+        return os.path.join(UnicodeDBAccess.SNAPSHOT_DIR,
+            "ucd-%s.snap" % (hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]))
+
+    def writeSnapshot(self, path:str, sources:List[Dict]=None,
+        keepList:List[str]=None) -> None:
+        """Write the loaded tables to a snapshot file (via a temporary file,
+        so readers never see a partial one).
+        """
+        ce = self.charEntries
+        blobs = []
+        offset = 0
+
+        def place(arr) -> List:
+            nonlocal offset
+            data = bytes(arr)
+            blobs.append(data + bytes(-len(data) % 8))
+            info = [ offset, len(arr), arr.format if isinstance(arr, memoryview)
+                else arr.typecode ]
+            offset += len(blobs[-1])
+            return info
+
+        header = {
+            "sources": sources or [],
+            "keep": keepList,
+            "version": self.version,
+            "byteorder": sys.byteorder,
+            "firsts": place(ce.firsts),
+            "lasts": place(ce.lasts),
+            "columns": {},
+        }
+        for name, col in ce.columns.items():
+            header["columns"][name] = {
+                "end": col.end,
+                "starts": place(col.starts),
+                "codes": place(col.codes),
+                "values": col.valueTable.values,
+            }
+        headerBytes = json.dumps(header).encode("utf-8")
+        headerBytes += b" " * (-(len(headerBytes) + 16) % 8)
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmpPath = "%s.%d.tmp" % (path, os.getpid())
+        with open(tmpPath, "wb") as ofh:
+            ofh.write(UnicodeDBAccess.SNAPSHOT_MAGIC)
+            ofh.write(len(headerBytes).to_bytes(8, "little"))
+            ofh.write(headerBytes)
+            for blob in blobs: ofh.write(blob)
+        os.replace(tmpPath, path)
+        log(1, "Wrote snapshot '%s' (%d bytes of tables)." % (path, offset))
+
+    def readSnapshot(self, path:str, sources:List[Dict]=None,
+        keepList:List[str]=None, version:str=None) -> bool:
+        """Map a snapshot file in, if it exists and matches the given sources
+        (and keep list and version, if given). The arrays are used in place
+        (as memoryviews into the read-only map); only the value lists are
+        decoded. If values are already interned for a property (from another
+        version), the snapshot's codes are translated to match, which copies
+        that column.
+        Returns False (loading nothing) if it's missing, stale, or damaged.
+        """
+        try:
+            with open(path, "rb") as ifh:
+                mm = mmap.mmap(ifh.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return False
+        try:
+            loaded = self.mapSnapshot(mm, path, sources, keepList, version)
+        except (ValueError, KeyError, TypeError, IndexError) as e:
+            log(0, "Snapshot '%s' is damaged (%s: %s); ignoring it." %
+                (path, type(e).__name__, e))
+            loaded = False
+        if (not loaded):
+            try:
+                mm.close()
+            except BufferError:  # A view is still around; let GC close it
+                pass
+            return False
+        self.snapshotMap = mm
+        log(1, "Mapped snapshot '%s'." % (path))
+        return True
+
+    def mapSnapshot(self, mm:mmap.mmap, path:str, sources:List[Dict],
+        keepList:List[str], version:str) -> bool:
+        """Do the work of readSnapshot() on the mapped file. Returns False if
+        it's not a snapshot or is stale; raises ValueError, KeyError, etc. if
+        it's damaged (say, truncated). The tables are only replaced if it
+        succeeds.
+        """
+        magicLen = len(UnicodeDBAccess.SNAPSHOT_MAGIC)
+        if (mm[0:magicLen] != UnicodeDBAccess.SNAPSHOT_MAGIC):
+            log(0, "Not a snapshot file (or an old format): '%s'." % (path))
+            return False
+        headerLen = int.from_bytes(mm[magicLen:magicLen+8], "little")
+        dataStart = magicLen + 8 + headerLen
+        if (dataStart > len(mm)): raise ValueError("Truncated header.")
+        header = json.loads(mm[magicLen+8:dataStart].decode("utf-8"))
+        if (header["byteorder"] != sys.byteorder
+            or (sources is not None and header["sources"] != sources)
+            or (keepList is not None and header["keep"] != keepList)
+            or (version is not None and header["version"] != version)):
+            log(1, "Snapshot '%s' is stale." % (path))
+            return False
+
+        mv = memoryview(mm)
+
+        def view(info:List) -> memoryview:
+            off, n, typecode = info
+            nbytes = n * array(typecode).itemsize
+            if (dataStart + off + nbytes > len(mm)): raise ValueError("Truncated data.")
+            return mv[dataStart+off:dataStart+off+nbytes].cast(typecode)
+
+        ce = UdbColumns(self.valueTables)
+        ce.firsts = view(header["firsts"])
+        ce.lasts = view(header["lasts"])
+        for name, colInfo in header["columns"].items():
+            values = colInfo["values"]
+            if (name not in self.valueTables):
+                self.valueTables[name] = InternTable.fromValues(values)
+            vt = self.valueTables[name]
+            col = UdbColumn(name, end=colInfo["end"], valueTable=vt)
+            col.starts = view(colInfo["starts"])
+            col.codes = view(colInfo["codes"])
+            remap = [ vt.intern(v) for v in values ]
+            if (remap != list(range(len(values)))):
+                col.codes = array(codeTypeFor(len(vt)), [ remap[c] for c in col.codes ])
+            ce.columns[name] = col
+        self.version = header["version"]
+        self.charEntries = ce
+        return True
+
+
+###############################################################################
+# Comparing UCD versions
+#
+def appendRange(bounds:array, first:int, end:int) -> None:
+    """Add [first, end) to a RangeSet-style bounds array, merging it with the
+    last range if they touch.
+    """
+    if (bounds and bounds[-1] == first): bounds[-1] = end
+    else:
+        bounds.append(first)
+        bounds.append(end)
+
+class PropertyDiff:
+    """How one property differs between two versions: RangeSets of the code
+    points that gained a value (`added`), lost one (`removed`), or have a
+    different one (`changed`); and `changes`, a list of
+    (first, last, oldValue, newValue) for each range that differs.
+    """
+    def __init__(self, prop:str, added:RangeSet, removed:RangeSet,
+        changed:RangeSet, changes:List[Tuple[int, int, object, object]]):
+        self.prop = prop
+        self.added = added
+        self.removed = removed
+        self.changed = changed
+        self.changes = changes
+
+    def __bool__(self) -> bool:
+        return bool(self.changes)
+
+    def all(self) -> RangeSet:
+        """All the code points where the value differs at all.
+        """
+        return self.added | self.removed | self.changed
+
+    def toString(self) -> str:
+        return "%s: %d added, %d removed, %d changed (%d ranges)." % (
+            self.prop, len(self.added), len(self.removed), len(self.changed),
+            len(self.changes))
+
+def diffColumns(old:UdbColumn, new:UdbColumn) -> PropertyDiff:
+    """Compare two columns for the same property, by walking their runs
+    together: each step covers a stretch where neither column's value
+    changes, so the work is proportional to the number of runs, not of
+    code points. If the columns share an InternTable (see UcdVersions), the
+    value codes are compared directly; otherwise new codes are first
+    translated to old ones.
+    """
+    aStarts, aCodes, aEnd = old.starts, old.codes, old.end
+    bStarts, bCodes, bEnd = new.starts, new.codes, new.end
+    remap = None
+    if (new.valueTable is not old.valueTable):
+        oldCodes = old.valueTable.codes
+        remap = [ oldCodes.get(v, -1 - i)
+            for i, v in enumerate(new.valueTable.values) ]
+    end = max(aEnd, bEnd)
+    na, nb = len(aStarts), len(bStarts)
+    added, removed, changed = array("I"), array("I"), array("I")
+    changes = []  # [ first, end, oldCode, newCode ]
+    i = j = pos = 0
+    while (pos < end):
+        if (pos < aEnd):
+            ca = aCodes[i]
+            nextA = aStarts[i+1] if i+1 < na else aEnd
+        else:
+            ca, nextA = 0, end
+        if (pos < bEnd):
+            cb = bCodes[j] if remap is None else remap[bCodes[j]]
+            nextB = bStarts[j+1] if j+1 < nb else bEnd
+        else:
+            cb, nextB = 0, end
+        nxt = min(nextA, nextB)
+        if (ca != cb):
+            if (ca == 0): appendRange(added, pos, nxt)
+            elif (cb == 0): appendRange(removed, pos, nxt)
+            else: appendRange(changed, pos, nxt)
+            if (changes and changes[-1][1] == pos
+                and changes[-1][2] == ca and changes[-1][3] == cb):
+                changes[-1][1] = nxt
+            else:
+                changes.append([ pos, nxt, ca, cb ])
+        pos = nxt
+        if (nxt == nextA and i+1 < na): i += 1
+        if (nxt == nextB and j+1 < nb): j += 1
+
+    oldValues, newValues = old.valueTable.values, new.valueTable.values
+    def newValue(cb:int):
+        if (remap is None or cb >= 0): return oldValues[cb]
+        return newValues[-1 - cb]
+    return PropertyDiff(old.name, RangeSet.fromBounds(added),
+        RangeSet.fromBounds(removed), RangeSet.fromBounds(changed),
+        [ (first, nxt - 1, oldValues[ca], newValue(cb))
+            for first, nxt, ca, cb in changes ])
+
+class UcdVersions:
+    """Several versions of the UCD, loaded side by side under labels of your
+    choosing (say, "5.2.0" and "15.1.0"). They share one InternTable per
+    property, so a value is stored once no matter how many versions have it,
+    and comparing versions is comparing small integer codes.
+    """
+    def __init__(self):
+        self.valueTables = {}  # property name -> InternTable
+        self.versions = {}     # label -> UnicodeDBAccess
+
+    def __contains__(self, label:str) -> bool:
+        return label in self.versions
+
+    def __getitem__(self, label:str) -> UnicodeDBAccess:
+        return self.versions[label]
+
+    def labels(self) -> List[str]:
+        return list(self.versions.keys())
+
+    def load(self, label:str, paths:List[str], keep:Iterable[str]=None,
+        **kwargs) -> UnicodeDBAccess:
+        """Load a version from UCD file(s), via a snapshot if there's one
+        (see UnicodeDBAccess.load(), which gets any other keyword arguments).
+        """
+        udb = UnicodeDBAccess(valueTables=self.valueTables)
+        udb.load(paths, keep=keep, **kwargs)
+        self.versions[label] = udb
+        return udb
+
+    def column(self, label:str, prop:str) -> UdbColumn:
+        """Get a version's column for a property, or an empty one if that
+        version doesn't have it.
+        """
+        columns = self.versions[label].charEntries.columns
+        if (prop in columns): return columns[prop]
+        if (prop not in self.valueTables): self.valueTables[prop] = InternTable()
+        return UdbColumn(prop, valueTable=self.valueTables[prop])
+
+    def diff(self, prop:str, oldLabel:str, newLabel:str) -> PropertyDiff:
+        """Compare one property between two loaded versions.
+        """
+        for label in (oldLabel, newLabel):
+            if (label not in self.versions):
+                raise KeyError("Version '%s' not loaded." % (label))
+        return diffColumns(self.column(oldLabel, prop), self.column(newLabel, prop))
+
+    def diffAll(self, oldLabel:str, newLabel:str,
+        props:Iterable[str]=None) -> Dict[str, PropertyDiff]:
+        """Compare the given properties (default: all that either version
+        has), returning a dict of just the ones that differ.
+        """
+        if (props is None):
+            props = sorted(set(self.versions[oldLabel].charEntries.columns)
+                | set(self.versions[newLabel].charEntries.columns))
+        diffs = {}
+        for prop in props:
+            pd = self.diff(prop, oldLabel, newLabel)
+            if (pd): diffs[prop] = pd
+        return diffs
+
+
+###############################################################################
+# Unihan, loaded lazily by field and shard
+#
+class UnihanShards:
+    """Access to Unihan data (`Unihan.zip`, or one of its `Unihan_*.txt`
+    files) without parsing the whole thing. The first time a given file is
+    opened, it is read once and re-written (under SNAPSHOT_DIR) grouped by
+    field and by shard (runs of 2**shardBits code points), with an index of
+    where each (field, shard) is. After that, opening is just reading that
+    index, and looking up a field of a character reads and parses only that
+    field's lines for that character's shard. Parsed shards are kept, up to
+    `maxShards`, discarding the least-recently-used ones beyond that.
+    The index is rebuilt if the source file's size or mtime changes.
+    """
+    INDEX_MAGIC = b"UNIHAN\x00\x01"
+
+    def __init__(self, path:str, indexPath:str=None, maxShards:int=256,
+        shardBits:int=8):
+        self.path = path
+        self.shardBits = shardBits
+        self.maxShards = maxShards
+        self.shards = OrderedDict()  # (field, shard number) -> { cp: value }
+        self.fieldIndex = {}         # field -> { shard number: [ offset, length ] }
+        self.hits = self.misses = self.evictions = 0
+        self.indexMap = None
+        self.dataStart = 0
+
+        sources = UnicodeDBAccess.describeSources([ path ])
+        if (indexPath is None):
+            key = json.dumps([ sources[0]["path"], shardBits ])
+            indexPath = os.path.join(UnicodeDBAccess.SNAPSHOT_DIR,
+                "unihan-%s.idx" % (hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]))
+        if (not self.openIndex(indexPath, sources)):
+            self.buildIndex(indexPath, sources)
+            if (not self.openIndex(indexPath, sources)):
+                raise IOError("Could not read back Unihan index '%s'." % (indexPath))
+
+    @staticmethod
+    def readUnihanLines(path:str) -> Iterator[Tuple[int, str, str]]:
+        """Generate (cp, field, value) from a Unihan file, or from each
+        .txt member of a Unihan zip file.
+        """
+        if (zipfile.is_zipfile(path)):
+            with zipfile.ZipFile(path) as zf:
+                for name in sorted(zf.namelist()):
+                    if (not name.endswith(".txt")): continue
+                    with zf.open(name) as bfh:
+                        yield from UnihanShards.parseUnihanLines(
+                            io.TextIOWrapper(bfh, encoding="utf-8"))
+        else:
+            with codecs.open(path, "rb", encoding="utf-8") as ifh:
+                yield from UnihanShards.parseUnihanLines(ifh)
+
+    @staticmethod
+    def parseUnihanLines(ifh) -> Iterator[Tuple[int, str, str]]:
+        """Lines are like "U+3400<TAB>kCantonese<TAB>jau1".
+        """
+        for line in ifh:
+            if (line.startswith("#") or not line.strip()): continue
+            cp, field, value = line.rstrip("\r\n").split("\t", 2)
+            yield int(cp[2:], 16), field, value
+
+    def buildIndex(self, indexPath:str, sources:List[Dict]) -> None:
+        """Read the whole source once, and write its lines grouped by field and
+        shard, preceded by a JSON header locating each group. The layout is
+        like that of UnicodeDBAccess snapshots: INDEX_MAGIC, the header length
+        (8 bytes, little-endian), the header, then the data.
+        """
+        groups = {}  # field -> { shard number: [ "XXXX\tvalue", ... ] }
+        nLines = 0
+        for cp, field, value in UnihanShards.readUnihanLines(self.path):
+            if (field not in groups): groups[field] = {}
+            shards = groups[field]
+            shardNum = cp >> self.shardBits
+            if (shardNum not in shards): shards[shardNum] = []
+            shards[shardNum].append("%04X\t%s" % (cp, value))
+            nLines += 1
+
+        blobs = []
+        offset = 0
+        header = { "sources": sources, "shardBits": self.shardBits, "fields": {} }
+        for field in sorted(groups.keys()):
+            locs = header["fields"][field] = {}
+            for shardNum in sorted(groups[field].keys()):
+                blob = ("\n".join(groups[field][shardNum]) + "\n").encode("utf-8")
+                locs[shardNum] = [ offset, len(blob) ]
+                blobs.append(blob)
+                offset += len(blob)
+        headerBytes = json.dumps(header).encode("utf-8")
+
+        os.makedirs(os.path.dirname(os.path.abspath(indexPath)), exist_ok=True)
+        tmpPath = "%s.%d.tmp" % (indexPath, os.getpid())
+        with open(tmpPath, "wb") as ofh:
+            ofh.write(UnihanShards.INDEX_MAGIC)
+            ofh.write(len(headerBytes).to_bytes(8, "little"))
+            ofh.write(headerBytes)
+            for blob in blobs: ofh.write(blob)
+        os.replace(tmpPath, indexPath)
+        log(1, "Indexed %d Unihan lines (%d fields) into '%s'." %
+            (nLines, len(groups), indexPath))
+
+    def openIndex(self, indexPath:str, sources:List[Dict]) -> bool:
+        """Map an index file in, if it exists and matches the source.
+        """
+        try:
+            with open(indexPath, "rb") as ifh:
+                mm = mmap.mmap(ifh.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return False
+        magicLen = len(UnihanShards.INDEX_MAGIC)
+        if (mm[0:magicLen] != UnihanShards.INDEX_MAGIC):
+            return False
+        headerLen = int.from_bytes(mm[magicLen:magicLen+8], "little")
+        self.dataStart = magicLen + 8 + headerLen
+        header = json.loads(mm[magicLen+8:self.dataStart].decode("utf-8"))
+        if (header["sources"] != sources or header["shardBits"] != self.shardBits):
+            log(1, "Unihan index '%s' is stale." % (indexPath))
+            return False
+        self.fieldIndex = {
+            field: { int(shardNum): loc for shardNum, loc in locs.items() }
+            for field, locs in header["fields"].items() }
+        self.indexMap = mm
+        self.shards.clear()
+        return True
+
+    def close(self) -> None:
+        self.shards.clear()
+        if (self.indexMap is not None): self.indexMap.close()
+        self.indexMap = None
+
+    def fields(self) -> List[str]:
+        return sorted(self.fieldIndex.keys())
+
+    def shard(self, field:str, shardNum:int) -> Dict[int, str]:
+        """Return { cp: value } for one field in one shard, parsing it (and
+        discarding the least-recently-used shard if there are too many) if
+        it isn't already loaded.
+        """
+        key = (field, shardNum)
+        try:
+            values = self.shards[key]
+        except KeyError:
+            pass
+        else:
+            self.hits += 1
+            self.shards.move_to_end(key)
+            return values
+        self.misses += 1
+        if (field not in self.fieldIndex):
+            raise KeyError("Unknown Unihan field '%s'." % (field))
+        values = {}
+        loc = self.fieldIndex[field].get(shardNum)
+        if (loc):
+            start = self.dataStart + loc[0]
+            for line in self.indexMap[start:start+loc[1]].decode("utf-8").splitlines():
+                cp, _, value = line.partition("\t")
+                values[int(cp, 16)] = value
+        self.shards[key] = values
+        if (self.maxShards > 0):
+            while (len(self.shards) > self.maxShards):
+                self.shards.popitem(last=False)
+                self.evictions += 1
+        return values
+
+    def get(self, cp:int, field:str, default:str=None) -> str:
+        """Return one field of one character.
+        """
+        return self.shard(field, cp >> self.shardBits).get(cp, default)
+
+    def lookup(self, cp:int, fields:Iterable[str]=None) -> Dict[str, str]:
+        """Return { field: value } for the fields (default: all) that a
+        character has.
+        """
+        shardNum = cp >> self.shardBits
+        found = {}
+        for field in (fields or self.fields()):
+            value = self.shard(field, shardNum).get(cp)
+            if (value is not None): found[field] = value
+        return found
+
+    def column(self, field:str, first:int=0, last:int=MAX_CP-1) -> Iterator[Tuple[int, str]]:
+        """Generate (cp, value) for the characters from first to last
+        (inclusive) that have the field, in order, loading just those shards.
+        """
+        locs = self.fieldIndex.get(field)
+        if (locs is None): raise KeyError("Unknown Unihan field '%s'." % (field))
+        for shardNum in sorted(locs.keys()):
+            if (shardNum < first >> self.shardBits): continue
+            if (shardNum > last >> self.shardBits): break
+            for cp, value in sorted(self.shard(field, shardNum).items()):
+                if (first <= cp <= last): yield cp, value
+
+    def getStats(self) -> Dict:
+        return {
+            "fields":    len(self.fieldIndex),
+            "loaded":    len(self.shards),
+            "maxShards": self.maxShards,
+            "hits":      self.hits,
+            "misses":    self.misses,
+            "evictions": self.evictions,
+        }
+
+
+###############################################################################
+# Main
+#
+if __name__ == "__main__":
+    import argparse
+
+    def processOptions() -> argparse.Namespace:
+        try:
+            from BlockFormatter import BlockFormatter
+            parser = argparse.ArgumentParser(
+                description=descr, formatter_class=BlockFormatter)
+        except ImportError:
+            parser = argparse.ArgumentParser(description=descr)
+
+        parser.add_argument(
+            "--compile", type=str, metavar="P", action="append",
+            help="Compile property P into a two-stage table, and report its size.")
+        parser.add_argument(
+            "--diffProperty", type=str, metavar="P", action="append",
+            help="With --diffWith, compare only property P (repeatable).")
+        parser.add_argument(
+            "--diffWith", type=str, metavar="PATH", action="append",
+            help="Load this (older) version of the UCD as well, and report "
+            "which code points were added, removed, or changed for each "
+            "property (repeatable, for multiple files of one version).")
+        parser.add_argument(
+            "--find", type=str, metavar="P=V", action="append",
+            help="List code points whose property P has value V (repeatable).")
+        parser.add_argument(
+            "--noSnapshot", action="store_true",
+            help="Parse the files even if there's a snapshot, and don't write one.")
+        parser.add_argument(
+            "--quiet", "-q", action="store_true",
+            help="Suppress most messages.")
+        parser.add_argument(
+            "--snapshot", type=str, metavar="PATH", default=None,
+            help="Where to keep the compiled snapshot of the files "
+            "(default: under ~/.strfchr/ucd/).")
+        parser.add_argument(
+            "--stats", action="store_true",
+            help="Report the number of distinct values of each property.")
+        parser.add_argument(
+            "--where", type=str, metavar="EXPR", action="append",
+            help="List the ranges of code points matching a boolean query, "
+            "such as 'lb=BA & ~gc=Zs' (repeatable).")
+        parser.add_argument(
+            "--unihan", type=str, metavar="PATH",
+            help="Unihan.zip (or a Unihan .txt file) to look characters up in.")
+        parser.add_argument(
+            "--unihanChar", type=str, metavar="CP", action="append",
+            help="Show the Unihan fields of this code point (hex; repeatable).")
+        parser.add_argument(
+            "--unihanField", type=str, metavar="F", action="append",
+            help="With --unihanChar, show only field F (repeatable).")
+        parser.add_argument(
+            "--verbose", "-v", action="count", default=0,
+            help="Add more messages (repeatable).")
+        parser.add_argument(
+            "--version", action="version", version=__version__,
+            help="Display version information, then exit.")
+
+        parser.add_argument(
+            "files", type=str, nargs=argparse.REMAINDER,
+            help="Path(s) to UCD file(s) (.xml, .zip, UnicodeData.txt, "
+            "Scripts.txt, etc.), or to a directory of the .txt files.")
+
+        args0 = parser.parse_args()
+        if (lg and args0.verbose):
+            logging.basicConfig(level=logging.INFO - args0.verbose)
+        return(args0)
+
+    args = processOptions()
+    verbose = args.verbose
+
+    versions = UcdVersions()
+    if (args.diffWith):
+        versions.load("old", args.diffWith, useSnapshot=not args.noSnapshot)
+    udb = UnicodeDBAccess(valueTables=versions.valueTables)
+    if (args.files):
+        udb.load(args.files, snapshotPath=args.snapshot,
+            useSnapshot=not args.noSnapshot)
+    versions.versions["new"] = udb
+    if (not args.quiet):
+        print("Loaded %d code points, %d properties." %
+            (len(udb.charEntries), len(udb.charEntries.columns)))
+
+    if (args.stats):
+        for prop0 in sorted(udb.charEntries.columns.keys()):
+            col0 = udb.charEntries.columns[prop0]
+            print("    %-12s %6d values, %6d runs, %8d bytes" %
+                (prop0, len(col0.valueTable) - 1, len(col0), col0.nbytes()))
+
+    for prop0 in (args.compile or []):
+        for levels0 in (2, 3):
+            tst0 = udb.compileTable(prop0, levels=levels0)
+            print("%s: %d-stage table, %d bytes, %d values." %
+                (prop0, levels0, tst0.nbytes(), len(tst0.values) - 1))
+
+    for find0 in (args.find or []):
+        prop0, _, val0 = find0.partition("=")
+        print(" ".join([ "%04X" % (cp0) for cp0 in udb.charEntries.findAll(prop0, val0) ]))
+
+    for query0 in (args.where or []):
+        rs0 = udb.query(query0)
+        if (not args.quiet):
+            print("%d code points in %d ranges:" % (len(rs0), rs0.rangeCount()))
+        print(rs0.toString())
+
+    if (args.unihan):
+        udb.openUnihan(args.unihan)
+        for cp0 in (args.unihanChar or []):
+            cp0 = int(cp0, 16)
+            for field0, val0 in sorted(udb.unihanShards.lookup(
+                cp0, args.unihanField).items()):
+                print("U+%04X\t%s\t%s" % (cp0, field0, val0))
+        if (args.verbose):
+            print(json.dumps(udb.unihanShards.getStats()))
+
+    if (args.diffWith):
+        diffs0 = versions.diffAll("old", "new", props=args.diffProperty)
+        if (not args.quiet):
+            print("%d properties differ (%s vs. %s)." % (len(diffs0),
+                versions["old"].version, udb.version))
+        for pd0 in diffs0.values():
+            print(pd0.toString())
+            if (args.verbose):
+                for first0, last0, old0, new0 in pd0.changes:
+                    print("    %04X..%04X: %s -> %s" % (first0, last0, old0, new0))
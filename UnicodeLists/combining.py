@@ -1,13 +1,13 @@
 import re
 combiningCharsExpr = re.compile(
     r'[' +
-    r'\x{0300}-\x{036f}\x{0483}-\x{0489}\x{07eb}-\x{07f3}' +
-    r'\x{135d}-\x{135f}\x{1a7f}\x{1b6b}-\x{1b73}\x{1dc0}-\x{1de6}' +
-    r'\x{1dfc}-\x{1dfF}\x{20d0}-\x{20f0}\x{2cef}-\x{2cf1}' +
-    r'\x{2de0}-\x{2dff}\x{3099}-\x{309a}\x{a66f}-\x{a69f}' + # cyr, bamum
-    r'\x{a6f0}-\x{a6f1}\x{a8e0}-\x{a8f1}\x{fe20}-\x{fe26}' + # devanagri
-    r'\x{101fd}\x{1d165}-\x{1d172}\x{1d17b}-\x{1d1ad}' +
-    r'\x{1d242}-\x{1d244}' +
+    r'\u0300-\u036f\u0483-\u0489\u07eb-\u07f3' +
+    r'\u135d-\u135f\u1a7f\u1b6b-\u1b73\u1dc0-\u1de6' +
+    r'\u1dfc-\u1dff\u20d0-\u20f0\u2cef-\u2cf1' +
+    r'\u2de0-\u2dff\u3099-\u309a\ua66f-\ua69f' + # cyr, bamum
+    r'\ua6f0-\ua6f1\ua8e0-\ua8f1\ufe20-\ufe26' + # devanagri
+    r'\U000101fd\U0001d165-\U0001d172\U0001d17b-\U0001d1ad' +
+    r'\U0001d242-\U0001d244' +
     ']', flags=re.UNICODE)
 
 combiningChars = {
@@ -0,0 +1,532 @@
+#!/usr/bin/env python3
+#
+# bidiScan.py: Find bidi controls (and unbalanced ones) in files.
+# 2026-10-17: Written by Steven J. DeRose.
+#
+import sys
+import os
+import re
+import mmap
+import unicodedata
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Tuple
+import logging
+
+from UnicodeDBAccess import readSemicolonFile
+
+lg = logging.getLogger("bidiScan")
+
+__metadata__ = {
+    "title"        : "bidiScan",
+    "description"  : "Find bidi controls (and unbalanced ones) in files.",
+    "rightsHolder" : "Steven J. DeRose",
+    "creator"      : "http://viaf.org/viaf/50334488",
+    "type"         : "http://purl.org/dc/dcmitype/Software",
+    "language"     : "Python 3.7",
+    "created"      : "2026-10-17",
+    "modified"     : "2026-10-17",
+    "publisher"    : "http://github.com/sderose",
+    "license"      : "https://creativecommons.org/licenses/by-sa/3.0/"
+}
+__version__ = __metadata__["modified"]
+
+descr = """
+=Name=
+
+bidiScan: Find bidi controls (and unbalanced ones) in files.
+
+
+=Description=
+
+Scan files (typically whole source or data trees, with `--recursive`) for
+the Unicode bidirectional embedding, override, and isolate controls, and
+report where they are and whether they balance. These are how "Trojan
+Source" attacks (CVE-2021-42574) make code display differently from how it
+compiles: for example, an RLO (RIGHT-TO-LEFT OVERRIDE) inside a comment or
+string that isn't closed before the end of the line reverses what follows
+it on the screen.
+
+The controls are the characters whose Bidi_Class (`bc`) is one of:
+
+    LRE RLE LRO RLO    embeddings and overrides (closed by PDF)
+    LRI RLI FSI        isolates (closed by PDI)
+    PDF PDI
+
+Following the Unicode Bidirectional Algorithm (UAX #9, rules X1-X8), on
+each line:
+
+* a PDF closes the innermost open embedding or override, unless an
+isolate was opened after it (then the PDF is "unmatched");
+* a PDI closes the innermost open isolate, and any embeddings and
+overrides opened after it (or is "unmatched" if there is no open isolate);
+* anything still open at the end of the line (or at a paragraph separator,
+Bidi_Class B, such as U+2029) is "unterminated".
+
+For each line with any controls, the line number and the count are shown,
+then each control with its *byte* offset in the file, its class, and any
+problem:
+
+    src/auth.c:12: 2 bidi controls, UNBALANCED
+        Byte      381: RLO  unterminated
+        Byte      397: LRI  unterminated
+
+With `--unbalancedOnly`, only lines with problems are shown. With
+`--marks`, the implicit marks LRM, RLM, and ALM are also listed (they
+never affect balance). With `--mirrored`, characters that `BidiMirroring.txt`
+lists (brackets, "<", ">", and so on) are also listed wherever they come
+after an RLE, RLO, or RLI on the same line: they may be shown as their
+mirror images, so "<" can look like ">", and "(" like ")".
+
+At the end, a summary goes to stderr, and the exit status is 1 if any
+line didn't balance (so this can be used as a check before committing).
+
+The classes come from `DerivedBidiClass.txt`, and the mirror glyphs from
+`BidiMirroring.txt`, in `--ucdDir` (by default `~/.strfchr/ucd/`, or its
+`extracted/` subdirectory), if they're there. If not, Python's
+`unicodedata.bidirectional()` and `unicodedata.mirrored()` are used
+(without the mirror glyphs).
+
+==Speed==
+
+The classes are only looked up once, at start-up, to build a regex over
+the UTF-8 encodings of the characters of interest (see `makeBytesExpr()`).
+Each file is then mapped in with `mmap`, and searched as bytes, so nothing is
+decoded. First each possible leading byte (there are only a few: \\xE2 covers
+all the controls but the paragraph separators) is looked for with `find()`,
+which is many times faster than any regex; files with none of them (such as
+all-ASCII ones) are done at that point. Otherwise the regex is run from the
+first one found. Lines are only located, and the balance checked, around the
+controls actually found.
+Files are spread over a pool of `--jobs` processes (default: the number of
+CPUs), and reported in the order given.
+
+The same checks are available on decoded strings, via `scanString()` (which
+gives character rather than byte offsets); `findBadChars.py --bidi` uses it.
+
+
+=Related Commands=
+
+`findBadChars.py` (see its `--bidi` option), `showInvisibles.py`,
+`UnicodeDBAccess.py`.
+
+
+=Known bugs and Limitations=
+
+Files are assumed to be UTF-8 (or ASCII); controls in UTF-16 or other
+encodings are not found. Binary files are scanned too, but rarely contain
+these byte sequences.
+
+Lines end at LF; a CR alone (old Mac line ends) does not end a line.
+
+The embedding depth limit of 125 (rule X5) is not checked.
+
+`--mirrored` doesn't work out which neutral characters actually resolve
+to right-to-left (only under RLO is that certain), so it can list some that
+display normally.
+
+With `--recursive`, `.git`, `.hg`, and `.svn` directories are skipped,
+but nothing else is (there's no `.gitignore` handling).
+
+
+=History=
+
+* 2026-10-17: Written by Steven J. DeRose.
+
+
+=Rights=
+
+Copyright 2026-10-17 by Steven J. DeRose. This work is licensed under a
+Creative Commons Attribution-Share-alike 3.0 unported license.
+See [http://creativecommons.org/licenses/by-sa/3.0/] for more information.
+
+For the most recent version, see [http://www.derose.net/steve/utilities]
+or [https://github.com/sderose].
+
+
+=Options=
+"""
+
+verbose = 0
+def log(lvl:int, msg:str) -> None:
+    if (verbose >= lvl): sys.stderr.write(msg+"\n")
+
+DEFAULT_UCD_DIR = os.path.expanduser("~/.strfchr/ucd")
+
+# Bidi_Class values of the controls, and what kind of thing each opens
+# ("E" for embeddings and overrides, "I" for isolates).
+CONTROL_CLASSES = ( "LRE", "RLE", "LRO", "RLO", "PDF", "LRI", "RLI", "FSI", "PDI" )
+OPENERS = {
+    "LRE": "E", "RLE": "E", "LRO": "E", "RLO": "E",
+    "LRI": "I", "RLI": "I", "FSI": "I",
+}
+RTL_OPENERS = ( "RLE", "RLO", "RLI" )
+
+# The implicit marks have ordinary classes (L, R, AL), so go by code point.
+MARKS = { 0x200E: "LRM", 0x200F: "RLM", 0x061C: "ALM" }
+
+# Paragraph separators other than these end a "line" for balancing, too.
+LINE_ENDS = ( 0x000A, 0x000D )
+
+VCS_DIRS = ( ".git", ".hg", ".svn" )
+
+
+###############################################################################
+#
+def byteClass(byteList:Iterable[int]) -> bytes:
+    return b"[" + b"".join(re.escape(bytes([b])) for b in sorted(byteList)) + b"]"
+
+def makeBytesExpr(codePoints:Iterable[int]) -> Tuple[re.Pattern, bytes]:
+    """Make a bytes regex that matches the UTF-8 for any of the code points,
+    and return it and the (distinct) leading bytes. The regex starts with a
+    class of the leading bytes, and checks the rest after (re scans for a
+    leading class much faster than for alternatives):
+        [\\x1C-\\x1E\\xC2\\xE2](?:(?<=[\\x1C-\\x1E])|(?<=\\xC2)\\x85|...)
+    Encodings that differ only in the last byte also share a class.
+    """
+    byLead = defaultdict(lambda: defaultdict(list))
+    for cp in sorted(codePoints):
+        utf8 = chr(cp).encode("utf-8")
+        if (len(utf8) > 1): byLead[utf8[0]][utf8[1:-1]].append(utf8[-1])
+        else: byLead[utf8[0]]
+    alts = []
+    singles = [ lead for lead in byLead if not byLead[lead] ]
+    if (singles): alts.append(b"(?<=" + byteClass(singles) + b")")
+    for lead, byMiddle in sorted(byLead.items()):
+        if (not byMiddle): continue
+        alts.append(b"(?<=" + re.escape(bytes([lead])) + b")(?:" +
+            b"|".join(re.escape(middle) + byteClass(lasts)
+                for middle, lasts in sorted(byMiddle.items())) + b")")
+    return (re.compile(byteClass(byLead) + b"(?:" + b"|".join(alts) + b")"),
+        bytes(sorted(byLead)))
+
+def readBidiClasses(path:str, wanted:Iterable[str]) -> Dict[int, str]:
+    """Read DerivedBidiClass.txt, and return a dict of the code points
+    that have any of the `wanted` classes, to their class.
+    """
+    wanted = set(wanted)
+    classOf = {}
+    for first, last, fields in readSemicolonFile(path):
+        if (fields[0] not in wanted): continue
+        for cp in range(first, last+1): classOf[cp] = fields[0]
+    return classOf
+
+def readMirroring(path:str) -> Dict[int, int]:
+    """Read BidiMirroring.txt, and return a dict of each code point to its
+    mirror glyph.
+    """
+    return { first: int(fields[0], 16)
+        for first, _last, fields in readSemicolonFile(path) }
+
+
+###############################################################################
+#
+class BidiScanner:
+    """Find bidi controls in bytes (as UTF-8), files, or strs, and check
+    that they balance per line.
+
+    Findings come back as (offset, name, problem) tuples, where name is the
+    Bidi_Class (like "RLO"), or the mark name, or "MIRROR" for mirrored
+    characters; and problem is "" (for controls that balance),
+    "unmatched", "unterminated", or (for "MIRROR") the character and its
+    mirror glyph.
+    """
+    def __init__(self, ucdDir:str=None, marks:bool=False, mirrored:bool=False):
+        self.ucdDir = ucdDir or DEFAULT_UCD_DIR
+        self.marks = marks
+        self.mirrored = mirrored
+
+        wanted = CONTROL_CLASSES + ( "B", )
+        path = self.findUcdFile("DerivedBidiClass.txt")
+        if (path):
+            self.classOf = readBidiClasses(path, wanted)
+        else:
+            bidi = unicodedata.bidirectional
+            self.classOf = { cp: bidi(chr(cp)) for cp in range(0x110000)
+                if bidi(chr(cp)) in wanted }
+        for cp in LINE_ENDS: self.classOf.pop(cp, None)
+        if (marks): self.classOf.update(MARKS)
+        self.nameOf = { chr(cp).encode("utf-8"): name
+            for cp, name in self.classOf.items() }
+        self.controlExpr, self.leadBytes = makeBytesExpr(self.classOf)
+        self.controlCharExpr = re.compile("[%s]" %
+            ("".join(re.escape(chr(cp)) for cp in sorted(self.classOf))))
+
+        self.mirrors = {}
+        self.mirrorExpr = None
+        if (mirrored):
+            path = self.findUcdFile("BidiMirroring.txt")
+            if (path):
+                self.mirrors = readMirroring(path)
+            else:
+                mirr = unicodedata.mirrored
+                self.mirrors = { cp: None for cp in range(0x110000)
+                    if mirr(chr(cp)) }
+            self.mirrorExpr, _leads = makeBytesExpr(self.mirrors)
+        log(1, "%d bidi controls and separators, %d mirrored characters." %
+            (len(self.classOf), len(self.mirrors)))
+
+    def findUcdFile(self, name:str) -> str:
+        """Return the path to a UCD file in ucdDir (or its extracted/
+        subdirectory), or None if it's in neither.
+        """
+        for path in (os.path.join(self.ucdDir, name),
+            os.path.join(self.ucdDir, "extracted", name)):
+            if (os.path.isfile(path)): return path
+        log(1, "No '%s' in '%s', so using unicodedata." % (name, self.ucdDir))
+        return None
+
+    def checkLine(self, controls:List[Tuple[int, str]], lineEnd:int,
+        buf=None) -> List[Tuple[int, str, str]]:
+        """Given the (offset, name) pairs for the controls (and paragraph
+        separators, named "B") in one line, work out which balance.
+        `lineEnd` is the offset just past the line. If `buf` is given (the
+        bytes the offsets refer to), and mirrored characters were asked for,
+        those after an RTL opener are found in it and added.
+        Returns findings (see the class doc), in order.
+        """
+        findings = []
+        stack = []  # Open (kind, offset, name, index into findings)
+        spans = []  # (start, end) of RTL spans, for mirrored characters
+
+        def close(entry:Tuple, at:int, problem:str="") -> None:
+            _kind, off, name, idx = entry
+            if (problem): findings[idx] = (off, name, problem)
+            if (name in RTL_OPENERS): spans.append((off, at))
+
+        for off, name in controls:
+            if (name == "B"):
+                while (stack): close(stack.pop(), off, "unterminated")
+                continue
+            findings.append((off, name, ""))
+            idx = len(findings) - 1
+            if (name in OPENERS):
+                stack.append((OPENERS[name], off, name, idx))
+            elif (name == "PDF"):
+                if (stack and stack[-1][0] == "E"): close(stack.pop(), off)
+                else: findings[idx] = (off, name, "unmatched")
+            elif (name == "PDI"):
+                if (any(entry[0] == "I" for entry in stack)):
+                    while (stack[-1][0] == "E"): close(stack.pop(), off)
+                    close(stack.pop(), off)
+                else:
+                    findings[idx] = (off, name, "unmatched")
+        while (stack): close(stack.pop(), lineEnd, "unterminated")
+
+        if (buf is not None and self.mirrorExpr is not None and spans):
+            seen = set()
+            for start, end in spans:
+                for mat in self.mirrorExpr.finditer(buf, start, end):
+                    if (mat.start() in seen): continue
+                    seen.add(mat.start())
+                    c = mat.group().decode("utf-8")
+                    glyph = self.mirrors.get(ord(c))
+                    findings.append((mat.start(), "MIRROR", "U+%04X '%s'%s" %
+                        (ord(c), c, " -> '%s'" % (chr(glyph)) if glyph else "")))
+            findings.sort()
+        return findings
+
+    def scanBuffer(self, buf) -> List[Tuple[int, List[Tuple[int, str, str]]]]:
+        """Scan bytes (or an mmap, or anything else the re module can
+        search) as UTF-8. Returns (lineNumber, findings) for each line that
+        has any controls (or marks, if those were asked for). Offsets are
+        byte offsets from the start of `buf`.
+        """
+        # Most files have none of the leading bytes at all, and find() is
+        # much faster than even a simple regex, so check first.
+        starts = [ buf.find(bytes([lead])) for lead in self.leadBytes ]
+        starts = [ start for start in starts if start >= 0 ]
+        if (not starts): return []
+
+        results = []
+        lineNum = 1
+        countedTo = 0
+        lineStart = lineEnd = -1
+        controls = []
+
+        def finishLine() -> None:
+            findings = self.checkLine(controls, lineEnd, buf)
+            if (findings): results.append((lineNum, findings))
+
+        for mat in self.controlExpr.finditer(buf, min(starts)):
+            off = mat.start()
+            if (off >= lineEnd):
+                if (controls): finishLine()
+                controls = []
+                lineStart = buf.rfind(b"\n", 0, off) + 1
+                lineNum += buf[countedTo:lineStart].count(b"\n")
+                countedTo = lineStart
+                lineEnd = buf.find(b"\n", off)
+                if (lineEnd < 0): lineEnd = len(buf)
+            controls.append((off, self.nameOf[mat.group()]))
+        if (controls): finishLine()
+        return results
+
+    def scanFile(self, path:str) -> List[Tuple[int, List[Tuple[int, str, str]]]]:
+        """Map in a file and scan it (see scanBuffer()). Empty or unreadable
+        files have no findings (the latter are logged).
+        """
+        try:
+            with open(path, "rb") as ifh:
+                if (os.fstat(ifh.fileno()).st_size == 0): return []
+                with mmap.mmap(ifh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    return self.scanBuffer(mm)
+        except (OSError, ValueError) as e:
+            lg.info("Cannot scan '%s':\n    %s", path, e)
+            return []
+
+    def scanString(self, s:str) -> List[Tuple[int, str, str]]:
+        """Check the controls in a str (taken as one line, though any
+        paragraph separators in it still count), and return findings with
+        character offsets. Mirrored characters are not checked.
+        """
+        controls = [ (mat.start(), self.classOf[ord(mat.group())])
+            for mat in self.controlCharExpr.finditer(s) ]
+        return self.checkLine(controls, len(s)) if controls else []
+
+    def isControl(self, c:str) -> bool:
+        return ord(c) in self.classOf and self.classOf[ord(c)] != "B"
+
+__bidiScanner__ = None
+
+def getBidiScanner() -> BidiScanner:
+    """Get a shared BidiScanner with the default settings.
+    """
+    global __bidiScanner__
+    if (__bidiScanner__ is None): __bidiScanner__ = BidiScanner()
+    return __bidiScanner__
+
+
+###############################################################################
+# Running over many files (see scanPaths()).
+#
+__workerScanner__ = None
+
+def initWorker(scanner:BidiScanner) -> None:
+    global __workerScanner__
+    __workerScanner__ = scanner
+
+def scanPath(path:str) -> Tuple[str, List]:
+    return path, __workerScanner__.scanFile(path)
+
+def iterPaths(paths:Iterable[str], recursive:bool=False) -> Iterator[str]:
+    """Generate the files to scan: the paths given, and (if `recursive`)
+    the files under any that are directories, except in VCS_DIRS.
+    """
+    for path in paths:
+        if (not os.path.isdir(path)):
+            yield path
+        elif (not recursive):
+            log(0, "Skipping directory '%s' (see --recursive)." % (path))
+        else:
+            for dirPath, dirNames, fileNames in os.walk(path):
+                dirNames[:] = sorted(d for d in dirNames if d not in VCS_DIRS)
+                for fileName in sorted(fileNames):
+                    yield os.path.join(dirPath, fileName)
+
+def scanPaths(scanner:BidiScanner, paths:Iterable[str],
+    jobs:int=1) -> Iterator[Tuple[str, List]]:
+    """Scan each file, and generate (path, results) in the order given.
+    With jobs > 1, the files are scanned in a pool of that many processes.
+    """
+    if (jobs <= 1):
+        initWorker(scanner)
+        yield from map(scanPath, paths)
+        return
+    with ProcessPoolExecutor(max_workers=jobs, initializer=initWorker,
+        initargs=(scanner,)) as pool:
+        yield from pool.map(scanPath, paths, chunksize=32)
+
+
+###############################################################################
+# Main
+#
+if __name__ == "__main__":
+    import argparse
+
+    def processOptions() -> argparse.Namespace:
+        try:
+            from BlockFormatter import BlockFormatter
+            parser = argparse.ArgumentParser(
+                description=descr, formatter_class=BlockFormatter)
+        except ImportError:
+            parser = argparse.ArgumentParser(description=descr)
+
+        parser.add_argument(
+            "--jobs", "-j", type=int, metavar="N", default=os.cpu_count() or 1,
+            help="Scan files in a pool of this many processes. Default: # of CPUs.")
+        parser.add_argument(
+            "--marks", action="store_true",
+            help="Also list the implicit marks LRM, RLM, and ALM.")
+        parser.add_argument(
+            "--mirrored", action="store_true",
+            help="Also list mirrored characters after RLE, RLO, or RLI.")
+        parser.add_argument(
+            "--quiet", "-q", action="store_true",
+            help="Suppress most messages.")
+        parser.add_argument(
+            "--recursive", "-r", action="store_true",
+            help="Descend into subdirectories.")
+        parser.add_argument(
+            "--ucdDir", type=str, metavar="PATH", default=DEFAULT_UCD_DIR,
+            help="Look here for DerivedBidiClass.txt and BidiMirroring.txt. "
+            "Default: %s." % (DEFAULT_UCD_DIR))
+        parser.add_argument(
+            "--unbalancedOnly", action="store_true",
+            help="Only show lines whose controls don't balance.")
+        parser.add_argument(
+            "--verbose", "-v", action="count", default=0,
+            help="Add more messages (repeatable).")
+        parser.add_argument(
+            "--version", action="version", version=__version__,
+            help="Display version information, then exit.")
+
+        parser.add_argument(
+            "files", type=str, nargs=argparse.REMAINDER,
+            help="Path(s) to input file(s) or (with --recursive) directories")
+
+        args0 = parser.parse_args()
+        if (lg and args0.verbose):
+            logging.basicConfig(level=logging.INFO - args0.verbose)
+        return(args0)
+
+    def showResults(path:str, results:List) -> Tuple[int, int]:
+        """Print the findings for one file, and return how many lines had
+        controls, and how many of those didn't balance.
+        """
+        nLines = nBad = 0
+        for lineNum, findings in results:
+            isBad = any(problem and name != "MIRROR"
+                for _off, name, problem in findings)
+            nLines += 1
+            if (isBad): nBad += 1
+            elif (args.unbalancedOnly): continue
+            nControls = sum(1 for f in findings if f[1] != "MIRROR")
+            print("%s:%d: %d bidi control%s%s" % (path, lineNum, nControls,
+                "" if nControls == 1 else "s", ", UNBALANCED" if isBad else ""))
+            for off, name, problem in findings:
+                print("    Byte %8d: %-4s %s" % (off, name, problem))
+        return nLines, nBad
+
+    args = processOptions()
+    verbose = args.verbose
+
+    bs0 = BidiScanner(ucdDir=args.ucdDir, marks=args.marks,
+        mirrored=args.mirrored)
+    nFiles = nLines0 = nBad0 = 0
+    if (not args.files):
+        if (sys.stdin.isatty() and not args.quiet): print("Waiting on STDIN...")
+        nFiles = 1
+        nLines0, nBad0 = showResults("[stdin]",
+            bs0.scanBuffer(sys.stdin.buffer.read()))
+    else:
+        for path0, results0 in scanPaths(bs0,
+            iterPaths(args.files, args.recursive), jobs=args.jobs):
+            nFiles += 1
+            n1, n2 = showResults(path0, results0)
+            nLines0 += n1
+            nBad0 += n2
+    if (not args.quiet):
+        log(0, "Scanned %d files: %d lines with bidi controls, %d unbalanced." %
+            (nFiles, nLines0, nBad0))
+    sys.exit(1 if nBad0 else 0)
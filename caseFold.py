@@ -0,0 +1,462 @@
+#!/usr/bin/env python3
+#
+# caseFold.py: Caseless matching, dedup, and sorting via Unicode case folding.
+# 2026-10-17: Written by Steven J. DeRose.
+#
+import sys
+import os
+import codecs
+import unicodedata
+from itertools import islice
+from functools import partial
+from typing import Callable, Dict, Iterable, List, Tuple
+import logging
+
+from UnicodeDBAccess import readSemicolonFile
+
+lg = logging.getLogger("caseFold")
+
+__metadata__ = {
+    "title"        : "caseFold",
+    "description"  : "Caseless matching, dedup, and sorting via Unicode case folding.",
+    "rightsHolder" : "Steven J. DeRose",
+    "creator"      : "http://viaf.org/viaf/50334488",
+    "type"         : "http://purl.org/dc/dcmitype/Software",
+    "language"     : "Python 3.7",
+    "created"      : "2026-10-17",
+    "modified"     : "2026-10-17",
+    "publisher"    : "http://github.com/sderose",
+    "license"      : "https://creativecommons.org/licenses/by-sa/3.0/"
+}
+__version__ = __metadata__["modified"]
+
+descr = """
+=Name=
+
+caseFold: Caseless matching, dedup, and sorting via Unicode case folding.
+
+
+=Description=
+
+Compare, deduplicate, and sort strings ignoring case, the way Unicode
+defines it: by case folding (not lower-casing, which gets "Straße" vs.
+"STRASSE", Greek final sigma, Cherokee, and such wrong):
+
+    cf = CaseFolder()
+    cf.fold("Straße")                       # "strasse"
+    cf.equal("STRASSE", "straße")           # True
+    cf.dedup(names)                         # First of each caseless group
+    cf.sort(names)                          # Caseless, stable
+
+The fold maps come from `CaseFolding.txt` (see `--ucdDir`; by default
+`~/.strfchr/ucd/`, if it's there). Its entries have a status:
+
+* C (common) and S (simple) make up *simple* folding, where each
+character folds to one character (so lengths and offsets don't change);
+
+* C and F (full) make up *full* folding (the default), where some fold to
+several (like "ß" to "ss");
+
+* T (Turkic) entries replace the mappings for "I" and "İ" (see `--turkic`).
+
+Each map is compiled once into a `str.translate()` table. If
+`CaseFolding.txt` isn't found, the tables are instead filled in from
+Python's `str.casefold()` as characters are first seen.
+
+For full folding without `--turkic`, if the file's mappings agree with
+Python's own (the same Unicode version), `str.casefold()` itself is used,
+since it's the fastest per-string fold there is. Beyond that, the speed for
+bulk work comes from re-use: `foldAll()`, `dedup()`, and `sort()` keep a
+table of strings already folded (as a dict filled in by `__missing__`, like
+the translate tables), and look each string up via `map()`, so for text with
+repeated words (most of it) each distinct string is folded only once. This
+is faster than a loop calling `str.casefold()` (about 1.5 to 3 times,
+depending on how much repetition there is). If a batch of strings turns out
+to be mostly new (say, a list of unique IDs), the next few batches are just
+folded directly, so that case costs little extra.
+
+With `--canonical`, strings are also put in NFD before and after folding
+(the "canonical caseless match" of the Unicode Standard, section 3.13), so
+"é" and "e\\u0301" match.
+
+`SpecialCasing.txt` (in the same directory) supplies the
+language-specific lower- and upper-case mappings that Python's `str.lower()`
+and `str.upper()` don't do, for Turkish and Azeri ("i" <-> "İ", "ı" <-> "I")
+and Lithuanian. These are also compiled into translate tables, per
+language:
+
+    cf.upper("istanbul", lang="tr")         # "İSTANBUL"
+
+As a command, folds each line of the input (or with `--dedup` or `--sort`,
+writes the lines deduplicated or sorted caselessly):
+
+    caseFold.py --dedup --sort names.txt
+
+
+=Related Commands=
+
+`changeCase` and `countByCase` (Perl), `showUnicodeCharsInClass.py`,
+`strfchr.py` (whose FOLD field uses this), `UnicodeDBAccess.py`.
+
+
+=Known bugs and Limitations=
+
+Only SpecialCasing.txt entries that depend on the language alone are used;
+those that also depend on context (like Lithuanian's More_Above) are not.
+Turkish "I" followed by COMBINING DOT ABOVE is lower-cased to "ı" plus the
+dot, not to "i".
+
+The table of folded strings grows up to `maxKeys` entries, and is then
+cleared.
+
+`sort()` of strings that are nearly all different is somewhat slower than
+`sorted(strings, key=str.casefold)`.
+
+
+=History=
+
+* 2026-10-17: Written by Steven J. DeRose.
+
+
+=Rights=
+
+Copyright 2026-10-17 by Steven J. DeRose. This work is licensed under a
+Creative Commons Attribution-Share-alike 3.0 unported license.
+See [http://creativecommons.org/licenses/by-sa/3.0/] for more information.
+
+For the most recent version, see [http://www.derose.net/steve/utilities]
+or [https://github.com/sderose].
+
+
+=Options=
+"""
+
+verbose = 0
+def log(lvl:int, msg:str) -> None:
+    if (verbose >= lvl): sys.stderr.write(msg+"\n")
+
+DEFAULT_UCD_DIR = os.path.expanduser("~/.strfchr/ucd")
+
+# Used if SpecialCasing.txt isn't available.
+TURKIC_CASING = {
+    "lower": { 0x0049: "ı", 0x0130: "i" },
+    "upper": { 0x0069: "İ" },
+}
+TURKIC_FOLDS = { 0x0049: "ı", 0x0130: "i" }
+
+BATCH_SIZE = 4096
+
+
+###############################################################################
+#
+class FoldTable(dict):
+    """A str.translate() table for when there's no CaseFolding.txt: each
+    character's fold is worked out from str.casefold() the first time
+    translate() asks.
+    """
+    def __init__(self, full:bool=True, overrides:Dict[int, str]=None):
+        super().__init__(overrides or {})
+        self.full = full
+
+    def __missing__(self, cp:int):
+        c = chr(cp)
+        val = c.casefold()
+        if (not self.full and len(val) != 1):
+            val = c.lower() if len(c.lower()) == 1 else c
+        val = self[cp] = cp if val == c else val
+        return val
+
+class CaseTable(dict):
+    """A str.translate() table for language-specific lower or upper case:
+    the SpecialCasing.txt entries for the language, plus whatever Python's
+    str.lower() or str.upper() gives for other characters, filled in as
+    they're first seen.
+    """
+    def __init__(self, mapper:Callable, overrides:Dict[int, str]):
+        super().__init__(overrides)
+        self.mapper = mapper
+
+    def __missing__(self, cp:int):
+        val = self[cp] = self.mapper(chr(cp))
+        return val
+
+class KeyCache(dict):
+    """Map strings to their folded forms, folding each the first time
+    it's asked for.
+    """
+    def __init__(self, folder:"CaseFolder"):
+        super().__init__()
+        self.folder = folder
+
+    def __missing__(self, s:str) -> str:
+        val = self[s] = self.folder.fold(s)
+        return val
+
+class CaseFolder:
+    def __init__(self, ucdDir:str=None, full:bool=True, turkic:bool=False,
+        canonical:bool=False, maxKeys:int=1<<20):
+        """Set up to fold. `ucdDir` is where to look for CaseFolding.txt and
+        SpecialCasing.txt (default: DEFAULT_UCD_DIR).
+        """
+        self.ucdDir = ucdDir or DEFAULT_UCD_DIR
+        self.full = full
+        self.turkic = turkic
+        self.canonical = canonical
+        self.maxKeys = maxKeys
+
+        self.table = None
+        self.useBuiltin = False
+        path = os.path.join(self.ucdDir, "CaseFolding.txt")
+        if (os.path.isfile(path)):
+            simple, fullMap, turkicMap = CaseFolder.readCaseFolding(path)
+            self.table = dict(fullMap if full else simple)
+            if (turkic): self.table.update(turkicMap)
+            self.useBuiltin = (full and not turkic and all(
+                chr(cp).casefold() == val for cp, val in fullMap.items()))
+        else:
+            log(1, "No '%s', so using Python's casefold()." % (path))
+            self.table = FoldTable(full, TURKIC_FOLDS if turkic else None)
+            self.useBuiltin = (full and not turkic)
+        if (self.useBuiltin): self.foldOne = str.casefold
+        else: self.foldOne = self.translateFold
+
+        self.specialCasing = None  # Read when first needed
+        self.caseTables = {}
+        self.keyCache = KeyCache(self)
+
+    @staticmethod
+    def readCaseFolding(path:str) -> Tuple[Dict, Dict, Dict]:
+        """Read CaseFolding.txt into three dicts from code point to folded
+        string: the simple map (C+S), the full map (C+F), and the Turkic
+        overrides (T).
+        """
+        simple = {}
+        full = {}
+        turkic = {}
+        for first, _last, fields in readSemicolonFile(path):
+            status, mapping = fields[0], fields[1]
+            val = "".join(chr(int(h, 16)) for h in mapping.split())
+            if (status in ("C", "S")): simple[first] = val
+            if (status in ("C", "F")): full[first] = val
+            if (status == "T"): turkic[first] = val
+        log(1, "Loaded %d simple, %d full, and %d Turkic folds from '%s'." %
+            (len(simple), len(full), len(turkic), path))
+        return simple, full, turkic
+
+    @staticmethod
+    def readSpecialCasing(path:str) -> Dict[Tuple[str, str], Dict[int, str]]:
+        """Read the language-specific entries of SpecialCasing.txt, into
+        { (kind, lang): { cp: mapping } }, where kind is "lower", "title", or
+        "upper". Entries that depend on context (other than Not_Before_Dot)
+        are skipped.
+        """
+        casing = {}
+        for first, _last, fields in readSemicolonFile(path):
+            if (len(fields) < 4 or not fields[3]): continue
+            conditions = fields[3].split()
+            lang = conditions[0]
+            if (not lang.islower()): continue  # Context-only, like Final_Sigma
+            if (conditions[1:] not in ([], [ "Not_Before_Dot" ])): continue
+            for kind, mapping in zip(("lower", "title", "upper"), fields[:3]):
+                val = "".join(chr(int(h, 16)) for h in mapping.split())
+                casing.setdefault((kind, lang), {})[first] = val
+        log(1, "Loaded %d language-specific casings from '%s'." % (len(casing), path))
+        return casing
+
+    def translateFold(self, s:str) -> str:
+        return s.translate(self.table)
+
+    def fold(self, s:str) -> str:
+        """Return the case-folded form of a string.
+        """
+        if (self.canonical):
+            return unicodedata.normalize("NFD",
+                self.foldOne(unicodedata.normalize("NFD", s)))
+        return self.foldOne(s)
+
+    def equal(self, s1:str, s2:str) -> bool:
+        return self.fold(s1) == self.fold(s2)
+
+    def foldAll(self, strings:Iterable[str]) -> List[str]:
+        """Fold a lot of strings, re-using the results for any seen before
+        (in this call or earlier ones). This goes in batches; after a batch
+        that was mostly new strings, the next 1, 2, 4,... batches are folded
+        directly, before trying the cache again.
+        """
+        keys = self.keyCache
+        direct = self.fold if self.canonical else self.foldOne
+        folded = []
+        nDirect = 0     # Batches left to fold directly
+        backoff = 1
+        it = iter(strings)
+        while (True):
+            batch = list(islice(it, BATCH_SIZE))
+            if (not batch): break
+            if (nDirect > 0):
+                folded.extend(map(direct, batch))
+                nDirect -= 1
+                continue
+            nBefore = len(keys)
+            folded.extend(map(keys.__getitem__, batch))
+            if ((len(keys) - nBefore) * 4 < len(batch)):
+                backoff = 1
+            else:
+                nDirect = backoff
+                backoff = min(backoff * 2, 64)
+            if (len(keys) > self.maxKeys): keys.clear()
+        return folded
+
+    def dedup(self, strings:Iterable[str]) -> List[str]:
+        """Return the strings, keeping only the first of those that fold
+        the same.
+        """
+        strings = list(strings)
+        firsts = {}
+        for i, key in enumerate(self.foldAll(strings)):
+            firsts.setdefault(key, i)
+        return [ strings[i] for i in firsts.values() ]
+
+    def sort(self, strings:Iterable[str], reverse:bool=False) -> List[str]:
+        """Return the strings sorted by their folded forms (stably, so ones
+        that fold the same stay in their original order).
+        """
+        strings = list(strings)
+        keys = iter(self.foldAll(strings))
+        # sorted() gets the keys in order, so each call just takes the next
+        # (the string itself is passed as next()'s unused default).
+        return sorted(strings, key=partial(next, keys), reverse=reverse)
+
+    def caseTable(self, kind:str, lang:str) -> Dict:
+        """Get (making if needed) the translate table for "lower" or "upper"
+        case in a language.
+        """
+        if ((kind, lang) in self.caseTables): return self.caseTables[(kind, lang)]
+        if (kind not in ("lower", "upper")):
+            raise KeyError("Unknown case kind '%s' (use 'lower' or 'upper')." % (kind))
+        if (self.specialCasing is None):
+            path = os.path.join(self.ucdDir, "SpecialCasing.txt")
+            if (os.path.isfile(path)):
+                self.specialCasing = CaseFolder.readSpecialCasing(path)
+            else:
+                self.specialCasing = {}
+                for lang0 in ("tr", "az"):
+                    for kind0, overrides in TURKIC_CASING.items():
+                        self.specialCasing[(kind0, lang0)] = overrides
+        table = CaseTable(str.lower if kind == "lower" else str.upper,
+            self.specialCasing.get((kind, lang), {}))
+        self.caseTables[(kind, lang)] = table
+        return table
+
+    def lower(self, s:str, lang:str=None) -> str:
+        if (not lang): return s.lower()
+        return s.translate(self.caseTable("lower", lang))
+
+    def upper(self, s:str, lang:str=None) -> str:
+        if (not lang): return s.upper()
+        return s.translate(self.caseTable("upper", lang))
+
+    def getStats(self) -> Dict:
+        return { "foldedStrings": len(self.keyCache),
+            "useBuiltin": self.useBuiltin,
+            "tableSize": len(self.table) }
+
+__caseFolder__ = None
+
+def getCaseFolder() -> CaseFolder:
+    """Get a shared CaseFolder with the default settings.
+    """
+    global __caseFolder__
+    if (__caseFolder__ is None): __caseFolder__ = CaseFolder()
+    return __caseFolder__
+
+def fold(s:str) -> str:
+    return getCaseFolder().fold(s)
+
+
+###############################################################################
+# Main
+#
+if __name__ == "__main__":
+    import argparse
+
+    def processOptions() -> argparse.Namespace:
+        try:
+            from BlockFormatter import BlockFormatter
+            parser = argparse.ArgumentParser(
+                description=descr, formatter_class=BlockFormatter)
+        except ImportError:
+            parser = argparse.ArgumentParser(description=descr)
+
+        parser.add_argument(
+            "--canonical", action="store_true",
+            help="Also NFD-normalize, for canonical caseless matching.")
+        parser.add_argument(
+            "--dedup", action="store_true",
+            help="Write only the first of lines that fold the same.")
+        parser.add_argument(
+            "--iencoding", type=str, metavar="E", default="utf-8",
+            help="Assume this character coding for input. Default: utf-8.")
+        parser.add_argument(
+            "--lang", type=str, metavar="L", default=None,
+            help="With --lower or --upper, use this language's special "
+            "casing (such as 'tr').")
+        parser.add_argument(
+            "--lower", action="store_true",
+            help="Lower-case the lines (see --lang), instead of folding.")
+        parser.add_argument(
+            "--quiet", "-q", action="store_true",
+            help="Suppress most messages.")
+        parser.add_argument(
+            "--simple", action="store_true",
+            help="Use simple (one-to-one) folding, not full.")
+        parser.add_argument(
+            "--sort", action="store_true",
+            help="Write the lines sorted caselessly.")
+        parser.add_argument(
+            "--turkic", action="store_true",
+            help="Use the Turkic folds for 'I' and dotted 'İ'.")
+        parser.add_argument(
+            "--ucdDir", type=str, metavar="PATH", default=DEFAULT_UCD_DIR,
+            help="Where to find CaseFolding.txt and SpecialCasing.txt. "
+            "Default: %s." % (DEFAULT_UCD_DIR))
+        parser.add_argument(
+            "--upper", action="store_true",
+            help="Upper-case the lines (see --lang), instead of folding.")
+        parser.add_argument(
+            "--verbose", "-v", action="count", default=0,
+            help="Add more messages (repeatable).")
+        parser.add_argument(
+            "--version", action="version", version=__version__,
+            help="Display version information, then exit.")
+
+        parser.add_argument(
+            "files", type=str, nargs=argparse.REMAINDER,
+            help="Path(s) to input file(s)")
+
+        args0 = parser.parse_args()
+        if (lg and args0.verbose):
+            logging.basicConfig(level=logging.INFO - args0.verbose)
+        return(args0)
+
+    def doOneFile(path:str, fh) -> int:
+        recs = [ rec.rstrip("\r\n") for rec in fh ]
+        if (args.dedup): recs = cf0.dedup(recs)
+        if (args.sort): recs = cf0.sort(recs)
+        if (args.dedup or args.sort): outRecs = recs
+        elif (args.lower): outRecs = [ cf0.lower(rec, args.lang) for rec in recs ]
+        elif (args.upper): outRecs = [ cf0.upper(rec, args.lang) for rec in recs ]
+        else: outRecs = cf0.foldAll(recs)
+        for rec in outRecs: print(rec)
+        log(1, "%s: %d lines." % (path, len(outRecs)))
+        return len(outRecs)
+
+    args = processOptions()
+    verbose = args.verbose
+
+    cf0 = CaseFolder(ucdDir=args.ucdDir, full=not args.simple,
+        turkic=args.turkic, canonical=args.canonical)
+    if (not args.files):
+        doOneFile("[stdin]", codecs.getreader(args.iencoding)(sys.stdin.buffer))
+    for path0 in args.files:
+        with codecs.open(path0, "rb", encoding=args.iencoding) as fh0:
+            doOneFile(path0, fh0)
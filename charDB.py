@@ -0,0 +1,469 @@
+#!/usr/bin/env python3
+#
+# charDB.py: Build and query a SQLite database of character information.
+# 2026-10-17: Written by Steven J. DeRose.
+#
+import sys
+import os
+import time
+import sqlite3
+import unicodedata
+from xml.etree import ElementTree
+from typing import Dict, Iterable, List, Tuple
+import logging
+
+import strfchr
+from UnicodeDBAccess import UnicodeDBAccess, RangeSet, typedValue
+
+lg = logging.getLogger("charDB")
+
+__metadata__ = {
+    "title"        : "charDB",
+    "description"  : "Build and query a SQLite database of character information.",
+    "rightsHolder" : "Steven J. DeRose",
+    "creator"      : "http://viaf.org/viaf/50334488",
+    "type"         : "http://purl.org/dc/dcmitype/Software",
+    "language"     : "Python 3.7",
+    "created"      : "2026-10-17",
+    "modified"     : "2026-10-17",
+    "publisher"    : "http://github.com/sderose",
+    "license"      : "https://creativecommons.org/licenses/by-sa/3.0/"
+}
+__version__ = __metadata__["modified"]
+
+descr = """
+=Name=
+
+charDB: Build and query a SQLite database of character information.
+
+
+=Description=
+
+`ord`, `showUnicodeCharsInClass.py`, `charNameConvert.py`, and friends
+each work out what they need about characters afresh on every run,
+often by scanning the whole codespace. This builds all that into one
+local SQLite file once, with indexes, so lookups take milliseconds:
+
+    charDB.py --build --ucd ~/.strfchr/ucd/ucd.nounihan.grouped.zip
+    charDB.py --name "bullet"
+    charDB.py --entity nbsp
+    charDB.py --category Sc --script Common
+
+The database (by default `~/.strfchr/chars.sqlite`) has:
+
+* `chars`: one row per code point, with fields from `strfchr.py`'s
+CharInfo (see CHAR_FIELDS): name, category, script, block, plane, etc.
+Indexed on name, category, script, and block. By default only assigned
+characters (not Cn, Co, or Cs) are included; use `--all` for all of them.
+
+* `names_fts`: a full-text (FTS5) index over the names, so searches by
+word are fast (`--name "LATIN SMALL"` finds names with both words, in any
+order; with `--fts`, full FTS5 queries such as "arrow NOT double" work).
+
+* `ucd_ranges`: every property loaded via `UnicodeDBAccess` (given with
+`--ucd`), as (prop, first, last, value) runs, indexed by (prop, value)
+and by (prop, first).
+
+* `entities` and `texnames`: the XML entity names (by entity set) and the
+LaTeX forms (latex, mathlatex, varlatex) from Sebastian Rahtz et al's
+`unicode.xml` (see `charNameConvert.py`), if it's available
+(by default from `~/.strfchr/unicode.xml`). Indexed by name.
+
+* `meta`: when and from what the database was built.
+
+From code, `CharDB` provides the usual queries:
+
+    cdb = CharDB()
+    cdb.lookup(0x2022)                    # dict of the fields, etc.
+    cdb.findByName("bullet")              # [ (0x2022, "BULLET"), ... ]
+    cdb.ucdWhere("lb", "BA")              # a RangeSet
+
+The database is written to a temporary file and then renamed, so readers
+never see a partial one.
+
+
+=Related Commands=
+
+`strfchr.py`, `UnicodeDBAccess.py`, `charNameConvert.py`.
+
+
+=Known bugs and Limitations=
+
+Building calculates every CharInfo field for every character, so it takes
+a while (but only needs doing when the data changes).
+
+`unicode.xml` is read directly, rather than via `charNameConvert`, since
+the latter depends on its own command-line options.
+
+
+=History=
+
+* 2026-10-17: Written by Steven J. DeRose. Quote --name words for FTS5
+(so hyphens work), and add --fts for raw FTS5 queries. Store surrogates
+as "\\udXXX", and clean up after a failed build.
+
+
+=Rights=
+
+Copyright 2026-10-17 by Steven J. DeRose. This work is licensed under a
+Creative Commons Attribution-Share-alike 3.0 unported license.
+See [http://creativecommons.org/licenses/by-sa/3.0/] for more information.
+
+For the most recent version, see [http://www.derose.net/steve/utilities]
+or [https://github.com/sderose].
+
+
+=Options=
+"""
+
+verbose = 0
+def log(lvl:int, msg:str) -> None:
+    if (verbose >= lvl): sys.stderr.write(msg+"\n")
+
+DEFAULT_DB = os.path.expanduser("~/.strfchr/chars.sqlite")
+DEFAULT_UNICODE_XML = os.path.expanduser("~/.strfchr/unicode.xml")
+
+# Columns of `chars`, and the strfchr fields they come from.
+CHAR_FIELDS = [
+    ( "literal",    "LITERAL" ),
+    ( "name",       "UNAME" ),
+    ( "category",   "CATEGORYABBR" ),
+    ( "script",     "SCRIPTNAME" ),
+    ( "block",      "BLOCKNAME" ),
+    ( "plane",      "PLANENUMBER" ),
+    ( "utf8",       "UTF8" ),
+    ( "decomp",     "DECOMP" ),
+    ( "eawidth",    "EAWIDTH" ),
+    ( "numeric",    "NUMERICVALUE" ),
+    ( "jargon",     "JARGON" ),
+]
+INDEXED_FIELDS = [ "name", "category", "script", "block" ]
+
+# Elements of unicode.xml's <character>s that go in `texnames`.
+TEX_KINDS = [ "latex", "mathlatex", "varlatex" ]
+
+SCHEMA = """
+    CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+    CREATE TABLE chars (cp INTEGER PRIMARY KEY, %s);
+    CREATE TABLE ucd_ranges (prop TEXT, first INTEGER, last INTEGER, value);
+    CREATE TABLE entities (cp INTEGER, entityset TEXT, name TEXT);
+    CREATE TABLE texnames (cp INTEGER, kind TEXT, value TEXT);
+""" % (", ".join([ "%s TEXT" % (col) for col, _field in CHAR_FIELDS ]))
+
+INDEXES = [ "CREATE INDEX chars_%s ON chars(%s)" % (col, col)
+    for col in INDEXED_FIELDS ] + [
+    "CREATE INDEX ucd_prop_value ON ucd_ranges(prop, value)",
+    "CREATE INDEX ucd_prop_first ON ucd_ranges(prop, first)",
+    "CREATE INDEX entities_name ON entities(name)",
+    "CREATE INDEX entities_cp ON entities(cp)",
+    "CREATE INDEX texnames_value ON texnames(value)",
+    "CREATE INDEX texnames_cp ON texnames(cp)",
+]
+
+def isAssigned(n:int) -> bool:
+    return unicodedata.category(chr(n)) not in ("Cn", "Co", "Cs")
+
+
+###############################################################################
+#
+def readUnicodeXml(path:str) -> Iterable[Tuple[int, str, str, str]]:
+    """Read Sebastian Rahtz et al's `unicode.xml` incrementally, generating
+    (codePoint, kind, set, value) for each entity name and LaTeX form.
+    For entities, kind is "entity" and set is the entity set; for LaTeX,
+    kind is "latex", "mathlatex", or "varlatex", and set is "".
+    Combination characters (like id="U0003C-020D2") are skipped.
+    """
+    for _event, el in ElementTree.iterparse(path, events=("end",)):
+        if (el.tag != "character"): continue
+        idVal = el.get("id", "")
+        if ("-" in idVal or not el.get("dec", "").isdecimal()):
+            el.clear()
+            continue
+        n = int(el.get("dec"))
+        for child in el:
+            if (child.tag == "entity" and child.get("id")):
+                yield n, "entity", child.get("set", ""), child.get("id")
+            elif (child.tag in TEX_KINDS and child.text):
+                yield n, child.tag, "", child.text.strip()
+        el.clear()
+
+def buildCharDB(dbPath:str=DEFAULT_DB, codePoints:Iterable[int]=None,
+    ucdPaths:List[str]=None, unicodeXmlPath:str=None) -> int:
+    """Build the whole database, from scratch. `codePoints` defaults to all
+    the assigned ones. Returns the number of characters added.
+    """
+    if (codePoints is None):
+        codePoints = (n for n in range(strfchr.MAX_CP) if isAssigned(n))
+    os.makedirs(os.path.dirname(os.path.abspath(dbPath)), exist_ok=True)
+    tmpPath = "%s.%d.tmp" % (dbPath, os.getpid())
+    if (os.path.exists(tmpPath)): os.remove(tmpPath)
+    conn = sqlite3.connect(tmpPath)
+    try:
+        nChars = fillCharDB(conn, codePoints, ucdPaths, unicodeXmlPath)
+    except BaseException:
+        conn.close()
+        if (os.path.exists(tmpPath)): os.remove(tmpPath)
+        raise
+    conn.close()
+    os.replace(tmpPath, dbPath)
+    return nChars
+
+def dbText(val) -> str:
+    """Make a value storable as SQLite text. Lone surrogates (like the
+    `literal` of U+D800) can't be encoded as UTF-8, so become "\\udXXX".
+    """
+    if (val is None): return None
+    return str(val).encode("utf-8", errors="backslashreplace").decode("utf-8")
+
+def fillCharDB(conn:sqlite3.Connection, codePoints:Iterable[int],
+    ucdPaths:List[str]=None, unicodeXmlPath:str=None) -> int:
+    """Create and fill in all the tables (see buildCharDB()).
+    """
+    conn.executescript(SCHEMA)
+    meta = { "built": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "strfchr": strfchr.__version__ }
+
+    accessors = [ strfchr.lookupField(field)[1] for _col, field in CHAR_FIELDS ]
+    def charRows():
+        for n in codePoints:
+            cinfo = strfchr.CharInfo(n)
+            yield [ n ] + [ dbText(acc(cinfo)) for acc in accessors ]
+    conn.executemany("INSERT INTO chars VALUES (%s)" %
+        (", ".join([ "?" ] * (len(CHAR_FIELDS) + 1))), charRows())
+    nChars = conn.execute("SELECT COUNT(*) FROM chars").fetchone()[0]
+    log(1, "Added %d characters." % (nChars))
+
+    if (ucdPaths):
+        udb = UnicodeDBAccess()
+        udb.load(ucdPaths)
+        for prop, col in udb.charEntries.columns.items():
+            conn.executemany("INSERT INTO ucd_ranges VALUES (?, ?, ?, ?)",
+                ((prop, first, last, value) for first, last, value in col.runs()))
+        meta["ucdVersion"] = udb.version
+        meta["ucdSources"] = " ".join(ucdPaths)
+        log(1, "Added %d UCD properties." % (len(udb.charEntries.columns)))
+
+    if (unicodeXmlPath and os.path.exists(unicodeXmlPath)):
+        for n, kind, eSet, value in readUnicodeXml(unicodeXmlPath):
+            if (kind == "entity"):
+                conn.execute("INSERT INTO entities VALUES (?, ?, ?)", (n, eSet, value))
+            else:
+                conn.execute("INSERT INTO texnames VALUES (?, ?, ?)", (n, kind, value))
+        meta["unicodeXml"] = unicodeXmlPath
+    elif (unicodeXmlPath):
+        log(0, "No unicode.xml at '%s', so no entity or LaTeX names." % (unicodeXmlPath))
+
+    for ddl in INDEXES: conn.execute(ddl)
+    try:
+        conn.execute("CREATE VIRTUAL TABLE names_fts USING fts5("
+            "name, content='chars', content_rowid='cp')")
+        conn.execute("INSERT INTO names_fts(names_fts) VALUES ('rebuild')")
+    except sqlite3.OperationalError as e:
+        log(0, "No full-text index (this SQLite lacks FTS5?): %s" % (e))
+    conn.executemany("INSERT INTO meta VALUES (?, ?)", meta.items())
+    conn.commit()
+    conn.execute("ANALYZE")
+    return nChars
+
+
+###############################################################################
+#
+class CharDB:
+    """Query a database made by buildCharDB() (opened read-only).
+    """
+    def __init__(self, dbPath:str=DEFAULT_DB):
+        if (not os.path.exists(dbPath)):
+            raise IOError("No character database at '%s' (use --build)." % (dbPath))
+        self.conn = sqlite3.connect("file:%s?mode=ro" % (dbPath), uri=True)
+        self.conn.row_factory = sqlite3.Row
+        self.hasFts = self.conn.execute("SELECT COUNT(*) FROM sqlite_master "
+            "WHERE name = 'names_fts'").fetchone()[0] > 0
+
+    def lookup(self, n:int) -> Dict:
+        """Return a dict of everything known about a code point (or None).
+        """
+        row = self.conn.execute("SELECT * FROM chars WHERE cp = ?", (n,)).fetchone()
+        if (row is None): return None
+        info = dict(row)
+        info["entities"] = [ tuple(r) for r in self.conn.execute(
+            "SELECT entityset, name FROM entities WHERE cp = ?", (n,)) ]
+        info["texnames"] = [ tuple(r) for r in self.conn.execute(
+            "SELECT kind, value FROM texnames WHERE cp = ?", (n,)) ]
+        return info
+
+    def ucdValue(self, n:int, prop:str):
+        """Return the value of a UCD property for a code point (or None).
+        """
+        row = self.conn.execute("SELECT last, value FROM ucd_ranges "
+            "WHERE prop = ? AND first <= ? ORDER BY first DESC LIMIT 1",
+            (prop, n)).fetchone()
+        if (row is None or row[0] < n): return None
+        return row[1]
+
+    def ucdWhere(self, prop:str, value) -> RangeSet:
+        """Return the code points with a given UCD property value (which may
+        be given as a string even if it's stored as an int, like "ccc").
+        """
+        return RangeSet(tuple(r) for r in self.conn.execute(
+            "SELECT first, last FROM ucd_ranges WHERE prop = ? AND value = ? "
+            "ORDER BY first", (prop, typedValue(prop, value))))
+
+    def findByName(self, query:str, limit:int=100,
+        raw:bool=False) -> List[Tuple[int, str]]:
+        """Find characters by words in their names. With the full-text index,
+        each whitespace-separated word of `query` must occur (so hyphenated
+        ones like "HYPHEN-MINUS" are fine); or if `raw` is set, `query` is
+        taken as an FTS5 query (words, "phrases", AND/OR/NOT, prefix*), and
+        a bad one raises ValueError. Without the index, it's just a
+        substring.
+        """
+        if (not self.hasFts):
+            sql = ("SELECT cp, name FROM chars WHERE name LIKE '%' || ? || '%' "
+                "ORDER BY cp LIMIT ?")
+            return [ tuple(r) for r in self.conn.execute(sql, (query, limit)) ]
+        if (not raw):
+            query = " ".join('"%s"' % (w.replace('"', '""')) for w in query.split())
+        sql = ("SELECT rowid, name FROM names_fts WHERE names_fts MATCH ? "
+            "ORDER BY rowid LIMIT ?")
+        try:
+            return [ tuple(r) for r in self.conn.execute(sql, (query, limit)) ]
+        except sqlite3.OperationalError as e:
+            raise ValueError("Bad full-text query '%s': %s" % (query, e)) from e
+
+    def findByEntity(self, name:str) -> List[Tuple[int, str]]:
+        """Return (code point, entity set) for each use of an entity name.
+        """
+        return [ tuple(r) for r in self.conn.execute(
+            "SELECT cp, entityset FROM entities WHERE name = ? ORDER BY cp",
+            (name,)) ]
+
+    def findByTex(self, value:str) -> List[Tuple[int, str]]:
+        """Return (code point, kind) for each character with a LaTeX form.
+        """
+        return [ tuple(r) for r in self.conn.execute(
+            "SELECT cp, kind FROM texnames WHERE value = ? ORDER BY cp",
+            (value,)) ]
+
+    def where(self, limit:int=None, **conds) -> List[Tuple[int, str]]:
+        """Return (code point, name) for characters whose `chars` columns
+        have the given values, such as where(category="Sc", script="Common").
+        """
+        cols = [ col for col, _field in CHAR_FIELDS ]
+        for col in conds:
+            if (col not in cols): raise KeyError("No column '%s' in chars." % (col))
+        sql = "SELECT cp, name FROM chars"
+        if (conds):
+            sql += " WHERE " + " AND ".join([ "%s = ?" % (col) for col in conds ])
+        sql += " ORDER BY cp"
+        if (limit): sql += " LIMIT %d" % (limit)
+        return [ tuple(r) for r in self.conn.execute(sql, list(conds.values())) ]
+
+
+###############################################################################
+# Main
+#
+if __name__ == "__main__":
+    import argparse
+
+    def processOptions() -> argparse.Namespace:
+        try:
+            from BlockFormatter import BlockFormatter
+            parser = argparse.ArgumentParser(
+                description=descr, formatter_class=BlockFormatter)
+        except ImportError:
+            parser = argparse.ArgumentParser(description=descr)
+
+        parser.add_argument(
+            "--all", action="store_true",
+            help="With --build, include unassigned, private-use, and surrogate "
+            "code points, too.")
+        parser.add_argument(
+            "--block", type=str, metavar="B",
+            help="List the characters in this block.")
+        parser.add_argument(
+            "--build", action="store_true",
+            help="(Re)build the database.")
+        parser.add_argument(
+            "--category", type=str, metavar="C",
+            help="List the characters in this general category (e.g., Lu).")
+        parser.add_argument(
+            "--cp", type=lambda x: int(x, 0), metavar="N", action="append",
+            help="Show everything about this code point (repeatable).")
+        parser.add_argument(
+            "--db", type=str, metavar="PATH", default=DEFAULT_DB,
+            help="Path to the database. Default: %s." % (DEFAULT_DB))
+        parser.add_argument(
+            "--entity", type=str, metavar="NAME",
+            help="Show the character(s) with this entity name.")
+        parser.add_argument(
+            "--fts", action="store_true",
+            help="Take --name as an FTS5 query (AND/OR/NOT, \"phrases\", prefix*).")
+        parser.add_argument(
+            "--limit", type=int, metavar="N", default=100,
+            help="Show at most this many matches.")
+        parser.add_argument(
+            "--name", type=str, metavar="Q",
+            help="Find characters by (words in) their names.")
+        parser.add_argument(
+            "--quiet", "-q", action="store_true",
+            help="Suppress most messages.")
+        parser.add_argument(
+            "--script", type=str, metavar="S",
+            help="List the characters in this script.")
+        parser.add_argument(
+            "--ucd", type=str, metavar="PATH", action="append",
+            help="With --build, load UCD properties from this file or "
+            "directory (repeatable; see UnicodeDBAccess.py).")
+        parser.add_argument(
+            "--unicodeXml", type=str, metavar="PATH", default=DEFAULT_UNICODE_XML,
+            help="With --build, get entity and LaTeX names from here. "
+            "Default: %s." % (DEFAULT_UNICODE_XML))
+        parser.add_argument(
+            "--verbose", "-v", action="count", default=0,
+            help="Add more messages (repeatable).")
+        parser.add_argument(
+            "--version", action="version", version=__version__,
+            help="Display version information, then exit.")
+
+        args0 = parser.parse_args()
+        if (lg and args0.verbose):
+            logging.basicConfig(level=logging.INFO - args0.verbose)
+        return(args0)
+
+    def showMatches(matches:List[Tuple[int, str]]) -> None:
+        for cp0, name0 in matches:
+            print("U+%04X  %s  %s" % (cp0, chr(cp0), name0))
+
+    args = processOptions()
+    verbose = args.verbose + (0 if args.quiet else 1)
+
+    if (args.build):
+        t0 = time.time()
+        n0 = buildCharDB(args.db,
+            codePoints=range(strfchr.MAX_CP) if args.all else None,
+            ucdPaths=args.ucd, unicodeXmlPath=args.unicodeXml)
+        log(1, "Built '%s' with %d characters in %.1f seconds." %
+            (args.db, n0, time.time() - t0))
+
+    cdb = CharDB(args.db)
+    for cp0 in (args.cp or []):
+        info0 = cdb.lookup(cp0)
+        if (info0 is None):
+            print("U+%04X: not in the database." % (cp0))
+            continue
+        print("U+%04X:" % (cp0))
+        for k0, v0 in info0.items():
+            if (k0 != "cp" and v0): print("    %-12s %s" % (k0, v0))
+    if (args.name):
+        try:
+            showMatches(cdb.findByName(args.name, limit=args.limit, raw=args.fts))
+        except ValueError as e0:
+            lg.critical("%s" % (e0))
+            sys.exit(1)
+    if (args.entity):
+        showMatches([ (cp0, "(%s)" % (eSet0))
+            for cp0, eSet0 in cdb.findByEntity(args.entity) ])
+    conds0 = { col: val for col, val in (("category", args.category),
+        ("script", args.script), ("block", args.block)) if val }
+    if (conds0):
+        showMatches(cdb.where(limit=args.limit, **conds0))
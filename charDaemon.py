@@ -0,0 +1,528 @@
+#!/usr/bin/env python3
+#
+# charDaemon.py: Keep character data loaded, and answer lookups over a socket.
+# 2026-10-17: Written by Steven J. DeRose.
+#
+import sys
+import os
+import json
+import socket
+import selectors
+import subprocess
+import time
+from typing import Dict, List
+import logging
+
+lg = logging.getLogger("charDaemon")
+
+__metadata__ = {
+    "title"        : "charDaemon",
+    "description"  : "Keep character data loaded, and answer lookups over a socket.",
+    "rightsHolder" : "Steven J. DeRose",
+    "creator"      : "http://viaf.org/viaf/50334488",
+    "type"         : "http://purl.org/dc/dcmitype/Software",
+    "language"     : "Python 3.7",
+    "created"      : "2026-10-17",
+    "modified"     : "2026-10-17",
+    "publisher"    : "http://github.com/sderose",
+    "license"      : "https://creativecommons.org/licenses/by-sa/3.0/"
+}
+__version__ = __metadata__["modified"]
+
+descr = """
+=Name=
+
+charDaemon: Keep character data loaded, and answer lookups over a socket.
+
+
+=Description=
+
+Scripts that call `strfchr.py` (or `charNameConvert.py`) thousands of
+times pay for starting Python, importing `CharDisplay`, and loading data,
+every time. Instead, start this once:
+
+    charDaemon.py --serve &
+
+and it listens on a Unix domain socket (by default
+`~/.strfchr/charDaemon.sock`, readable only by you), keeping `strfchr`'s
+CharInfo cache and compiled formats (and, once asked for, the
+`charNameConvert` data) in memory. Requests are batched: a list of code
+points, and what to do with them. The same script is the client:
+
+    charDaemon.py -f '%x %N' 0x2022 0xA0 65
+    seq 65 90 | charDaemon.py --stdin -f '%{UNAME}'
+    charDaemon.py --names 0xE9
+    charDaemon.py --stats
+    charDaemon.py --stop
+
+With `--start`, the client starts the daemon if it isn't running.
+The daemon exits after `--idle` seconds with no requests (default 600).
+From code, use `CharClient`:
+
+    cc = CharClient(start=True)
+    lines = cc.format([ 0x2022, 0xA0 ], "%x %N")
+
+The protocol is one JSON object per line each way, so anything can talk to
+it. A request has "op" and usually "cps" (a list of ints):
+
+* {"op": "format", "fmt": F, "cps": [...]} -> {"ok": true, "lines": [...]}
+* {"op": "fields", "fields": [...], "cps": [...]} -> {"ok": true, "rows": [[...]]}
+* {"op": "names", "cps": [...]} -> {"ok": true, "names": [{...} or null]}
+(from `charNameConvert`: entity names, LaTeX, etc.)
+* {"op": "stats"}, {"op": "ping"}, {"op": "shutdown"}
+
+Errors (of any kind) come back as {"ok": false, "error": "..."}; the
+connection stays open.
+Requests are handled one at a time (the caches are not thread-safe), but
+any number of clients can be connected at once, and each can send any
+number of requests. The `--idle` time counts from the last request, so
+clients that stay connected without asking anything don't keep the daemon
+alive.
+
+
+=Related Commands=
+
+`strfchr.py`, `charNameConvert.py`, `charDB.py`.
+
+
+=Known bugs and Limitations=
+
+Unix only (it uses AF_UNIX sockets).
+
+
+=History=
+
+* 2026-10-17: Written by Steven J. DeRose. Report all request errors to
+the client. Handle many connections at once.
+
+
+=Rights=
+
+Copyright 2026-10-17 by Steven J. DeRose. This work is licensed under a
+Creative Commons Attribution-Share-alike 3.0 unported license.
+See [http://creativecommons.org/licenses/by-sa/3.0/] for more information.
+
+For the most recent version, see [http://www.derose.net/steve/utilities]
+or [https://github.com/sderose].
+
+
+=Options=
+"""
+
+verbose = 0
+def log(lvl:int, msg:str) -> None:
+    if (verbose >= lvl): sys.stderr.write(msg+"\n")
+
+DEFAULT_SOCKET = os.path.expanduser("~/.strfchr/charDaemon.sock")
+DEFAULT_IDLE = 600
+SEND_TIMEOUT = 30  # Drop a client that won't read its response for this long
+
+
+###############################################################################
+# Server side
+#
+def prepareCharNameConvert():
+    """charNameConvert reads its settings from a module-level `args`
+    (normally set by its own main), even when just loading its data (which
+    strfchr does on import). Supply the defaults it uses, unless already set.
+    Returns the module, or None if it's not available.
+    """
+    try:
+        import charNameConvert
+    except ImportError:
+        return None
+    if (not hasattr(charNameConvert, "args")):
+        import argparse
+        charNameConvert.args = argparse.Namespace(short=False, quiet=True,
+            verbose=0, fallback="xml16")
+    return charNameConvert
+
+class CharService:
+    """The state the daemon keeps, and the operations on it.
+    """
+    def __init__(self):
+        prepareCharNameConvert()
+        import strfchr  # The expensive part, so only in the daemon.
+        self.strfchr = strfchr
+        self.cnc = getattr(strfchr, "sebastian", None)
+        self.started = time.time()
+        self.nRequests = 0
+        self.nCodePoints = 0
+        self.ops = {
+            "ping":     self.doPing,
+            "format":   self.doFormat,
+            "fields":   self.doFields,
+            "names":    self.doNames,
+            "stats":    self.doStats,
+        }
+
+    def handle(self, req:Dict) -> Dict:
+        self.nRequests += 1
+        op = req.get("op")
+        if (op not in self.ops):
+            return { "ok": False, "error": "Unknown op '%s'." % (op) }
+        cps = req.get("cps", [])
+        if (not isinstance(cps, list) or not all(isinstance(n, int) for n in cps)):
+            return { "ok": False, "error": "'cps' must be a list of ints." }
+        self.nCodePoints += len(cps)
+        try:
+            resp = self.ops[op](req, cps)
+        except Exception as e:  # Anything wrong with the request goes back
+            log(1, "Request '%s' failed: %s: %s" % (op, type(e).__name__, e))
+            return { "ok": False, "error": "%s: %s" % (type(e).__name__, e) }
+        resp["ok"] = True
+        return resp
+
+    def doPing(self, _req:Dict, _cps:List[int]) -> Dict:
+        return { "version": __version__ }
+
+    def doFormat(self, req:Dict, cps:List[int]) -> Dict:
+        if (not isinstance(req.get("fmt"), str)):
+            raise ValueError("'fmt' must be a string.")
+        cfmt = self.strfchr.compileFormat(req["fmt"])
+        return { "lines": [ cfmt.render(n) for n in cps ] }
+
+    def doFields(self, req:Dict, cps:List[int]) -> Dict:
+        fields = req.get("fields")
+        if (not isinstance(fields, list) or not all(isinstance(f, str) for f in fields)):
+            raise ValueError("'fields' must be a list of strings.")
+        getters = [ self.strfchr.makeDatumGetter(f) for f in fields ]
+        rows = []
+        for n in cps:
+            row = []
+            for get in getters:
+                val = get(n)
+                row.append(val if isinstance(val,
+                    (str, int, float, bool, type(None))) else str(val))
+            rows.append(row)
+        return { "rows": rows }
+
+    def doNames(self, _req:Dict, cps:List[int]) -> Dict:
+        if (self.cnc is None):
+            cncModule = prepareCharNameConvert()
+            if (cncModule is None): raise KeyError("charNameConvert is not available.")
+            self.cnc = cncModule.charNameConvert()
+        names = []
+        for n in cps:
+            csi = self.cnc.charDict.get(n)
+            names.append(dict(csi.names) if csi else None)
+        return { "names": names }
+
+    def doStats(self, _req:Dict, _cps:List[int]) -> Dict:
+        return {
+            "uptime": round(time.time() - self.started, 1),
+            "requests": self.nRequests,
+            "codePoints": self.nCodePoints,
+            "formats": len(self.strfchr.__formatCache__),
+            "cache": self.strfchr.__cinfoCache__.getStats(),
+            "namesLoaded": self.cnc is not None,
+        }
+
+class CharServer:
+    """Listen on a Unix socket, and handle requests from any number of
+    connections. A selectors loop waits for whichever connections have
+    something to say, but each request is then handled to completion
+    before the next, so the CharService needn't be thread-safe.
+    """
+    def __init__(self, sockPath:str, idle:float=DEFAULT_IDLE):
+        self.service = CharService()
+        self.stopping = False
+        self.idle = idle if idle > 0 else None
+        self.lastRequest = time.time()
+        self.listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.listener.bind(sockPath)
+        os.chmod(sockPath, 0o600)
+        self.listener.listen(64)
+        self.listener.setblocking(False)
+        self.selector = selectors.DefaultSelector()
+        self.selector.register(self.listener, selectors.EVENT_READ, None)
+
+    def serveForever(self) -> None:
+        """Handle requests until told to stop, or until `idle` seconds go by
+        with no requests (connections that are open but quiet don't count).
+        """
+        while (not self.stopping):
+            timeout = None
+            if (self.idle):
+                timeout = self.lastRequest + self.idle - time.time()
+                if (timeout <= 0):
+                    log(1, "Idle for %s seconds; exiting." % (self.idle))
+                    break
+            for key, _mask in self.selector.select(timeout):
+                if (key.data is None): self.accept()
+                else: self.readFrom(key.fileobj, key.data)
+                if (self.stopping): break
+
+    def accept(self) -> None:
+        try:
+            conn, _addr = self.listener.accept()
+        except BlockingIOError:
+            return
+        conn.setblocking(False)
+        self.selector.register(conn, selectors.EVENT_READ, bytearray())
+
+    def readFrom(self, conn:socket.socket, buf:bytearray) -> None:
+        """Take whatever a connection has sent, and answer each complete
+        line (request) in it.
+        """
+        try:
+            data = conn.recv(1 << 16)
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError:
+            data = b""
+        if (not data):  # Client is done (any partial last line is a request)
+            if (buf.strip()): self.respond(conn, bytes(buf))
+            self.closeConn(conn)
+            return
+        buf.extend(data)
+        while (not self.stopping):
+            nl = buf.find(b"\n")
+            if (nl < 0): break
+            line = bytes(buf[:nl])
+            del buf[:nl+1]
+            if (line.strip() and not self.respond(conn, line)):
+                self.closeConn(conn)
+                return
+
+    def respond(self, conn:socket.socket, line:bytes) -> bool:
+        """Handle one request, and send the response. Returns False if the
+        client can't be written to (so should be dropped). Nothing a request
+        does gets past here: failures go back as {"ok": false}.
+        """
+        self.lastRequest = time.time()
+        try:
+            resp = self.encodeResponse(self.makeResponse(line))
+        except Exception as e:
+            log(0, "Request failed: %s: %s" % (type(e).__name__, e))
+            resp = self.encodeResponse({ "ok": False,
+                "error": "%s: %s" % (type(e).__name__, e) })
+        try:
+            conn.settimeout(SEND_TIMEOUT)
+            conn.sendall(resp)
+            conn.setblocking(False)
+        except OSError as e:
+            log(1, "Dropping a client: %s" % (e))
+            return False
+        return True
+
+    def makeResponse(self, line:bytes) -> Dict:
+        try:
+            req = json.loads(line)
+            if (not isinstance(req, dict)): raise ValueError("Not an object.")
+        except (ValueError, RecursionError) as e:
+            return { "ok": False, "error": "Bad request: %s" % (e) }
+        if (req.get("op") == "shutdown"):
+            self.stopping = True
+            return { "ok": True }
+        return self.service.handle(req)
+
+    @staticmethod
+    def encodeResponse(resp:Dict) -> bytes:
+        """Serialize a response as one line of UTF-8. Lone surrogates (such
+        as from "%l" on U+D800) can't be encoded, so they go as JSON \\uXXXX
+        escapes instead.
+        """
+        return (json.dumps(resp, ensure_ascii=False).encode("utf-8",
+            errors="backslashreplace") + b"\n")
+
+    def closeConn(self, conn:socket.socket) -> None:
+        self.selector.unregister(conn)
+        conn.close()
+
+    def close(self) -> None:
+        for key in list(self.selector.get_map().values()):
+            self.selector.unregister(key.fileobj)
+            key.fileobj.close()
+        self.selector.close()
+
+def serve(sockPath:str=DEFAULT_SOCKET, idle:float=DEFAULT_IDLE) -> None:
+    """Run the daemon until it's told to stop, or has been idle too long.
+    """
+    os.makedirs(os.path.dirname(sockPath), exist_ok=True)
+    if (os.path.exists(sockPath)):
+        if (isRunning(sockPath)):
+            raise IOError("A daemon is already listening on '%s'." % (sockPath))
+        os.remove(sockPath)  # Left over from one that died
+    server = CharServer(sockPath, idle=idle)
+    log(1, "Listening on '%s'." % (sockPath))
+    try:
+        server.serveForever()
+    finally:
+        server.close()
+        if (os.path.exists(sockPath)): os.remove(sockPath)
+
+
+###############################################################################
+# Client side (this doesn't import strfchr, so it starts fast)
+#
+def isRunning(sockPath:str=DEFAULT_SOCKET) -> bool:
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(sockPath)
+        return True
+    except OSError:
+        return False
+
+def startDaemon(sockPath:str=DEFAULT_SOCKET, idle:float=DEFAULT_IDLE,
+    wait:float=30.0) -> None:
+    """Start a daemon in the background (if there isn't one), and wait until
+    it's listening.
+    """
+    if (isRunning(sockPath)): return
+    subprocess.Popen([ sys.executable, os.path.abspath(__file__), "--serve",
+        "--socket", sockPath, "--idle", str(idle) ],
+        stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+        start_new_session=True)
+    deadline = time.time() + wait
+    while (time.time() < deadline):
+        if (isRunning(sockPath)): return
+        time.sleep(0.05)
+    raise IOError("Daemon did not start listening on '%s'." % (sockPath))
+
+class CharClient:
+    """A connection to the daemon. Each method sends one request.
+    """
+    def __init__(self, sockPath:str=DEFAULT_SOCKET, start:bool=False,
+        idle:float=DEFAULT_IDLE):
+        if (start): startDaemon(sockPath, idle=idle)
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.connect(sockPath)
+        self.rfile = self.sock.makefile("rb")
+
+    def close(self) -> None:
+        self.rfile.close()
+        self.sock.close()
+
+    def __enter__(self) -> "CharClient":
+        return self
+
+    def __exit__(self, *_exc) -> None:
+        self.close()
+
+    def request(self, req:Dict) -> Dict:
+        self.sock.sendall(json.dumps(req).encode("utf-8") + b"\n")
+        line = self.rfile.readline()
+        if (not line): raise IOError("The daemon closed the connection.")
+        resp = json.loads(line)
+        if (not resp.get("ok")): raise KeyError(resp.get("error"))
+        return resp
+
+    def format(self, cps:List[int], fmt:str) -> List[str]:
+        return self.request({ "op": "format", "fmt": fmt, "cps": list(cps) })["lines"]
+
+    def fields(self, cps:List[int], fields:List[str]) -> List[List]:
+        return self.request({ "op": "fields", "fields": fields, "cps": list(cps) })["rows"]
+
+    def names(self, cps:List[int]) -> List[Dict]:
+        return self.request({ "op": "names", "cps": list(cps) })["names"]
+
+    def stats(self) -> Dict:
+        return self.request({ "op": "stats" })
+
+    def shutdown(self) -> None:
+        self.request({ "op": "shutdown" })
+
+
+###############################################################################
+# Main
+#
+if __name__ == "__main__":
+    import argparse
+
+    def processOptions() -> argparse.Namespace:
+        try:
+            from BlockFormatter import BlockFormatter
+            parser = argparse.ArgumentParser(
+                description=descr, formatter_class=BlockFormatter)
+        except ImportError:
+            parser = argparse.ArgumentParser(description=descr)
+
+        parser.add_argument(
+            "--batchSize", type=int, metavar="N", default=4096,
+            help="Send at most this many code points per request.")
+        parser.add_argument(
+            "--format", "-f", type=str, metavar="F", default="%x %N",
+            help="strfchr format to apply to each code point.")
+        parser.add_argument(
+            "--idle", type=float, metavar="SEC", default=DEFAULT_IDLE,
+            help="Daemon exits after this long with no requests (0: never).")
+        parser.add_argument(
+            "--names", action="store_true",
+            help="Show charNameConvert's names (entities, LaTeX, etc.) instead.")
+        parser.add_argument(
+            "--quiet", "-q", action="store_true",
+            help="Suppress most messages.")
+        parser.add_argument(
+            "--serve", action="store_true",
+            help="Run as the daemon.")
+        parser.add_argument(
+            "--socket", type=str, metavar="PATH", default=DEFAULT_SOCKET,
+            help="Unix socket to use. Default: %s." % (DEFAULT_SOCKET))
+        parser.add_argument(
+            "--start", action="store_true",
+            help="Start the daemon (in the background) if it isn't running.")
+        parser.add_argument(
+            "--stats", action="store_true",
+            help="Show the daemon's statistics.")
+        parser.add_argument(
+            "--stdin", action="store_true",
+            help="Read code points (whitespace-separated) from stdin.")
+        parser.add_argument(
+            "--stop", action="store_true",
+            help="Tell the daemon to exit.")
+        parser.add_argument(
+            "--verbose", "-v", action="count", default=0,
+            help="Add more messages (repeatable).")
+        parser.add_argument(
+            "--version", action="version", version=__version__,
+            help="Display version information, then exit.")
+
+        parser.add_argument(
+            "codePoints", type=str, nargs=argparse.REMAINDER,
+            help="Code points (0x hex, decimal, 0o octal) or single characters.")
+
+        args0 = parser.parse_args()
+        if (lg and args0.verbose):
+            logging.basicConfig(level=logging.INFO - args0.verbose)
+        return(args0)
+
+    def toCodePoint(s:str) -> int:
+        if (len(s) == 1): return ord(s)
+        return int(s, 0)
+
+    args = processOptions()
+    verbose = args.verbose
+
+    if (args.serve):
+        serve(args.socket, idle=args.idle)
+        sys.exit()
+
+    if (args.stop):
+        if (isRunning(args.socket)):
+            with CharClient(args.socket) as cc0: cc0.shutdown()
+        sys.exit()
+
+    cps0 = [ toCodePoint(s) for s in args.codePoints ]
+    if (args.stdin):
+        cps0.extend(toCodePoint(s) for s in sys.stdin.read().split())
+
+    try:
+        cc0 = CharClient(args.socket, start=args.start, idle=args.idle)
+    except OSError as e0:
+        lg.critical("No daemon at '%s' (use --start or --serve): %s" % (args.socket, e0))
+        sys.exit(1)
+    with cc0:
+        if (args.stats):
+            print(json.dumps(cc0.stats(), indent=2))
+        for i0 in range(0, len(cps0), args.batchSize):
+            batch0 = cps0[i0:i0+args.batchSize]
+            try:
+                if (args.names):
+                    for n0, names0 in zip(batch0, cc0.names(batch0)):
+                        print("U+%04X: %s" % (n0, json.dumps(names0, ensure_ascii=False)))
+                else:
+                    for line0 in cc0.format(batch0, args.format): print(line0)
+            except KeyError as e0:
+                lg.critical("Daemon error: %s" % (e0))
+                sys.exit(1)
@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+#
+# displayWidth.py: How many terminal columns a string takes up.
+# 2026-10-17: Written by Steven J. DeRose.
+#
+import sys
+import os
+import codecs
+import unicodedata
+from typing import Dict, Iterable, List
+import logging
+
+from UnicodeDBAccess import RangeSet, readSemicolonFile
+from UnicodeLists.zeroWidth import zeroWidthUnicodeChars
+from UnicodeLists.combining import combiningChars
+
+lg = logging.getLogger("displayWidth")
+
+__metadata__ = {
+    "title"        : "displayWidth",
+    "description"  : "How many terminal columns a string takes up.",
+    "rightsHolder" : "Steven J. DeRose",
+    "creator"      : "http://viaf.org/viaf/50334488",
+    "type"         : "http://purl.org/dc/dcmitype/Software",
+    "language"     : "Python 3.7",
+    "created"      : "2026-10-17",
+    "modified"     : "2026-10-17",
+    "publisher"    : "http://github.com/sderose",
+    "license"      : "https://creativecommons.org/licenses/by-sa/3.0/"
+}
+__version__ = __metadata__["modified"]
+
+descr = """
+=Name=
+
+displayWidth: How many terminal columns a string takes up.
+
+
+=Description=
+
+`len()` counts code points, but in a terminal (or any monospaced display)
+East Asian "wide" and "fullwidth" characters take two columns, and
+combining marks, zero-width spaces and joiners, and format controls take
+none. So columns padded with `ljust()` and friends come out ragged. This
+works out the real width:
+
+    dw = DisplayWidth()
+    dw.width("日本語 text")         # 11
+    dw.rjust("e\\u0301", 4)         # "   é" (3 spaces, not 2)
+
+Widths come from:
+
+* 0 for the characters in `UnicodeLists/zeroWidth.py` and
+`UnicodeLists/combining.py`, and for all nonspacing and enclosing marks
+(Mn, Me), format characters (Cf, except SOFT HYPHEN), and Hangul medial
+vowels and final consonants. Control characters (Cc) count as
+`controlWidth` (default 0).
+
+* 2 for East Asian Width "W" and "F"; "A" (ambiguous) counts as
+`ambiguousWidth` (default 1; use 2 for CJK terminal settings).
+These come from `EastAsianWidth.txt` if given (or found in
+`~/.strfchr/ucd/`), and otherwise from Python's `unicodedata`.
+
+* 1 for everything else.
+
+A string's width is found in one pass: `str.translate()` through a table
+that maps zero-width characters to nothing and wide ones to two
+characters, then `len()`. The table is filled in as characters are first
+seen (like `unicodeToTex.py`'s), so text in any script costs the same after
+the first few characters. Pure printable ASCII skips even that.
+
+As a command, shows the width of each line of the input (or with `--max`,
+just the widest, like `wc -L`):
+
+    displayWidth.py --max file.txt
+
+
+=Related Commands=
+
+`strfchr.py` (whose WIDTH field, "%w", uses this), `makeCharChart.py`,
+`showInvisibles.py`, `UnicodeDBAccess.py`.
+
+`wcwidth()` in POSIX, and the Python `wcwidth` package, do similar things.
+
+
+=Known bugs and Limitations=
+
+Width is per character: emoji sequences joined by ZWJ, and regional-
+indicator flag pairs, count as the sum of their parts (as most terminals
+display them, but not all).
+
+Tabs are control characters (width `controlWidth`), not expanded.
+
+
+=History=
+
+* 2026-10-17: Written by Steven J. DeRose.
+
+
+=Rights=
+
+Copyright 2026-10-17 by Steven J. DeRose. This work is licensed under a
+Creative Commons Attribution-Share-alike 3.0 unported license.
+See [http://creativecommons.org/licenses/by-sa/3.0/] for more information.
+
+For the most recent version, see [http://www.derose.net/steve/utilities]
+or [https://github.com/sderose].
+
+
+=Options=
+"""
+
+verbose = 0
+def log(lvl:int, msg:str) -> None:
+    if (verbose >= lvl): sys.stderr.write(msg+"\n")
+
+DEFAULT_EAW_PATH = os.path.expanduser("~/.strfchr/ucd/EastAsianWidth.txt")
+
+# Unlisted code points in these ranges default to "W" (see EastAsianWidth.txt).
+DEFAULT_WIDE_RANGES = [
+    (0x3400, 0x4DBF), (0x4E00, 0x9FFF), (0xF900, 0xFAFF),
+    (0x20000, 0x2FFFD), (0x30000, 0x3FFFD),
+]
+
+ZERO_WIDTH_CATEGORIES = ( "Mn", "Me", "Cf" )
+
+
+###############################################################################
+#
+class WidthTable(dict):
+    """A str.translate() table that maps each character to a string as wide
+    as it is (deleting zero-width ones), working each out the first time
+    translate() asks for it.
+    """
+    def __init__(self, dw:"DisplayWidth"):
+        super().__init__()
+        self.dw = dw
+
+    def __missing__(self, cp:int):
+        width = self.dw.charWidth(cp)
+        if (width == 0): val = None
+        elif (width == 1): val = cp
+        else: val = "\0" * width
+        self[cp] = val
+        return val
+
+class DisplayWidth:
+    def __init__(self, eawPath:str=None, ambiguousWidth:int=1,
+        controlWidth:int=0):
+        """Set up to measure strings. If `eawPath` (a copy of
+        EastAsianWidth.txt) isn't given, DEFAULT_EAW_PATH is used if it's
+        there, and otherwise Python's unicodedata.
+        """
+        self.ambiguousWidth = ambiguousWidth
+        self.controlWidth = controlWidth
+        self.zeroWidth = RangeSet.fromCodePoints(
+            [ ord(c) for c in zeroWidthUnicodeChars ] + list(combiningChars.keys())
+            + list(range(0x1160, 0x1200)) + list(range(0xD7B0, 0xD800)))
+        self.wide = self.ambiguous = None
+        if (eawPath is None and os.path.isfile(DEFAULT_EAW_PATH)):
+            eawPath = DEFAULT_EAW_PATH
+        if (eawPath):
+            self.readEastAsianWidth(eawPath)
+        self.table = WidthTable(self)
+
+    def readEastAsianWidth(self, path:str) -> None:
+        """Load the "W"/"F" and "A" ranges from EastAsianWidth.txt.
+        """
+        wide = list(DEFAULT_WIDE_RANGES)
+        ambiguous = []
+        for first, last, fields in readSemicolonFile(path):
+            if (fields[0] in ("W", "F")): wide.append((first, last))
+            elif (fields[0] == "A"): ambiguous.append((first, last))
+        self.wide = RangeSet(sorted(wide))
+        self.ambiguous = RangeSet(sorted(ambiguous))
+        log(1, "Loaded %d wide and %d ambiguous ranges from '%s'." %
+            (self.wide.rangeCount(), self.ambiguous.rangeCount(), path))
+
+    def eastAsianWidth(self, cp:int) -> str:
+        """Return "W" (including "F"), "A", or "N" (including "H" and "Na").
+        """
+        if (self.wide is None):
+            eaw = unicodedata.east_asian_width(chr(cp))
+            if (eaw == "F"): return "W"
+            return eaw if eaw in ("W", "A") else "N"
+        if (cp in self.wide): return "W"
+        if (cp in self.ambiguous): return "A"
+        return "N"
+
+    def charWidth(self, cp:int) -> int:
+        """Return how many columns one character takes.
+        """
+        if (cp in self.zeroWidth): return 0
+        cat = unicodedata.category(chr(cp))
+        if (cat == "Cc"): return self.controlWidth
+        if (cat in ZERO_WIDTH_CATEGORIES and cp != 0x00AD): return 0
+        eaw = self.eastAsianWidth(cp)
+        if (eaw == "W"): return 2
+        if (eaw == "A"): return self.ambiguousWidth
+        return 1
+
+    def width(self, s:str) -> int:
+        """Return how many columns a whole string takes.
+        """
+        if (s.isascii() and s.isprintable()): return len(s)
+        return len(s.translate(self.table))
+
+    def widths(self, strings:Iterable[str]) -> List[int]:
+        return [ self.width(s) for s in strings ]
+
+    def ljust(self, s:str, width:int, fill:str=" ") -> str:
+        return s + fill * (width - self.width(s))
+
+    def rjust(self, s:str, width:int, fill:str=" ") -> str:
+        return fill * (width - self.width(s)) + s
+
+    def center(self, s:str, width:int, fill:str=" ") -> str:
+        extra = width - self.width(s)
+        if (extra <= 0): return s
+        return fill * (extra // 2) + s + fill * (extra - extra // 2)
+
+    def getStats(self) -> Dict:
+        return { "charsSeen": len(self.table) }
+
+__displayWidth__ = None
+
+def getDisplayWidth() -> DisplayWidth:
+    """Get a shared DisplayWidth with the default settings.
+    """
+    global __displayWidth__
+    if (__displayWidth__ is None): __displayWidth__ = DisplayWidth()
+    return __displayWidth__
+
+def width(s:str) -> int:
+    return getDisplayWidth().width(s)
+
+
+###############################################################################
+# Main
+#
+if __name__ == "__main__":
+    import argparse
+
+    def processOptions() -> argparse.Namespace:
+        try:
+            from BlockFormatter import BlockFormatter
+            parser = argparse.ArgumentParser(
+                description=descr, formatter_class=BlockFormatter)
+        except ImportError:
+            parser = argparse.ArgumentParser(description=descr)
+
+        parser.add_argument(
+            "--ambiguousWide", action="store_true",
+            help="Count East Asian Width 'A' (ambiguous) characters as 2.")
+        parser.add_argument(
+            "--eastAsianWidth", type=str, metavar="PATH", default=None,
+            help="Read widths from this EastAsianWidth.txt. Default: %s "
+            "if it's there, else Python's unicodedata." % (DEFAULT_EAW_PATH))
+        parser.add_argument(
+            "--iencoding", type=str, metavar="E", default="utf-8",
+            help="Assume this character coding for input. Default: utf-8.")
+        parser.add_argument(
+            "--max", action="store_true",
+            help="Just show the width of the widest line.")
+        parser.add_argument(
+            "--quiet", "-q", action="store_true",
+            help="Suppress most messages.")
+        parser.add_argument(
+            "--verbose", "-v", action="count", default=0,
+            help="Add more messages (repeatable).")
+        parser.add_argument(
+            "--version", action="version", version=__version__,
+            help="Display version information, then exit.")
+
+        parser.add_argument(
+            "files", type=str, nargs=argparse.REMAINDER,
+            help="Path(s) to input file(s)")
+
+        args0 = parser.parse_args()
+        if (lg and args0.verbose):
+            logging.basicConfig(level=logging.INFO - args0.verbose)
+        return(args0)
+
+    def doOneFile(path:str, fh) -> int:
+        maxWidth = 0
+        for rec in fh:
+            rec = rec.rstrip("\r\n")
+            w = dw0.width(rec)
+            if (w > maxWidth): maxWidth = w
+            if (not args.max): print("%5d\t%s" % (w, rec))
+        if (args.max): print("%d\t%s" % (maxWidth, path))
+        return maxWidth
+
+    args = processOptions()
+    verbose = args.verbose
+
+    dw0 = DisplayWidth(eawPath=args.eastAsianWidth,
+        ambiguousWidth=2 if args.ambiguousWide else 1)
+    if (not args.files):
+        doOneFile("[stdin]", codecs.getreader(args.iencoding)(sys.stdin.buffer))
+    for path0 in args.files:
+        with codecs.open(path0, "rb", encoding=args.iencoding) as fh0:
+            doOneFile(path0, fh0)
@@ -10,6 +10,9 @@ import unicodedata
 from typing import List
 import logging
 
+from graphemeClusters import getGraphemeSegmenter
+from bidiScan import getBidiScanner
+
 lg = logging.getLogger("findBadChars.py")
 
 __metadata__ = {
@@ -20,7 +23,7 @@ __metadata__ = {
     "type"         : "http://purl.org/dc/dcmitype/Software",
     "language"     : "Python 3.11",
     "created"      : "2023-07-25",
-    "modified"     : "2024-06-24",
+    "modified"     : "2026-10-17",
     "publisher"    : "http://github.com/sderose",
     "license"      : "https://creativecommons.org/licenses/by-sa/3.0/"
 }
@@ -40,6 +43,13 @@ in the input. Specifically:
 * Private Use characters
 * Unassigned characters
 
+With --bidi, the bidirectional embedding, override, and isolate controls
+(see `bidiScan.py`) are also bad, and lines where they don't balance (the
+"Trojan Source" problem) are reported even if nothing else is wrong with
+them; --details then also lists each unmatched or unterminated control.
+For scanning whole trees of files for just these, `bidiScan.py` is much
+faster.
+
 Options --latin, --greek, and --hebrew
 cause the script to consider all characters bad except those for
 the orthographies whose options are set. However, ASCII is always considered
@@ -57,6 +67,12 @@ number of bad characters found, and the line itself are shown.
 With --details, each individual bad character is also shown, with
 the column, hex code point, and literal character.
 
+With --clusters, bad characters are reported by grapheme cluster (see
+`graphemeClusters.py`) rather than one by one: the count is of clusters
+that have any bad character in them, and --details shows each such cluster
+whole (its offset, all its code points, and the literal cluster), so, say,
+an unassigned character plus combining marks shows up as one problem.
+
 The --normal [type] option (still experimental)
 lets you check for characters not in a
 particular Unicode normal form (see below). However, --details does not
@@ -77,6 +93,9 @@ My ''countChars'' -- give total counts for all characters, and total
 by Unicode plane, block, and category. Can also be set to recognize
 character escapes using conventions Python, XML, URLs, etc.
 
+My `bidiScan.py` -- find (and check the balance of) bidi controls in files,
+reporting byte offsets.
+
 My `badMappings.py` -- tries to help analyze character set corruption.
 
 
@@ -112,6 +131,8 @@ dag ddag bull hellip copy reg trade.
 
 * 2023-07-25: Written by Steven J. DeRose.
 * 2024-06-24ff: Add --latin, --normal, etc.
+* 2026-10-17: Add --clusters, using graphemeClusters.py. Add --bidi,
+using bidiScan.py.
 
 
 =Rights=
@@ -148,14 +169,21 @@ def doOneFile(path:str) -> int:
         recnum += 1
         isNormalForm = isInNF(rec)
         theBaddies = getBadCharList(rec)
-        if (not theBaddies and isNormalForm): continue
-        print("Record #%5d (%2d bad): %s" %
-            (recnum, len(theBaddies), rec), end="")
+        if (args.clusters and theBaddies):
+            theBaddies = getBadClusterList(rec, theBaddies)
+        bidiProblems = getBidiProblemList(rec)
+        if (not theBaddies and isNormalForm and not bidiProblems): continue
+        print("Record #%5d (%2d bad%s): %s" % (recnum, len(theBaddies),
+            ", bidi unbalanced" if bidiProblems else "", rec), end="")
         if (args.details and theBaddies):
             for tb in theBaddies:
-                print("    Offset %3d: U+%05x ('%s') %s" %
-                    (tb[0], ord(tb[1]), tb[1],
-                    unicodedata.name(tb[1], "Unknown") if args.details else ""))
+                print("    Offset %3d: %s ('%s') %s" %
+                    (tb[0], " ".join("U+%05x" % (ord(c)) for c in tb[1]), tb[1],
+                    ", ".join(unicodedata.name(c, "Unknown") for c in tb[1])
+                    if args.details else ""))
+        if (args.details and bidiProblems):
+            for off, name, problem in bidiProblems:
+                print("    Offset %3d: %s %s" % (off, name, problem))
     if  (fh != sys.stdin): fh.close()
     return recnum
 
@@ -181,10 +209,32 @@ def getBadCharList(s:str) -> List:
         if (isControl(n) and c not in "\r\n\t "): isBad = True
         elif (isPrivateUse(n)): isBad = True
         elif (n > 255 and isUnassigned(n)): isBad = True
+        elif (args.bidi and getBidiScanner().isControl(c)): isBad = True
         elif (args.latin or args.greek or args.hebrew): isBad = not isForLanguage(n)
         if (isBad): badList.append( ( _col, c ) )
     return badList
 
+def getBadClusterList(s:str, badList:List) -> List:
+    """Given the (offset, char) pairs from getBadCharList(), return
+    (offset, cluster) pairs for each grapheme cluster that contains any of
+    them.
+    """
+    badClusters = []
+    i = 0
+    for start, end in getGraphemeSegmenter().iterClusters(s):
+        if (i >= len(badList)): break
+        if (badList[i][0] >= end): continue
+        badClusters.append( ( start, s[start:end] ) )
+        while (i < len(badList) and badList[i][0] < end): i += 1
+    return badClusters
+
+def getBidiProblemList(s:str) -> List:
+    """If --bidi is set, return (offset, bidiClass, problem) for each
+    bidi control in the record that doesn't balance.
+    """
+    if (not args.bidi): return []
+    return [ f for f in getBidiScanner().scanString(s) if f[2] ]
+
 def isControl(n:int) -> bool:
     if (n <= 0x1F): return True
     if (0x7F <= n <= 0x9F): return True  # Yup, \x7F is a control (DELETE)
@@ -240,6 +290,12 @@ if __name__ == "__main__":
         parser.add_argument(
             "--bib", action="store_true",
             help="Shorthand for --latin --greek --hebrew --typography.")
+        parser.add_argument(
+            "--bidi", action="store_true",
+            help="Bidi controls are bad, and report lines where they don't balance.")
+        parser.add_argument(
+            "--clusters", action="store_true",
+            help="Count and show bad grapheme clusters, not bad characters.")
         parser.add_argument(
             "--color",  # Don't default. See below.
             help="Colorize the output.")
@@ -0,0 +1,443 @@
+#!/usr/bin/env python3
+#
+# graphemeClusters.py: Find user-perceived characters (UAX #29 grapheme clusters).
+# 2026-10-17: Written by Steven J. DeRose.
+#
+import sys
+import os
+import re
+import codecs
+import unicodedata
+from typing import Dict, IO, Iterator, List, Tuple
+import logging
+
+from UnicodeDBAccess import TwoStageTable, readSemicolonFile
+
+lg = logging.getLogger("graphemeClusters")
+
+__metadata__ = {
+    "title"        : "graphemeClusters",
+    "description"  : "Find user-perceived characters (UAX #29 grapheme clusters).",
+    "rightsHolder" : "Steven J. DeRose",
+    "creator"      : "http://viaf.org/viaf/50334488",
+    "type"         : "http://purl.org/dc/dcmitype/Software",
+    "language"     : "Python 3.7",
+    "created"      : "2026-10-17",
+    "modified"     : "2026-10-17",
+    "publisher"    : "http://github.com/sderose",
+    "license"      : "https://creativecommons.org/licenses/by-sa/3.0/"
+}
+__version__ = __metadata__["modified"]
+
+descr = """
+=Name=
+
+graphemeClusters: Find user-perceived characters (UAX #29 grapheme clusters).
+
+
+=Description=
+
+What a reader thinks of as one character may be several code points: a
+letter plus accents ("e" + U+0301), a Hangul syllable spelled with jamo,
+an Indic consonant cluster, a flag (two regional indicators), or an emoji
+sequence joined by ZWJ ("👩‍💻"). Tools that report per code point split
+these apart. This finds the extended grapheme clusters of
+[https://www.unicode.org/reports/tr29/], as offsets:
+
+    gs = GraphemeSegmenter()
+    gs.boundaries("e\\u0301t\\u00e9")       # [ 2, 3, 4 ]
+    for start, end in gs.iterClusters(s): ...
+    gs.count("🇫🇷🇩🇪")                      # 2
+
+No substrings are made (slice `s[start:end]` if you want one). Each
+character has a Grapheme_Cluster_Break class (the "GCB" property: CR, LF,
+Control, Extend, ZWJ, Regional_Indicator, Prepend, SpacingMark, the Hangul
+L, V, T, LV, and LVT, or Other); the string is turned into a byte string of
+class codes with one `str.translate()` (the table is filled in as characters
+are first seen, as in `lineBreak.py`), and the clusters are then found by
+one compiled regex over that, built from UAX #29's definition (plus a
+first alternative that takes a whole run of "Other" characters, which are
+one-character clusters, at once):
+
+    crlf | Control | Prepend* core (Extend | ZWJ | SpacingMark)*
+
+where "core" is a Hangul syllable sequence, a pair of regional
+indicators, an Extended_Pictographic sequence joined by ZWJ, an Indic
+conjunct (rule GB9c), or any other single non-control character. So the
+per-character work is all in C.
+
+The classes come from, in order of preference:
+
+* `GraphemeBreakProperty.txt` (see `--gcbFile`; by default
+`~/.strfchr/ucd/GraphemeBreakProperty.txt`, if it's there), plus
+Extended_Pictographic from `emoji-data.txt` and Indic_Conjunct_Break from
+`DerivedCoreProperties.txt` in the same directory, if they're there.
+
+* The "GCB", "ExtPict", and "InCB" properties of a loaded
+`UnicodeDBAccess`, via `GraphemeSegmenter.fromUcd(udb)`.
+
+* A rough guess from Python's `unicodedata`, which handles accents,
+Hangul, flags, ZWJ emoji sequences, and controls, but not Indic
+conjuncts or the few SpacingMarks that are really Extend.
+
+For streams, `iterStreamClusters()` reads a chunk at a time and holds back
+only the last cluster of each chunk (the only one more text could extend).
+Offsets count characters from the start of the stream.
+
+As a command, lists each cluster with its offset and code points (or with
+`--count`, just counts them per file):
+
+    graphemeClusters.py --count *.txt
+
+`showInvisibles.py`, `makeCharChart.py`, and `findBadChars.py` have
+`--clusters` options that use this to work per cluster.
+
+
+=Related Commands=
+
+`lineBreak.py`, `displayWidth.py`, `UnicodeDBAccess.py`,
+`UnicodeLists/combining.py`.
+
+
+=Known bugs and Limitations=
+
+For GB9c, every Extend and ZWJ character is taken as InCB=Extend.
+
+Python's `re` tries alternatives in order rather than taking the longest;
+the core alternatives are ordered so that this gives the same answers.
+
+
+=History=
+
+* 2026-10-17: Written by Steven J. DeRose.
+
+
+=Rights=
+
+Copyright 2026-10-17 by Steven J. DeRose. This work is licensed under a
+Creative Commons Attribution-Share-alike 3.0 unported license.
+See [http://creativecommons.org/licenses/by-sa/3.0/] for more information.
+
+For the most recent version, see [http://www.derose.net/steve/utilities]
+or [https://github.com/sderose].
+
+
+=Options=
+"""
+
+verbose = 0
+def log(lvl:int, msg:str) -> None:
+    if (verbose >= lvl): sys.stderr.write(msg+"\n")
+
+DEFAULT_GCB_PATH = os.path.expanduser("~/.strfchr/ucd/GraphemeBreakProperty.txt")
+
+# Short GCB values as in the UCD XML; EP, ICBC, and ICBL are added here for
+# Extended_Pictographic, and InCB=Consonant and InCB=Linker.
+CLASSES = [ "XX", "CR", "LF", "CN", "EX", "ZWJ", "RI", "PP", "SM",
+    "L", "V", "T", "LV", "LVT", "EP", "ICBC", "ICBL" ]
+CLASS_CODES = { cls: i for i, cls in enumerate(CLASSES) }
+
+# Long names (as in GraphemeBreakProperty.txt), and pre-Unicode-11 values.
+LONG_CLASSES = {
+    "Other": "XX", "Control": "CN", "Extend": "EX",
+    "Regional_Indicator": "RI", "Prepend": "PP", "SpacingMark": "SM",
+    "E_Base": "EP", "E_Base_GAZ": "EP", "Glue_After_Zwj": "EP",
+    "E_Modifier": "EX", "EB": "EP", "EBG": "EP", "GAZ": "EP", "EM": "EX",
+}
+
+# The first alternative (the only group) takes a run of Other characters but
+# the last, which are all one-character clusters.
+CLUSTER_TEMPLATE = r"""
+    ( XX+ ) (?= XX )
+    | CR LF | [CN CR LF]
+    | PP* (?: L* (?: V+ | LV V* | LVT ) T* | L+ | T+
+        | RI RI
+        | EP (?: EX* ZWJ EP )*
+        | ICBC (?: [EX ZWJ ICBL]* ICBL [EX ZWJ ICBL]* ICBC )+
+        | [^CN CR LF] ) [EX ZWJ SM ICBL]*
+    | .
+"""
+
+def makeClusterExpr() -> re.Pattern:
+    """Compile CLUSTER_TEMPLATE into a regex over strings of class codes.
+    """
+    pat = re.sub(r"\b[A-Z]+\b",
+        lambda mat: "\\x%02x" % (CLASS_CODES[mat.group()]), CLUSTER_TEMPLATE)
+    pat = re.sub(r"\s+", "", pat)
+    return re.compile(pat.encode("ascii"), re.DOTALL)
+
+ROUGH_CLASSES = {
+    0x000D: "CR", 0x000A: "LF", 0x200C: "EX", 0x200D: "ZWJ",
+    0x00A9: "EP", 0x00AE: "EP", 0x203C: "EP", 0x2049: "EP", 0x2122: "EP",
+    0x2139: "EP", 0x3030: "EP", 0x303D: "EP", 0x3297: "EP", 0x3299: "EP",
+    0x06DD: "PP", 0x070F: "PP", 0x0890: "PP", 0x0891: "PP", 0x08E2: "PP",
+    0x110BD: "PP", 0x110CD: "PP",
+}
+
+ROUGH_RANGES = [
+    (0x0600, 0x0605, "PP"),
+    (0x1100, 0x115F, "L"), (0xA960, 0xA97C, "L"),
+    (0x1160, 0x11A7, "V"), (0xD7B0, 0xD7C6, "V"),
+    (0x11A8, 0x11FF, "T"), (0xD7CB, 0xD7FB, "T"),
+    (0x1F1E6, 0x1F1FF, "RI"),
+    (0x1F3FB, 0x1F3FF, "EX"),   # Emoji skin-tone modifiers
+    (0xE0020, 0xE007F, "EX"),   # Tags (in emoji flag sequences)
+    (0x1F000, 0x1FAFF, "EP"), (0x1FC00, 0x1FFFD, "EP"),
+]
+
+ROUGH_CATEGORY_CLASSES = {
+    "Mn": "EX", "Me": "EX", "Mc": "SM",
+    "Cc": "CN", "Cf": "CN", "Zl": "CN", "Zp": "CN", "Cs": "CN",
+}
+
+def roughGraphemeClass(cp:int) -> str:
+    """Guess a character's grapheme-break class from unicodedata.
+    """
+    if (cp in ROUGH_CLASSES): return ROUGH_CLASSES[cp]
+    for first, last, cls in ROUGH_RANGES:
+        if (first <= cp <= last): return cls
+    if (0xAC00 <= cp <= 0xD7A3):
+        return "LV" if (cp - 0xAC00) % 28 == 0 else "LVT"
+    cat = unicodedata.category(chr(cp))
+    if (cat in ROUGH_CATEGORY_CLASSES): return ROUGH_CATEGORY_CLASSES[cat]
+    if (cat == "So" and 0x2190 <= cp <= 0x2BFF): return "EP"
+    return "XX"
+
+
+###############################################################################
+#
+class ClassTable(dict):
+    """A str.translate() table mapping each character to a one-character
+    string whose code is its grapheme-break class code, worked out the first
+    time translate() asks.
+    """
+    def __init__(self, gs:"GraphemeSegmenter"):
+        super().__init__()
+        self.gs = gs
+
+    def __missing__(self, cp:int) -> str:
+        val = self[cp] = chr(self.gs.classCodeFor(cp))
+        return val
+
+class GraphemeSegmenter:
+    def __init__(self, gcbPath:str=None, gcbTable:TwoStageTable=None,
+        extPictTable:TwoStageTable=None, incbTable:TwoStageTable=None):
+        """Set up to find clusters. The classes come from `gcbTable` (a
+        TwoStageTable of "GCB" values) if given, else from `gcbPath` (or
+        DEFAULT_GCB_PATH if it's there), a copy of GraphemeBreakProperty.txt;
+        else they're guessed from unicodedata. Extended_Pictographic and
+        Indic_Conjunct_Break come from the other tables, or from emoji-data.txt
+        and DerivedCoreProperties.txt next to `gcbPath`.
+        """
+        if (gcbTable is None):
+            if (gcbPath is None and os.path.isfile(DEFAULT_GCB_PATH)):
+                gcbPath = DEFAULT_GCB_PATH
+            if (gcbPath):
+                gcbTable = GraphemeSegmenter.readPropertyFile(gcbPath)
+                ucdDir = os.path.dirname(gcbPath)
+                if (extPictTable is None):
+                    extPictTable = GraphemeSegmenter.readPropertyFile(
+                        os.path.join(ucdDir, "emoji-data.txt"),
+                        "Extended_Pictographic")
+                if (incbTable is None):
+                    incbTable = GraphemeSegmenter.readPropertyFile(
+                        os.path.join(ucdDir, "DerivedCoreProperties.txt"), "InCB")
+        self.gcbTable = gcbTable
+        self.extPictTable = extPictTable
+        self.incbTable = incbTable
+        self.clusterExpr = makeClusterExpr()
+        self.classTable = ClassTable(self)
+
+    @staticmethod
+    def fromUcd(udb) -> "GraphemeSegmenter":
+        """Use the "GCB" (and if loaded, "ExtPict" and "InCB") properties of
+        a loaded UnicodeDBAccess.
+        """
+        columns = udb.charEntries.columns
+        return GraphemeSegmenter(gcbTable=udb.compileTable("GCB"),
+            extPictTable=udb.compileTable("ExtPict") if "ExtPict" in columns else None,
+            incbTable=udb.compileTable("InCB") if "InCB" in columns else None)
+
+    @staticmethod
+    def readPropertyFile(path:str, prop:str=None) -> TwoStageTable:
+        """Compile a UCD property file into a TwoStageTable. If `prop` is
+        given, only records for that property are used (for files like
+        emoji-data.txt that have several), and the value is the next field
+        (or "Y" if there isn't one). Returns None if the file isn't there.
+        """
+        if (not os.path.isfile(path)):
+            log(1, "No '%s', so no %s." % (path, prop))
+            return None
+        runs = []
+        for first, last, fields in readSemicolonFile(path):
+            if (prop is None): runs.append((first, last, fields[0]))
+            elif (fields[0] == prop):
+                runs.append((first, last, fields[1] if len(fields) > 1 else "Y"))
+        runs.sort()
+        log(1, "Loaded %d ranges from '%s'." % (len(runs), path))
+        return TwoStageTable.fromRuns(runs)
+
+    def classFor(self, cp:int) -> str:
+        """Return the grapheme-break class of a character (one of CLASSES).
+        """
+        if (self.gcbTable is None): return roughGraphemeClass(cp)
+        cls = self.gcbTable.lookup(cp) or "XX"
+        cls = LONG_CLASSES.get(cls, cls)
+        if (cls == "XX" and self.extPictTable is not None
+            and self.extPictTable.lookup(cp) in ("Y", True)):
+            return "EP"
+        if (self.incbTable is not None):
+            incb = self.incbTable.lookup(cp)
+            if (incb == "Consonant"): return "ICBC"
+            if (incb == "Linker"): return "ICBL"
+        return cls
+
+    def classCodeFor(self, cp:int) -> int:
+        return CLASS_CODES.get(self.classFor(cp), 0)
+
+    def iterClusters(self, s:str) -> Iterator[Tuple[int, int]]:
+        """Generate (start, end) offsets for each grapheme cluster.
+        """
+        if (not s): return
+        codes = s.translate(self.classTable).encode("latin-1")
+        for mat in self.clusterExpr.finditer(codes):
+            start, end = mat.span()
+            if (mat.lastindex):
+                for i in range(start, end): yield i, i + 1
+            else:
+                yield start, end
+
+    def iterBoundaries(self, s:str) -> Iterator[int]:
+        """Generate the offset where each cluster ends, so ending with len(s).
+        """
+        if (not s): return
+        codes = s.translate(self.classTable).encode("latin-1")
+        for mat in self.clusterExpr.finditer(codes):
+            if (mat.lastindex): yield from range(mat.start() + 1, mat.end() + 1)
+            else: yield mat.end()
+
+    def boundaries(self, s:str) -> List[int]:
+        return list(self.iterBoundaries(s))
+
+    def count(self, s:str) -> int:
+        """Return how many grapheme clusters a string has.
+        """
+        if (s.isascii()): return len(s) - s.count("\r\n")
+        codes = s.translate(self.classTable).encode("latin-1")
+        n = 0
+        for mat in self.clusterExpr.finditer(codes):
+            n += mat.end() - mat.start() if mat.lastindex else 1
+        return n
+
+    def iterStreamClusters(self, ifh:IO, chunkSize:int=1<<16) -> Iterator[Tuple[int, int]]:
+        """Like iterClusters(), but over a text stream, with offsets from the
+        start of the stream. The last cluster of each chunk is held back and
+        re-scanned with the next, since only it could be extended.
+        """
+        base = 0
+        pending = ""
+        while (True):
+            chunk = ifh.read(chunkSize)
+            if (not chunk): break
+            pending += chunk
+            lastStart = 0
+            for start, end in self.iterClusters(pending):
+                if (end == len(pending)):
+                    lastStart = start
+                    break
+                yield base + start, base + end
+            base += lastStart
+            pending = pending[lastStart:]
+        for start, end in self.iterClusters(pending):
+            yield base + start, base + end
+
+    def getStats(self) -> Dict:
+        return { "charsSeen": len(self.classTable) }
+
+__graphemeSegmenter__ = None
+
+def getGraphemeSegmenter() -> GraphemeSegmenter:
+    """Get a shared GraphemeSegmenter with the default settings.
+    """
+    global __graphemeSegmenter__
+    if (__graphemeSegmenter__ is None): __graphemeSegmenter__ = GraphemeSegmenter()
+    return __graphemeSegmenter__
+
+def iterClusters(s:str) -> Iterator[Tuple[int, int]]:
+    return getGraphemeSegmenter().iterClusters(s)
+
+
+###############################################################################
+# Main
+#
+if __name__ == "__main__":
+    import argparse
+
+    def processOptions() -> argparse.Namespace:
+        try:
+            from BlockFormatter import BlockFormatter
+            parser = argparse.ArgumentParser(
+                description=descr, formatter_class=BlockFormatter)
+        except ImportError:
+            parser = argparse.ArgumentParser(description=descr)
+
+        parser.add_argument(
+            "--count", action="store_true",
+            help="Just show the number of clusters (and code points) per file.")
+        parser.add_argument(
+            "--gcbFile", type=str, metavar="PATH", default=None,
+            help="Get classes from this GraphemeBreakProperty.txt. Default: "
+            "%s if it's there, else a rough guess." % (DEFAULT_GCB_PATH))
+        parser.add_argument(
+            "--iencoding", type=str, metavar="E", default="utf-8",
+            help="Assume this character coding for input. Default: utf-8.")
+        parser.add_argument(
+            "--multiOnly", action="store_true",
+            help="Only list clusters of more than one code point.")
+        parser.add_argument(
+            "--quiet", "-q", action="store_true",
+            help="Suppress most messages.")
+        parser.add_argument(
+            "--verbose", "-v", action="count", default=0,
+            help="Add more messages (repeatable).")
+        parser.add_argument(
+            "--version", action="version", version=__version__,
+            help="Display version information, then exit.")
+
+        parser.add_argument(
+            "files", type=str, nargs=argparse.REMAINDER,
+            help="Path(s) to input file(s)")
+
+        args0 = parser.parse_args()
+        if (lg and args0.verbose):
+            logging.basicConfig(level=logging.INFO - args0.verbose)
+        return(args0)
+
+    def doOneFile(path:str, fh) -> int:
+        """Clusters never span lines (a CR LF pair stays within one), so
+        this just goes a line at a time.
+        """
+        nClusters = nChars = 0
+        for rec in fh:
+            if (args.count):
+                nClusters += gs0.count(rec)
+                nChars += len(rec)
+                continue
+            for start, end in gs0.iterClusters(rec):
+                nClusters += 1
+                if (args.multiOnly and end - start == 1): continue
+                print("%8d\t%s\t%s" % (nChars + start, rec[start:end].rstrip("\r\n"),
+                    " ".join("U+%04X" % (ord(c)) for c in rec[start:end])))
+            nChars += len(rec)
+        if (args.count): print("%d\t%d\t%s" % (nClusters, nChars, path))
+        return nClusters
+
+    args = processOptions()
+    verbose = args.verbose
+
+    gs0 = GraphemeSegmenter(gcbPath=args.gcbFile)
+    if (not args.files):
+        doOneFile("[stdin]", codecs.getreader(args.iencoding)(sys.stdin.buffer))
+    for path0 in args.files:
+        with codecs.open(path0, "rb", encoding=args.iencoding) as fh0:
+            doOneFile(path0, fh0)
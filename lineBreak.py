@@ -0,0 +1,489 @@
+#!/usr/bin/env python3
+#
+# lineBreak.py: Find line-break opportunities (UAX #14), and wrap text.
+# 2026-10-17: Written by Steven J. DeRose.
+#
+import sys
+import os
+import re
+import codecs
+import unicodedata
+from typing import IO, Iterator, List, Tuple
+import logging
+
+from UnicodeDBAccess import TwoStageTable, readSemicolonFile
+from displayWidth import DEFAULT_WIDE_RANGES, getDisplayWidth
+
+lg = logging.getLogger("lineBreak")
+
+__metadata__ = {
+    "title"        : "lineBreak",
+    "description"  : "Find line-break opportunities (UAX #14), and wrap text.",
+    "rightsHolder" : "Steven J. DeRose",
+    "creator"      : "http://viaf.org/viaf/50334488",
+    "type"         : "http://purl.org/dc/dcmitype/Software",
+    "language"     : "Python 3.7",
+    "created"      : "2026-10-17",
+    "modified"     : "2026-10-17",
+    "publisher"    : "http://github.com/sderose",
+    "license"      : "https://creativecommons.org/licenses/by-sa/3.0/"
+}
+__version__ = __metadata__["modified"]
+
+descr = """
+=Name=
+
+lineBreak: Find line-break opportunities (UAX #14), and wrap text.
+
+
+=Description=
+
+Find where text may be broken into lines, per the Unicode Line Breaking
+Algorithm [https://www.unicode.org/reports/tr14/]. Each character has a
+line-break class (the "lb" property: AL for letters, SP for spaces, OP for
+opening punctuation, ID for ideographs, and so on); whether a break is
+allowed between two characters depends mostly on the pair of classes, and
+on whether there were spaces between them.
+
+    lbk = LineBreaker()
+    list(lbk.breaks("Hello, world (again)."))   # [ 7, 13, 21 ]
+    for offset, mandatory in lbk.iterBreaks(s): ...
+
+Each offset is where a new line may start (so the last is always the
+length of the string). `iterBreaks()` also says if the break is mandatory
+(after a newline, etc.). Nothing is made per character: the string is
+turned into a byte string of class codes with one `str.translate()` (the
+table is filled in as characters are first seen, as in `displayWidth.py`),
+and the loop looks each pair of codes up in a flat pair table. Runs of
+characters of one class that can't break among themselves (such as the
+letters of a word, or spaces) are skipped over with one regex match.
+
+The pair table is not typed in: it's generated, once, from the pairwise
+rules of UAX #14 (LB7 through LB30b; see `pairAction()`), each pair of
+classes getting one of:
+
+* DIRECT: a break is allowed between them.
+* INDIRECT: a break is allowed only if there are spaces between them.
+* PROHIBITED: no break, even across spaces (like "( x" or "x )").
+
+The rules that need more context than a pair -- mandatory breaks, spaces,
+combining marks and ZWJ (which take on the class of what they follow), and
+pairs of regional indicators (flags) -- are handled in the loop.
+
+The classes come from, in order of preference:
+
+* `LineBreak.txt` (see `--lineBreakFile`; by default
+`~/.strfchr/ucd/LineBreak.txt`, if it's there), compiled into a
+`TwoStageTable` (see `UnicodeDBAccess.py`).
+
+* The "lb" property of a loaded `UnicodeDBAccess`, via
+`LineBreaker.fromUcd(udb)`.
+
+* A rough guess from Python's `unicodedata` (general category and East
+Asian Width), which gets most Latin, CJK, punctuation, and spaces right,
+but not, say, Thai or Hangul syllables.
+
+For streams, `iterStreamBreaks()` reads a chunk at a time, and only
+processes text up to the last newline in hand (nothing can affect breaks
+across a mandatory break), so memory use doesn't depend on the size of the
+input. Offsets count characters from the start of the stream.
+
+As a command, wraps the input to `--width` columns (measured with
+`displayWidth.py`), breaking only at allowed places; or with `--offsets`,
+lists the break offsets of each line.
+
+    lineBreak.py --width 60 multilingual.txt
+
+
+=Related Commands=
+
+`displayWidth.py`, `UnicodeDBAccess.py`.
+
+
+=Known bugs and Limitations=
+
+Rules that need more than one character of context on a side are
+simplified: LB15a-d (quotation marks in context), LB20a, LB21a, LB25 (which
+is applied as the pairs listed in UAX #14's "tailorable" version), LB28a,
+and LB30's East Asian Width exception are not applied.
+
+SA (Thai, Lao, Khmer, etc.) text needs a dictionary to break; it's
+treated as AL (so, no breaks within words or between them unless there
+are spaces).
+
+Wrapping (`--width`) never breaks in the middle of a word, so a word
+wider than the line makes an overlong line.
+
+
+=History=
+
+* 2026-10-17: Written by Steven J. DeRose.
+
+
+=Rights=
+
+Copyright 2026-10-17 by Steven J. DeRose. This work is licensed under a
+Creative Commons Attribution-Share-alike 3.0 unported license.
+See [http://creativecommons.org/licenses/by-sa/3.0/] for more information.
+
+For the most recent version, see [http://www.derose.net/steve/utilities]
+or [https://github.com/sderose].
+
+
+=Options=
+"""
+
+verbose = 0
+def log(lvl:int, msg:str) -> None:
+    if (verbose >= lvl): sys.stderr.write(msg+"\n")
+
+DEFAULT_LB_PATH = os.path.expanduser("~/.strfchr/ucd/LineBreak.txt")
+
+# The classes used in the pair table, then the ones the loop handles.
+# The index of each is its code in the byte strings.
+PAIR_CLASSES = [
+    "OP", "CL", "CP", "QU", "GL", "NS", "EX", "SY", "IS", "PR", "PO", "NU",
+    "AL", "HL", "ID", "IN", "HY", "BA", "BB", "B2", "ZW", "CM", "WJ", "H2",
+    "H3", "JL", "JV", "JT", "RI", "EB", "EM", "ZWJ", "CB",
+]
+LOOP_CLASSES = [ "SP", "BK", "CR", "LF", "NL" ]
+CLASSES = PAIR_CLASSES + LOOP_CLASSES
+CLASS_CODES = { cls: i for i, cls in enumerate(CLASSES) }
+NCLASSES = len(CLASSES)
+
+# LB1: classes resolved to others. SA marks become CM (see classFor()).
+RESOLVED_CLASSES = {
+    "AI": "AL", "SG": "AL", "XX": "AL", "SA": "AL", "CJ": "NS",
+    "AK": "AL", "AP": "AL", "AS": "AL", "VF": "AL", "VI": "AL",
+}
+
+DIRECT, INDIRECT, PROHIBITED = 0, 1, 2
+
+OP, CL, CP, QU, GL, NS, EX, SY, IS, PR, PO, NU, AL, HL, ID, IN, HY, BA, BB, \
+    B2, ZW, CM, WJ, H2, H3, JL, JV, JT, RI, EB, EM, ZWJ, CB, \
+    SP, BK, CR, LF, NL = range(NCLASSES)
+
+
+###############################################################################
+#
+def pairAction(a:int, b:int) -> int:
+    """Apply the pairwise rules of UAX #14 to class a followed (possibly
+    after spaces) by class b. Across spaces, the pair that matters is really
+    (SP, b); so the rules before LB18 ("SP ÷") that are about b alone
+    ("x CL"), and the "SP*" rules, give PROHIBITED; and any other "x" (no
+    break) rule gives INDIRECT.
+    """
+    AorH = (AL, HL)
+    Korean = (JL, JV, JT, H2, H3)
+    if (b == ZW): return PROHIBITED                         # LB7
+    if (a == ZW): return DIRECT                             # LB8
+    if (b == WJ): return PROHIBITED                         # LB11
+    if (b in (CL, CP, EX, IS, SY)): return PROHIBITED       # LB13
+    if (a == OP): return PROHIBITED                         # LB14
+    if (a == QU and b == OP): return PROHIBITED             # LB15
+    if (a in (CL, CP) and b == NS): return PROHIBITED       # LB16
+    if (a == B2 and b == B2): return PROHIBITED             # LB17
+    if (a == WJ): return INDIRECT                           # LB11
+    if (a == GL): return INDIRECT                           # LB12
+    if (b == GL and a not in (BA, HY)): return INDIRECT     # LB12a
+    if (a == QU or b == QU): return INDIRECT                # LB19
+    if (a == CB or b == CB): return DIRECT                  # LB20
+    if (b in (BA, HY, NS) or a == BB): return INDIRECT      # LB21
+    if (a == SY and b == HL): return INDIRECT               # LB21b
+    if (b == IN): return INDIRECT                           # LB22
+    if ((a in AorH and b == NU) or (a == NU and b in AorH)):
+        return INDIRECT                                     # LB23
+    if ((a == PR and b in (ID, EB, EM)) or (a in (ID, EB, EM) and b == PO)):
+        return INDIRECT                                     # LB23a
+    if ((a in (PR, PO) and b in AorH) or (a in AorH and b in (PR, PO))):
+        return INDIRECT                                     # LB24
+    if ((a, b) in ((CL, PO), (CP, PO), (CL, PR), (CP, PR), (NU, PO),
+        (NU, PR), (PO, OP), (PO, NU), (PR, OP), (PR, NU), (HY, NU),
+        (IS, NU), (NU, NU), (SY, NU))):
+        return INDIRECT                                     # LB25
+    if ((a == JL and b in (JL, JV, H2, H3)) or (a in (JV, H2) and b in (JV, JT))
+        or (a in (JT, H3) and b == JT)):
+        return INDIRECT                                     # LB26
+    if ((a in Korean and b == PO) or (a == PR and b in Korean)):
+        return INDIRECT                                     # LB27
+    if (a in AorH and b in AorH): return INDIRECT           # LB28
+    if (a == IS and b in AorH): return INDIRECT             # LB29
+    if ((a in (AL, HL, NU) and b == OP) or (a == CP and b in (AL, HL, NU))):
+        return INDIRECT                                     # LB30
+    if (a == RI and b == RI): return INDIRECT               # LB30a (see loop)
+    if (a == EB and b == EM): return INDIRECT               # LB30b
+    return DIRECT                                           # LB31
+
+def makeRunExpr(pairs:bytes) -> re.Pattern:
+    """Make a regex over class-code strings that matches a run of one class
+    within which there can be no breaks (and nothing changes), or else any
+    one code. So the loop only needs to look at where each match starts.
+    """
+    quiet = [ c for c in range(len(PAIR_CLASSES))
+        if (pairs[c * NCLASSES + c] != DIRECT and c != RI) ] + [ SP ]
+    return re.compile(b"([%s])\\1*|." % (re.escape(bytes(quiet))), re.DOTALL)
+
+def makePairTable() -> bytes:
+    """Flatten pairAction() into a bytes, indexed by a * NCLASSES + b.
+    """
+    return bytes(pairAction(a, b) if (a < len(PAIR_CLASSES) and b < len(PAIR_CLASSES))
+        else DIRECT for a in range(NCLASSES) for b in range(NCLASSES))
+
+ROUGH_CLASSES = {
+    0x09: "BA", 0x0A: "LF", 0x0B: "BK", 0x0C: "BK", 0x0D: "CR", 0x20: "SP",
+    0x21: "EX", 0x22: "QU", 0x23: "AL", 0x24: "PR", 0x25: "PO", 0x27: "QU",
+    0x2C: "IS", 0x2D: "HY", 0x2E: "IS", 0x2F: "SY", 0x3A: "IS", 0x3B: "IS",
+    0x3F: "EX", 0x85: "NL", 0xA0: "GL", 0xAD: "BA", 0x2007: "GL",
+    0x200B: "ZW", 0x200D: "ZWJ", 0x2011: "GL", 0x2028: "BK", 0x2029: "BK",
+    0x202F: "GL", 0x2060: "WJ", 0xFEFF: "WJ", 0x3001: "CL", 0x3002: "CL",
+}
+
+ROUGH_CATEGORY_CLASSES = {
+    "Mn": "CM", "Mc": "CM", "Me": "CM", "Cc": "CM", "Cf": "CM",
+    "Zs": "BA", "Zl": "BK", "Zp": "BK",
+    "Nd": "NU", "Ps": "OP", "Pe": "CL", "Pi": "QU", "Pf": "QU", "Pd": "BA",
+    "Sc": "PR",
+}
+
+def roughLineBreakClass(cp:int) -> str:
+    """Guess a character's line-break class from unicodedata.
+    """
+    if (cp in ROUGH_CLASSES): return ROUGH_CLASSES[cp]
+    if (0x1F1E6 <= cp <= 0x1F1FF): return "RI"
+    c = chr(cp)
+    cat = unicodedata.category(c)
+    if (cat in ROUGH_CATEGORY_CLASSES): return ROUGH_CATEGORY_CLASSES[cat]
+    if (unicodedata.east_asian_width(c) in ("W", "F")): return "ID"
+    return "AL"
+
+
+###############################################################################
+#
+class ClassTable(dict):
+    """A str.translate() table mapping each character to a one-character
+    string whose code is its (resolved) line-break class code, worked out
+    the first time translate() asks.
+    """
+    def __init__(self, lbk:"LineBreaker"):
+        super().__init__()
+        self.lbk = lbk
+
+    def __missing__(self, cp:int) -> str:
+        val = self[cp] = chr(self.lbk.classCodeFor(cp))
+        return val
+
+class LineBreaker:
+    def __init__(self, lbPath:str=None, lbTable:TwoStageTable=None):
+        """Set up to find breaks. The line-break classes come from `lbTable`
+        (a TwoStageTable of "lb" values) if given; else from `lbPath` (or
+        DEFAULT_LB_PATH if it's there), a copy of LineBreak.txt; else
+        they're guessed from unicodedata.
+        """
+        if (lbTable is None):
+            if (lbPath is None and os.path.isfile(DEFAULT_LB_PATH)):
+                lbPath = DEFAULT_LB_PATH
+            if (lbPath): lbTable = LineBreaker.readLineBreakFile(lbPath)
+        self.lbTable = lbTable
+        self.pairs = makePairTable()
+        self.runExpr = makeRunExpr(self.pairs)
+        self.classTable = ClassTable(self)
+
+    @staticmethod
+    def fromUcd(udb) -> "LineBreaker":
+        """Use the "lb" property of a loaded UnicodeDBAccess.
+        """
+        return LineBreaker(lbTable=udb.compileTable("lb"))
+
+    @staticmethod
+    def readLineBreakFile(path:str) -> TwoStageTable:
+        """Compile LineBreak.txt into a TwoStageTable. Unlisted code points
+        in the CJK ideograph ranges default to ID (as the file says).
+        """
+        runs = [ (first, last, fields[0]) for first, last, fields
+            in readSemicolonFile(path) ]
+        listed = set(first for first, _last, _value in runs)
+        for first, last in DEFAULT_WIDE_RANGES:
+            if (first not in listed): runs.append((first, last, "ID"))
+        runs.sort()
+        merged = []
+        for first, last, value in runs:
+            if (merged and first <= merged[-1][1]):  # A default range
+                if (last <= merged[-1][1]): continue    # that's listed
+                first = merged[-1][1] + 1
+            merged.append((first, last, value))
+        log(1, "Loaded %d line-break ranges from '%s'." % (len(merged), path))
+        return TwoStageTable.fromRuns(merged)
+
+    def classFor(self, cp:int) -> str:
+        """Return the (resolved, per LB1) line-break class of a character.
+        """
+        if (self.lbTable is None): cls = roughLineBreakClass(cp)
+        else: cls = self.lbTable.lookup(cp) or "XX"
+        if (cls == "SA" and unicodedata.category(chr(cp)) in ("Mn", "Mc")):
+            return "CM"
+        return RESOLVED_CLASSES.get(cls, cls)
+
+    def classCodeFor(self, cp:int) -> int:
+        return CLASS_CODES.get(self.classFor(cp), AL)
+
+    def iterBreaks(self, s:str) -> Iterator[Tuple[int, bool]]:
+        """Generate (offset, mandatory) for each place a line may start,
+        ending with (len(s), True).
+        """
+        n = len(s)
+        if (n == 0): return
+        codes = s.translate(self.classTable).encode("latin-1")
+        pairs = self.pairs
+        cur = codes[0]
+        prevChar = cur                  # Class of the previous character
+        if (cur == SP): prev = WJ       # LB2: no break at the start
+        elif (cur in (CM, ZWJ)): prev = AL  # LB10
+        else: prev = cur                # Class that the next pair rule sees
+        nRI = 1 if cur == RI else 0
+        for mat in self.runExpr.finditer(codes, 1):
+            i = mat.start()
+            cur = codes[i]
+            if (prevChar in (BK, LF, NL) or (prevChar == CR and cur != LF)):
+                yield i, True                               # LB4, LB5
+                prevChar = cur
+                prev = WJ if cur == SP else AL if cur in (CM, ZWJ) else cur
+                nRI = 1 if cur == RI else 0
+                continue
+            if (cur in (BK, CR, LF, NL)):                   # LB6
+                prev = prevChar = cur
+                continue
+            if (cur == SP):                                 # LB7
+                prevChar = SP
+                continue
+            if (cur in (CM, ZWJ)):
+                if (prevChar not in (SP, ZW)):              # LB9
+                    prevChar = cur
+                    continue
+                cur = AL                                    # LB10
+            if (prevChar == ZWJ):                           # LB8a
+                prev = prevChar = cur
+                nRI = 1 if cur == RI else 0
+                continue
+            action = pairs[prev * NCLASSES + cur]
+            if (action == DIRECT or (action == INDIRECT and prevChar == SP)):
+                yield i, False
+            elif (cur == RI and prev == RI and nRI % 2 == 0):  # LB30a
+                yield i, False
+            nRI = nRI + 1 if cur == RI else 0
+            prev = prevChar = cur
+        yield n, True
+
+    def breaks(self, s:str) -> List[int]:
+        """Return the list of offsets where a line may start.
+        """
+        return [ offset for offset, _mandatory in self.iterBreaks(s) ]
+
+    def iterStreamBreaks(self, ifh:IO, chunkSize:int=1<<16) -> Iterator[Tuple[int, bool]]:
+        """Like iterBreaks(), but over a text stream, with offsets from the
+        start of the stream. Text is processed up to the last newline read so
+        far, since no rule looks across a mandatory break.
+        """
+        base = 0
+        pending = ""
+        while (True):
+            chunk = ifh.read(chunkSize)
+            if (chunk):
+                pending += chunk
+                cut = pending.rfind("\n") + 1
+                if (cut == 0): continue
+            else:
+                cut = len(pending)
+            if (cut):
+                for offset, mandatory in self.iterBreaks(pending[:cut]):
+                    yield base + offset, mandatory
+                base += cut
+                pending = pending[cut:]
+            if (not chunk): break
+
+    def wrap(self, s:str, width:int) -> List[str]:
+        """Break a string into lines of at most `width` display columns
+        (see displayWidth.py) where possible, breaking only at allowed
+        places. Line ends are dropped, and trailing spaces removed.
+        """
+        dw = getDisplayWidth()
+        lines = []
+        line = ""
+        start = 0
+        for offset, mandatory in self.iterBreaks(s):
+            piece = s[start:offset]
+            start = offset
+            if (line and dw.width((line + piece).rstrip(" \r\n")) > width):
+                lines.append(line.rstrip(" "))
+                line = ""
+            line += piece
+            if (mandatory):
+                lines.append(line.rstrip(" \r\n\x0b\x0c\x85\u2028\u2029"))
+                line = ""
+        return lines
+
+
+###############################################################################
+# Main
+#
+if __name__ == "__main__":
+    import argparse
+
+    def processOptions() -> argparse.Namespace:
+        try:
+            from BlockFormatter import BlockFormatter
+            parser = argparse.ArgumentParser(
+                description=descr, formatter_class=BlockFormatter)
+        except ImportError:
+            parser = argparse.ArgumentParser(description=descr)
+
+        parser.add_argument(
+            "--iencoding", type=str, metavar="E", default="utf-8",
+            help="Assume this character coding for input. Default: utf-8.")
+        parser.add_argument(
+            "--lineBreakFile", type=str, metavar="PATH", default=None,
+            help="Get line-break classes from this LineBreak.txt. Default: "
+            "%s if it's there, else a rough guess." % (DEFAULT_LB_PATH))
+        parser.add_argument(
+            "--offsets", action="store_true",
+            help="Just list the break offsets (characters from the start "
+            "of the input), with '!' after mandatory ones.")
+        parser.add_argument(
+            "--quiet", "-q", action="store_true",
+            help="Suppress most messages.")
+        parser.add_argument(
+            "--verbose", "-v", action="count", default=0,
+            help="Add more messages (repeatable).")
+        parser.add_argument(
+            "--version", action="version", version=__version__,
+            help="Display version information, then exit.")
+        parser.add_argument(
+            "--width", type=int, metavar="N", default=72,
+            help="Wrap lines to this many columns. Default: 72.")
+
+        parser.add_argument(
+            "files", type=str, nargs=argparse.REMAINDER,
+            help="Path(s) to input file(s)")
+
+        args0 = parser.parse_args()
+        if (lg and args0.verbose):
+            logging.basicConfig(level=logging.INFO - args0.verbose)
+        return(args0)
+
+    def doOneFile(path:str, fh) -> None:
+        if (args.offsets):
+            for offset0, mandatory0 in lbk0.iterStreamBreaks(fh):
+                print("%d%s" % (offset0, "!" if mandatory0 else ""))
+            return
+        for rec in fh:
+            for line0 in lbk0.wrap(rec, args.width): print(line0)
+        log(1, "Done '%s'." % (path))
+
+    args = processOptions()
+    verbose = args.verbose
+
+    lbk0 = LineBreaker(lbPath=args.lineBreakFile)
+    if (not args.files):
+        doOneFile("[stdin]", codecs.getreader(args.iencoding)(sys.stdin.buffer))
+    for path0 in args.files:
+        with codecs.open(path0, "rb", encoding=args.iencoding) as fh0:
+            doOneFile(path0, fh0)
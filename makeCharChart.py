@@ -10,6 +10,9 @@ import unicodedata
 from math import floor, ceil
 import logging
 
+from displayWidth import getDisplayWidth
+from graphemeClusters import getGraphemeSegmenter
+
 lg = logging.getLogger("makeCharChart")
 
 __metadata__ = {
@@ -57,6 +60,20 @@ be given as decimal, 0x hex, or 0 octal. Each row of the chart will begin
 at a character whose code point is a multiple of the number of columns shown
 per row (''--perRow'', default 16).
 
+In text mode, cells are padded by how many columns each character actually
+takes in a terminal (see `displayWidth.py`), so wide (CJK, fullwidth)
+characters don't push the rest of the row over. Characters that take no
+space (combining marks, zero-width spaces, format controls) are shown on a
+dotted circle (U+25CC), as in the Unicode charts.
+
+With ''--clusters TEXT'', instead of a range of code points, the chart shows
+the grapheme clusters (user-perceived characters; see `graphemeClusters.py`)
+of TEXT (or of stdin, if TEXT is "-"), one per row, with the offset, the
+cluster itself, and its code points (and any of the other rows requested,
+such as ''--utf8'', as columns):
+
+    makeCharChart.py --clusters "ne\u0301e 👩‍💻" --ucategory
+
 
 =Related commands=
 
@@ -67,8 +84,6 @@ per row (''--perRow'', default 16).
 
 =Known bugs and Limitations=
 
-Doesn't do anything special for fullwidth characters in text mode.
-
 There's no way to generate the chart for code points in a non-Unicode encoding,
 but then show the literal chars via cross-coding to
 Unicode (and then to --oencoding, if set).
@@ -92,6 +107,9 @@ For the most recent version, see [http://www.derose.net/steve/utilities] or
 Move sep line to right place. Fix HTML.
 * 2024-04-13: Add --controlPicture. Type-hints. Alignment.
 Add octal output. Fix handling of --min and --max, --oencoding.
+* 2026-10-17: Pad text cells by display width (via displayWidth.py), and
+show zero-width characters on a dotted circle.
+Add --clusters.
 
 
 =Options=
@@ -108,8 +126,17 @@ def printable(i:int) -> str:
             u = chr(i)
         except UnicodeDecodeError as e:
             lg.error("Can't map x%04x (d%04d) to Unicode:\n    %s", i, i, e)
+        if (getDisplayWidth().charWidth(i) == 0):
+            u = chr(0x25CC) + u
     return u
 
+def printableCluster(s:str) -> str:
+    if (len(s) == 1): return printable(ord(s))
+    buf = "".join(printable(ord(c)) if ord(c) < 160 else c for c in s)
+    if (getDisplayWidth().charWidth(ord(s[0])) == 0):
+        buf = chr(0x25CC) + buf
+    return buf
+
 def uprint(s:str) -> None:
     """All printing should go through here.
     """
@@ -258,15 +285,45 @@ def makeTextHead(indent:int=8) -> str:
     """
     head = " " * indent
     for n in range(0, args.perRow):
-        head += ("%4x" % n).center(args.perCell)
+        head += ("%x" % n).rjust(args.perCell)
     return head
 
 def makeTextCell(s:str, width:int=0) -> str:
+    """Right-justify by display width, not by number of code points.
+    """
     if (width < 1): width = args.perCell
-    c = s.rjust(width)
+    c = getDisplayWidth().rjust(s, width)
     return c
 
 
+###############################################################################
+def doClusters(text:str):
+    """Show each grapheme cluster of the text, one per row.
+    """
+    isText = (args.format == "text")
+    if (isText): makeCell = makeTextCell
+    else: makeCell = makeHTMLCell
+    if (not isText): uprint('<table border="border">')
+    for start, end in getGraphemeSegmenter().iterClusters(text):
+        cluster = text[start:end]
+        cps = [ ord(c) for c in cluster ]
+        if (isText): buf = makeTextCell("%d:  " % (start), 8)
+        else: buf = makeHTMLCell("%d" % (start))
+        buf += makeCell(printableCluster(cluster))
+        buf += makeCell(" " + " ".join("U+%04X" % (cp) for cp in cps))
+        if (args.decimal):   buf += makeCell(" " + " ".join("%d" % (cp) for cp in cps))
+        if (args.octal):     buf += makeCell(" " + " ".join("%03o" % (cp) for cp in cps))
+        if (args.utf8):      buf += makeCell(" " + cluster.encode("utf-8").hex())
+        if (args.ucategory): buf += makeCell(" " + " ".join(getUClass(c) for c in cluster))
+        if (args.entity == "dec"):
+            buf += makeCell(" " + "".join("&#%d;" % (cp) for cp in cps))
+        elif (args.entity):
+            buf += makeCell(" " + "".join("&#x%x;" % (cp) for cp in cps))
+        if (isText): uprint(buf)
+        else: uprint("<tr>%s</tr>" % (buf))
+    if (not isText): uprint("</table>")
+
+
 ###############################################################################
 # Main
 #
@@ -292,6 +349,10 @@ def processOptions():
     parser.add_argument(
         "--blankRows", type=anyInt, metavar="N", default=8,
         help="Insert a blank line after every N rows.")
+    parser.add_argument(
+        "--clusters", type=str, metavar="TEXT", default=None,
+        help='Chart the grapheme clusters of TEXT (or stdin, for "-"), ' +
+        "instead of a range of code points.")
     parser.add_argument(
         "--controlPictures", action="store_true",
         help="Show C0 control characters as Unicode control pictures.")
@@ -370,7 +431,9 @@ theEnd0 = args.max
 nRows0 = ceil(floor((theEnd0-theStart0) / args.perRow))
 lg.log(logging.INFO-1, "range: %d to %d, in %d rows.", theStart0, theEnd0, nRows0)
 
-if (args.format == "html"):
+if (args.clusters is not None):
+    doClusters(sys.stdin.read() if args.clusters == "-" else args.clusters)
+elif (args.format == "html"):
     doHTML(theStart0, theEnd0, nRows0)
 elif (args.format == "text"):
     doText(theStart0, theEnd0, nRows0)
@@ -9,7 +9,9 @@ import codecs
 import argparse
 
 from sjdUtils import sjdUtils
-#import strfchr  -- whassup with this???
+import strfchr  # Also shares its character-info cache.
+from displayWidth import getDisplayWidth
+from graphemeClusters import getGraphemeSegmenter
 
 __metadata__ = {
     "title"        : "showInvisibles",
@@ -40,6 +42,19 @@ Also make non-ASCII characters visible by substituting XML numeric
 character references (`&#2022;` etc).
 Can also colorize the changed characters.
 
+With `--zeroWidthOnly`, only the non-ASCII characters that take no space
+on screen (zero-width spaces and joiners, combining marks, format controls,
+etc.) are replaced; the visible ones (including wide CJK ones) are left
+as-is, so text stays readable and lines up as it would in a terminal. The
+widths come from `displayWidth.py`.
+
+With `--clusters`, the input is taken a grapheme cluster at a time (see
+`graphemeClusters.py`), rather than a code point at a time: if any
+character of a cluster (such as a letter plus combining accents, or an
+emoji ZWJ sequence) is replaced, the whole cluster is, so the references
+for one user-perceived character stay together and aren't mixed with
+literal pieces of it.
+
 Useful for visualizing return/linefeed, space/tab, etc. Can also be used
 to escape undesired characters in a file to ease later processing (in that
 case, specify `--nocolor -s`).
@@ -71,6 +86,9 @@ with '${(V)x}' -- though I haven't found any characters it actually fixes.
 * 2021-04-08ff: Better option handling. Drop -s/leaveSpace for --spaceAs SELF.
 Hook up to new strfchr.py. Add lots of formats from there.
 * 2022-10-07: Drop Python 2 remains.
+* 2026-10-16: Actually import strfchr (and so share its char-info cache).
+* 2026-10-17: Add --zeroWidthOnly, using displayWidth.py.
+Add --clusters, using graphemeClusters.py.
 
 
 =To do=
@@ -169,22 +187,37 @@ def mapControlChar(charNum, what=""):
 
 ###############################################################################
 #
+def mapChar(o):
+    """Return what to show for a character, or "" to leave it as is.
+    """
+    if (o < 32):
+        return mapControlChar(o)
+    elif (o > 127):
+        if (not args.zeroWidthOnly or dw.charWidth(o) == 0):
+            return makeCharRef(o)
+    return ""
+
 def doOneFile(path, fh):
-    nControls = nHigh = 0
+    nControls = nHigh = nClusters = 0
     colorState = 0
 
     rec = fh.readline()
     while (rec):
-        for i in (range(0, len(rec))):
-            c = rec[i]
-            o = ord(c)
+        if (args.clusters):
+            pieces = [ rec[start:end] for start, end in gs.iterClusters(rec) ]
+        else:
+            pieces = rec
+        for piece in pieces:
             toprint = ""
-            if (o < 32):
-                nControls += 1
-                toprint = mapControlChar(o)
-            elif (o > 127):
-                nHigh += 1
-                toprint = makeCharRef(o)
+            for c in piece:
+                o = ord(c)
+                if (o < 32): nControls += 1
+                elif (o > 127): nHigh += 1
+                toprint += mapChar(o)
+            if (toprint and len(piece) > 1):
+                nClusters += 1
+                toprint = "".join(mapChar(ord(c)) or makeCharRef(ord(c))
+                    for c in piece)
 
             if (toprint):
                 if (not colorState):
@@ -195,7 +228,7 @@ def doOneFile(path, fh):
                 if (colorState):
                     print(ce, end="")
                     colorState = 0
-                print(c, end="")
+                print(piece, end="")
         if (colorState):
             print(ce, end="")
             colorState = 0
@@ -205,6 +238,8 @@ def doOneFile(path, fh):
     if (not args.quiet): return
     warning("File '%s': Control characters: %d, chars > 127: %d." %
         (path, nControls, nHigh))
+    if (args.clusters):
+        warning("    Multi-character clusters replaced: %d." % (nClusters))
 
 
 ###############################################################################
@@ -232,6 +267,9 @@ def processOptions():
     parser.add_argument(
         "--base", type=int, default=10, choices=[ 10, 16 ],
         help='Use base 10 or 16 for XML character references.')
+    parser.add_argument(
+        "--clusters", action='store_true',
+        help='Replace whole grapheme clusters, not just single characters.')
     parser.add_argument(
         "--color", action='store_true',
         help='Colorize the formerely-invisible characters.')
@@ -266,6 +304,9 @@ def processOptions():
     parser.add_argument(
         "--width", "--pad", type=int, default=4,
         help='How many digits (minimum) for XML numeric character references.')
+    parser.add_argument(
+        "--zeroWidthOnly", action='store_true',
+        help='Only replace non-ASCII characters that take no space on screen.')
 
     parser.add_argument(
         'files', nargs=argparse.REMAINDER,
@@ -279,6 +320,8 @@ args = processOptions()
 warning(repr(args))
 
 su = sjdUtils()
+dw = getDisplayWidth()
+gs = getGraphemeSegmenter()
 cs = ""
 ce = ""
 if (args.color):
@@ -9,6 +9,8 @@ import unicodedata
 
 import regex
 
+from caseFold import getCaseFolder
+
 __metadata__ = {
     "title"        : "showUnicodeCharsInClass",
     "description"  : "Retrieve lists of characters by category (Ll, etc).",
@@ -36,7 +38,12 @@ that are in a given Unicode character category or categories. For example:
 will display all titlecase characters (Unicode category "Letter, Titlecase").
 
 The --find [regex] option may be used as an additional filter, to discard any
-characters whose full Unicode names do not match [regex].
+characters whose full Unicode names do not match [regex]. The match ignores
+case (using the `regex` package's full case folding).
+
+With --fold, the chart and xsv output also show each character's full case
+folding (from `caseFold.py`, so per `CaseFolding.txt` if you have it), and
+the other formats list only characters that fold to something else.
 
 Use ""--showCategories'' to get a list of the category mnemonics (single-letter
 mnemonics may be used to catch a broader category).
@@ -155,6 +162,8 @@ characters for which name lookup fails, as unassigned chars.
 * 2024-08-10: Start syncing --oformat options with `ord`. But then I cleaned up
 the --find options there, and added --findCategory and --showCategories, so that
 can do most everything except the bracket ranging.
+* 2026-10-17: Compile --find once, with real IGNORECASE|FULLCASE, instead of
+prefixing "(?i)". Add --fold, using caseFold.py.
 
 
 =Rights=
@@ -242,6 +251,9 @@ def processOptions():
         "--oformat", "--format", "--output-format", "--outputFormat",
         type=str, default="chart", choices=oChoices,
         help="How to arrange the output. Choices: " + str(oChoices))
+    parser.add_argument(
+        "--fold", action="store_true",
+        help="Show case foldings (and list only characters that have one).")
     parser.add_argument(
         "--last", "--max", type=any_int, default=0xFFFF,
         help="Last code point to check.")
@@ -318,7 +330,10 @@ def warning(msg:str):
 
 args = processOptions()
 
-if (args.find): args.find = "(?i)" + args.find  # No regex.IGNORECASE
+findExpr = None
+if (args.find):
+    findExpr = regex.compile(args.find, regex.IGNORECASE | regex.FULLCASE)
+caseFolder = getCaseFolder() if args.fold else None
 
 if (args.showCategories):
     print("Unicode character category mnemonics:")
@@ -390,10 +405,15 @@ for codePoint in range(args.first, args.last+1):
         nNotInCat += 1
         continue
 
-    if (args.find and not regex.search(args.find, nm)):
+    if (findExpr and not findExpr.search(nm)):
         nNoMatch += 1
         continue
 
+    folded = None
+    if (caseFolder):
+        folded = caseFolder.fold(c)
+        if (folded == c and args.oformat not in ("chart", "xsv")): continue
+
     theCat = unicodedata.category(c)
     if (theCat == "Cn"): continue
 
@@ -405,13 +425,16 @@ for codePoint in range(args.first, args.last+1):
     """
     #
     if (args.oformat == "chart"):  # the default
+        foldInfo = "" if folded is None else "-> '%s' " % (folded)
         try:
-            print("    U+%04x '%s' (%-2s) %s" % (codePoint, c, theCat, nm))
+            print("    U+%04x '%s' (%-2s) %s%s" % (codePoint, c, theCat, foldInfo, nm))
         except UnicodeEncodeError:
             print("    U+%04x [???]] (%-2s) %s" % (codePoint, theCat, nm))
     elif (args.oformat == "xsv"):
-        print("<Rec Hex='%04x' Cat='%s' Name='%s' />" %
-            (codePoint, theCat, nm))
+        foldInfo = "" if folded is None else " Fold='%s'" % (
+            " ".join("%04x" % (ord(f)) for f in folded))
+        print("<Rec Hex='%04x' Cat='%s'%s Name='%s' />" %
+            (codePoint, theCat, foldInfo, nm))
     elif (args.oformat == "bycode"):
         print("    %-12s: '%s'," % (makeEsc(codePoint), nm))
     elif (args.oformat == "byname"):
@@ -9,19 +9,26 @@ import sys
 import re
 import codecs
 import unicodedata
-import xml
 import html
+import io
+import csv
+import json
+import os
 from html.entities import codepoint2name  # name2codepoint
 from urllib.parse import quote as urlquote
 from enum import Enum
-#from typing import Union
-from functools import partial
+from typing import Dict, List, Tuple  # Union
+from operator import attrgetter
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 
-from CharDisplay import getCharInfo
 # TODO Fix
 from CharDisplay import myCodepoint2script, myCodepoint2block, unicodeCategories, unixJargon
 import CharDisplay
 
+# The UCD-loading classes used to live here.
+from UnicodeDBAccess import UdbEntry, UnicodeDBAccess, UnicodeProperties  # noqa: F401
+
 #from domextensions import DomExtensions
 import logging
 lg = logging.getLogger("strfchr")
@@ -34,7 +41,7 @@ __metadata__ = {
     "type"         : "http://purl.org/dc/dcmitype/Software",
     "language"     : "Python 3.6",
     "created"      : "2021-04-08",
-    "modified"     : "2023-11-23",
+    "modified"     : "2026-10-16",
     "publisher"    : "http://github.com/sderose",
     "license"      : "https://creativecommons.org/licenses/by-sa/3.0/"
 }
@@ -63,10 +70,23 @@ produces lines like:
 
 This example format might be used to make a Python list.
 
+To make a table for a whole range (by default, all 0x110000 code points),
+use `--export` with "ndjson", "csv", or "tsv". The columns are the fields
+used in `--format` (any literal text in it is ignored), and `--filter`
+limits the rows to code points where a given field has a given value:
+
+    strfchr.py --export csv -f '%{HEXINT} %{UNAME} %{CATEGORYABBR}'
+        --filter CATEGORYABBR=Lu
+
+The range is rendered in shards of 4096 code points, in a pool of
+`--jobs` processes; the shards are written in order, so the output is the
+same as with `--jobs 1`.
+
 To get the list of %-codes, the corresponding names, and a bit of
 information about each, use `strfchr --help-codes`. As you might
 expect, "%%" can be used to get a literal percent-sign).
 "%{name}" can also be used, with longer names for the forms or properties.
+Code that imports strfchr can add its own fields with `registerField()`.
 
 You can use it from code, or in 3 ways from the command-line, all of
 which will display one line for each code point involved,
@@ -74,8 +94,9 @@ formatted per `-f`:
 * if you specify --min and --max you get the code points in that range
 * if you provide one or more arguments that are single characters or
 integers (such as 0xFF, 255, or 0377), a line will be printed for each.
-* otherwise, you can type text and at the end the characters in that text
-will be used.
+* otherwise, the characters of text read from stdin will be used. This
+is read and written a chunk at a time (see `--chunkSize`), so it can be
+used on large files in a pipeline.
 
 TEX/LATEX, AFII, and other conversions are coming.
 
@@ -133,6 +154,22 @@ requesting MNEMONIC or CONTROLPIC for non-control chars.
   2021-04-20: Finish basic functionality.
   2021-10-28: Lint fixes. Support loading from XML or CSV(ish). fill out
 info on normative files, char props, etc.
+  2026-10-16: Add compileFormat(), so format strings are parsed only once.
+Fix %{name} form (the braces were being kept).
+Write --min/--max ranges in large batches, reusing per-block/plane data.
+Allow --min 0.
+Bound the char-info cache (LRU), add --cacheSize and --cacheStats.
+Make CharInfo calculate fields lazily, and use it instead of getCharInfo().
+Replace the codePointToDatum() if/elif chain with a field registry
+(see registerField()), which showCodes() also uses.
+Stream stdin in chunks (see --chunkSize), rendering each distinct
+character only once.
+  2026-10-17: Move UdbEntry and UnicodeDBAccess to UnicodeDBAccess.py.
+Add --export (with --filter and --jobs), and exportRange().
+Make getTexEquivalent() (the TEX field) use unicodeToTex.py, and make
+the `charInfo` replacements literal.
+Calculate the WIDTH field (terminal columns) via displayWidth.py.
+Add the FOLD field (full case folding) via caseFold.py.
 
 
 =Rights=
@@ -261,343 +298,6 @@ cp1252ToUnicode = {
     0x9F : 0x0178,   # LATIN CAPITAL LETTER Y WITH DIAERESIS
 }
 
-###############################################################################
-#
-# typename      must match         tgt type
-UNKNOWN = (str, r".*",             str,   )
-UBOOL   = (str, r"^[NY]$",         bool,  )
-UDECINT = (str, r"^[\d]{1,8}$",    int,   )
-UHEXINT = (str, r"^[\dA-F]{1,5}$", int,   )
-OHEXINT = (str, r"^([\dA-F]{1,5}|#)$", str,   )   # Optional UHEXINT
-UHEXINTS = (str, r"^([\dA-F]{1,5})(\s+[\dA-F]{1,5})*$", int,   )  # 1 or more
-UTOKEN  = (str, r"^\w+$",          str,   )
-UTBOOL  = (str, r"%[NYM]$",        str,   )
-UGCAT   = (str, r"^[A-Z][a-z]$",   str,   )
-OCTO    = True  # Signals that "#" is ok
-
-# ??  Prepended_Concatenation_Mark; "InPC" ??
-# Many more unihan properties, all starting with "k".
-#
-UnicodeProperties = {
-    # Attribute name   (  freq, ),  #
-    "AHex":            (   254, None, UBOOL,   ),  # ASCII_Hex_Digit
-    "Alpha":           (  2122, None, UBOOL,   ),  # Alphabetic
-    "Bidi_C":          (   239, None, UBOOL,   ),  # Bidi_Control
-    "Bidi_M":          (   595, None, UBOOL,   ),  # mirrored
-    "CE":              (   310, None, UBOOL,   ),  # Composition_Exclusion
-    "CI":              (  1136, None, UBOOL,   ),  # Case_Ignorable
-    "CWCF":            (  1302, None, UBOOL,   ),  # Changes_When_Casefolded
-    "CWCM":            (   682, None, UBOOL,   ),  # Changes_When_Casemapped
-    "CWKCF":           (  1637, None, UBOOL,   ),  # Changes_When_NFKC_Casefolded
-    "CWL":             (  1255, None, UBOOL,   ),  # Changes_When_Lowercased
-    "CWT":             (  1278, None, UBOOL,   ),  # Changes_When_Titlecased
-    "CWU":             (  1256, None, UBOOL,   ),  # Changes_When_Uppercased
-    "Cased":           (   742, None, UBOOL,   ),  # Cased
-    "Comp_Ex":         (   363, None, UBOOL,   ),  # Full_Composition_Exclusion
-    "DI":              (   276, None, UBOOL,   ),  # Default_Ignorable_Code_Point
-    "Dash":            (   257, None, UBOOL,   ),  # Dash
-    "Dep":             (   247, None, UBOOL,   ),  #
-    "Dia":             (   683, None, UBOOL,   ),  # Diacritic
-    # Emoji properties
-    "Emoji":           (   683, None, UBOOL,   ),  #
-    "EPres":           (   683, None, UBOOL,   ),  #
-    "EMod":            (   683, None, UBOOL,   ),  #
-    "EBase":           (   683, None, UBOOL,   ),  #
-    "EComp":           (   683, None, UBOOL,   ),  #
-    "ExtPict":         (   683, None, UBOOL,   ),  #
-    #
-    "EqUIdeo":         (     0, None, UHEXINT, ),  # Equivalent_Unified_Ideograph
-    "Ext":             (   260, None, UBOOL,   ),  # Extender
-    "FC_NFKC":         (   840, None,    "",   ),  #
-    "GCB":             (  1672, None,   str,   ),  # Grapheme_Cluster_Break (2-3 letter code  )
-    "Gr_Base":         (  1429, None, UBOOL,   ),  # Grapheme_Base
-    "Gr_Ext":          (   921, None, UBOOL,   ),  # Grapheme_Extend
-    "Gr_Link":         (   259, None, UBOOL,   ),  # Grapheme_Link
-    "Hex":             (   276, None, UBOOL,   ),  # Hex_Digit
-    "Hyphen":          (   243, None, UBOOL,   ),  # Hyphen
-    "IDC":             (  1482, None, UBOOL,   ),  # ID_Continue,
-    "IDS":             (  2472, None, UBOOL,   ),  # ID_Start
-    "IDSB":            (   235, None, UBOOL,   ),  # IDS_Binary_Operator
-    "IDST":            (   234, None, UBOOL,   ),  # IDS_Trinary_Operator
-    "Ideo":            (   254, None, UBOOL,   ),  # Ideographic
-    "InSC":            (     0, None, UTOKEN,  ),  # Indic_Syllabic_Category
-    "JSN":             (   298, None, UTOKEN,  ),  # Jamo_Short_Name r"[A-Z]{0,3}"?
-    "Join_C":          (   234, None, UBOOL,   ),  # Join_Control
-    "LOE":             (   247, None, UBOOL,   ),  # Logical_Order_Exception
-    "Lower":           (  1805, None, UBOOL,   ),  # Lower_Case
-    "Math":            (   521, None, UBOOL,   ),  # Math
-    "NChar":           (   250, None, UBOOL,   ),  #
-    # Normal forms
-    "NFC_QC":          (   466, None, UTBOOL,  ),  # ..._Quick_Check { "Y" | "N" | "M" }?
-    "NFD_QC":          (   754, None, UBOOL,   ),  # ..._Quick_Check { "Y" | "N" }?
-    "NFKC_CF":         (  5952, OCTO, OHEXINT, ),  #  NKFC_Casefold { "#" | code-points }?
-    "NFKC_QC":         (   822, None, UTBOOL,  ),  # ..._Quick_Check { "Y" | "N" | "M" }?
-    "NFKD_QC":         (  1048, None, UBOOL,   ),  # ..._Quick_Check { "Y" | "N" }?
-    #
-    "OAlpha":          (   959, None, UBOOL,   ),  # Other_Alphabetic
-    "ODI":             (   242, None, UBOOL,   ),  # Other_Default_Ignorable_Code_Point
-    "OGr_Ext":         (   255, None, UBOOL,   ),  # Other_Grapheme_Extend
-    "OIDC":            (   243, None, UBOOL,   ),  # Other_ID_Continue
-    "OIDS":            (   236, None, UBOOL,   ),  # Other_ID_Start
-    "OLower":          (   381, None, UBOOL,   ),  # Other_Lower_Case
-    "OMath":           (   484, None, UBOOL,   ),  # Other_Math
-    "OUpper":          (   274, None, UBOOL,   ),  # Other_Upper_Case
-    "Pat_Syn":         (   384, None, UBOOL,   ),  # Pattern_Syntax
-    "Pat_WS":          (   243, None, UBOOL,   ),  # Pattern_White_Space
-    "QMark":           (   261, None, UBOOL,   ),  # Quotation_Mark
-    "Radical":         (   235, None, UBOOL,   ),  # Radical
-    "RI":              (     0, None, UBOOL,   ),  # Regional_Indicator
-    "SB":              (  4514, None,   str,   ),  # Sentence_Break (2 letter code  )
-    "SD":              (   278, None, UBOOL,   ),  # Soft_Dotted
-    "STerm":           (   298, None, UBOOL,   ),  # Sentence_Terminal
-    "Term":            (   393, None, UBOOL,   ),  # Terminal_Punctuation
-    "UIdeo":           (   248, None, UBOOL,   ),  # Unified_Ideograph
-    "Upper":           (  1701, None, UBOOL,   ),  # Upper_Case
-    "VS":              (   235, None, UBOOL,   ),  #
-    "WB":              (  2933, None,  str,    ),  # Word_Break (2-8 letter code)
-    "WSpace":          (   258, None, UBOOL,   ),  # White_Space
-    "XIDC":            (  1501, None, UBOOL,   ),  # XID_Continue
-    "XIDS":            (  2493, None, UBOOL,   ),  # XID_Start
-    "XO_NFC":          (   314, None, UBOOL,   ),  #
-    "XO_NFD":          (   729, None, UBOOL,   ),  #
-    "XO_NFKC":         (   818, None, UBOOL,   ),  #
-    "XO_NFKD":         (  1205, None, UBOOL,   ),  #
-    "age":             (  2213, None,  "1.1",  ),  # Version introduced, as \d+\.\d+
-    "bc":              (  1745, None,  "BN",   ),  # bidirectional class
-    "blk":             (                       ),  # Block name (_ not space)
-    "bmg":             (   594, None, UHEXINT, ),  # code point of mirror character
-    "bpb":             (     0,                ),  # bidi paired bracket
-    "bpt":             (     0,                ),  # bidi paired bracket type
-    "ccc":             (   694, None, UDECINT, ),  # decimal representation of the combining class.
-    "cf":              (  1349, OCTO, UHEXINT, ),  # Case_Folding { "#" | code-points }?
-    "cp":              ( 33248, None, UHEXINT, ),  # code point (hex)
-    "cps":             (   511, None, UNKNOWN, ),  #
-    "desc":            (    93, None, UNKNOWN, ),  #
-    "dm":              ( 17062, OCTO,     "#", ),  # decomposition mapping { "#"|code-points }?
-    "dt":              (  1968, None,     str, ),  # decomposition type { "can" |"com"|"enc"|"fin"
-    #|"font"|"fra"|"init"|"iso"|"med"|"nar" |"nb"  |"sml"|"sqr" |"sub"|"sup"|"vert"|"wide"|"none"}?
-    "ea":              (   929, None, UBOOL,   ),  # East Asian Width { "A"|"F"|"H"|"N"|"Na"|"W" }?
-    "first-cp":        (   631, None, UNKNOWN, ),  #
-    "gc":              (  4986, None,  UGCAT,  ),  # General Category (Lu, etc.)
-    "hst":             (   658, None,  "NA",   ),  # Hangul_Syll_Type { L|LV|LVT|T|V|NA }?
-    "ideograph":       (   237, None, UNKNOWN, ),  #
-    "isc":             (   232, None,   str,   ),  # ISO 10646 comment
-    "jg":              (   460, None,   str,   ),  # joining group (bug enum)
-    "jt":              (  1093, None,   str,   ),  # joining class { "U"|"C"|"T"|"D"|"L"|"R" }?
-    "last-cp":         (   631, None, UNKNOWN, ),  #
-    "lb":              (  3254, None,   str,   ),  # Line_Break  (big enum of 2-3 letter codes)
-    "lc":              (  1261, OCTO,   "#",   ),  #
-    "na":              ( 32416, None,    "",   ),  # Current name
-    "na1":             (  2236, None, UNKNOWN, ),  # Name in 1.0
-    "name":            (   615, None, UNKNOWN, ),  #
-    "new":             (     6, None, UNKNOWN, ),  #
-    "nt":              (  1120, None,  "None", ),  # numeric type { "None"|"De"|"Di"|"Nu" }?
-    "number":          (   237, None, UNKNOWN, ),  #
-    "nv":              (  1384, None,    "",   ),  # numeric value, represented as a fraction
-    "old":             (     6, None, UNKNOWN, ),  #
-    "radical":         (   237, None, UNKNOWN, ),  #
-    "sc":              (  1371, None,  "Zyyy", ),  # script (big enum of 4-char abbrs)
-    "scf":             (  1273, None, OHEXINT, ),  # Simple_Case_Folding
-    "slc":             (  1261, OCTO,  "#",    ),  #
-    "scx":             (     0, None,          ),  # script extension { list { script + }}?
-    "stc":             (  1269, OCTO,  "#",    ),  #
-    "suc":             (  1269, OCTO,  "#",    ),  #
-    "tc":              (  1317, OCTO,  "#",    ),  #
-    "uc":              (  1344, OCTO,  "#",    ),  #
-    "version":         (     6, None, UNKNOWN, ),  #
-    "vo":              (     0, None, str,     ),  # Vertical_Orientation { "U"|"R"|"Tu"|"Tr" }?
-    "when":            (    93, None, UNKNOWN, ),  #
-    "xmlns":           (     1, None, UNKNOWN, ),  #
-}
-
-
-###############################################################################
-#
-class UdbEntry(dict):
-    """A class intended to represent instances of entries from the Unicode
-    Database (see https://unicode.org/ucd/)
-    Keyed on the integer codepoint.
-    TODO: Better as a namedtuple?
-    """
-    def __init__(self, props:dict):
-        super(UdbEntry, self).__init__()
-        for k, v in props.items():
-            self[k] = v
-
-
-###############################################################################
-#
-class UnicodeDBAccess:  # TODO: Unfinished
-    """The "grouped" XML looks like the sample below.
-    The attributes appear to inherit in the obvious manner; documentation
-    is at [https://www.unicode.org/reports/tr42/].
-
-    <group age="1.1" na="" JSN="" gc="Cc" ccc="0" dt="none" dm="#" nt="None"
-    nv="" bc="BN" Bidi_M="N" bmg="" suc="#" slc="#" stc="#" uc="#" lc="#"
-    tc="#" scf="#" cf="#" jt="U" jg="No_Joining_Group" ea="N" lb="CM" sc="Zyyy"
-    Dash="N" WSpace="N" Hyphen="N" QMark="N" Radical="N" Ideo="N" UIdeo="N"
-    IDSB="N" IDST="N" hst="NA" DI="N" ODI="N" Alpha="N" OAlpha="N" Upper="N"
-    OUpper="N" Lower="N" OLower="N" Math="N" OMath="N" Hex="N" AHex="N"
-    NChar="N" VS="N" Bidi_C="N" Join_C="N" Gr_Base="N" Gr_Ext="N" OGr_Ext="N"
-    Gr_Link="N" STerm="N" Ext="N" Term="N" Dia="N" Dep="N" IDS="N" OIDS="N"
-    XIDS="N" IDC="N" OIDC="N" XIDC="N" SD="N" LOE="N" Pat_WS="N" Pat_Syn="N"
-    GCB="CN" WB="XX" SB="XX" CE="N" Comp_Ex="N" NFC_QC="Y" NFD_QC="Y"
-    NFKC_QC="Y" NFKD_QC="Y" XO_NFC="N" XO_NFD="N" XO_NFKC="N" XO_NFKD="N"
-    FC_NFKC="" CI="N" Cased="N" CWCF="N" CWCM="N" CWKCF="N" CWL="N" CWT="N"
-    CWU="N" NFKC_CF="#" isc="">
-
-    <char cp="0000" na1="NULL"/>
-    <char cp="0001" na1="START OF HEADING"/>
-    <char cp="0002" na1="START OF TEXT"/>
-    <char cp="0003" na1="END OF TEXT"/>
-    <char cp="0004" na1="END OF TRANSMISSION"/>
-    <char cp="0005" na1="ENQUIRY"/>
-    <char cp="0006" na1="ACKNOWLEDGE"/>
-    <char cp="0007" na1="BELL"/>
-    <char cp="0008" na1="BACKSPACE"/>
-    <char cp="0009" bc="S" lb="BA" WSpace="Y" Pat_WS="Y" SB="SP"
-        na1="CHARACTER TABULATION"/>
-    <char cp="000A" bc="B" lb="LF" WSpace="Y" Pat_WS="Y" GCB="LF" WB="LF" SB="LF"
-        na1="LINE FEED (LF)"/>
-    <char cp="000B" bc="S" lb="BK" WSpace="Y" Pat_WS="Y" WB="NL" SB="SP"
-        na1="LINE TABULATION"/>
-    <char cp="000C" bc="WS" lb="BK" WSpace="Y" Pat_WS="Y" WB="NL" SB="SP"
-        na1="FORM FEED (FF)"/>
-    <char cp="000D" bc="B" lb="CR" WSpace="Y" Pat_WS="Y" GCB="CR" WB="CR" SB="CR"
-        na1="CARRIAGE RETURN (CR)"/>
-    <char cp="000E" na1="SHIFT OUT"/>
-    <char cp="000F" na1="SHIFT IN"/>
-    <char cp="0010" na1="DATA LINK ESCAPE"/>
-    <char cp="0011" na1="DEVICE CONTROL ONE"/>
-    <char cp="0012" na1="DEVICE CONTROL TWO"/>
-    <char cp="0013" na1="DEVICE CONTROL THREE"/>
-    <char cp="0014" na1="DEVICE CONTROL FOUR"/>
-    <char cp="0015" na1="NEGATIVE ACKNOWLEDGE"/>
-    <char cp="0016" na1="SYNCHRONOUS IDLE"/>
-    <char cp="0017" na1="END OF TRANSMISSION BLOCK"/>
-    <char cp="0018" na1="CANCEL"/>
-    <char cp="0019" na1="END OF MEDIUM"/>
-    <char cp="001A" na1="SUBSTITUTE"/>
-    <char cp="001B" na1="ESCAPE"/>
-    <char cp="001C" bc="B" na1="INFORMATION SEPARATOR FOUR"/>
-    <char cp="001D" bc="B" na1="INFORMATION SEPARATOR THREE"/>
-    <char cp="001E" bc="B" na1="INFORMATION SEPARATOR TWO"/>
-    <char cp="001F" bc="S" na1="INFORMATION SEPARATOR ONE"/></group>
-    ...
-    """
-    NORMATIVE_BASE_URI = "https://www.unicode.org/Public/5.2.0/ucdxml/"
-    NORMATIVE_XML_FILES = [
-        "ucd.all.flat.zip",             # 2009-09-28 19:35  6.6M
-        "ucd.all.grouped.zip",          # 2009-09-28 19:35  5.6M
-        "ucd.nounihan.flat.zip",        # 2009-09-28 19:35  563K
-        "ucd.nounihan.grouped.zip",     # 2009-09-28 19:35  359K
-        "ucd.unihan.flat.zip",          # 2009-09-28 19:36  5.3M
-        "ucd.unihan.grouped.zip",       # 2009-09-28 19:36  5.3M
-        "ucdxml.readme.txt",            # 2009-09-28 19:36  5.3M
-        "ucd.unihan.grouped.zip",       # 2009-09-28 19:38  1.0K
-    ]
-
-    NORMATIVE_CSV_FILES = [
-        "ArabicShaping.txt",        # 2009-08-17 13:39  13K
-        "BidiMirroring.txt",        # 2009-05-22 15:10  23K
-        "BidiTest.txt",             # 2009-06-03 12:17  3.2M
-        "Blocks.txt",               # 2009-05-19 18:24  6.6K
-        "CJKRadicals.txt",          # 2009-05-28 13:52  4.7K
-        "CaseFolding.txt",          # 2009-05-28 18:25  63K
-        "CompositionExclusions.txt",# 2009-05-22 15:10  7.9K
-        "DerivedAge.txt",           # 2009-09-21 14:01  71K
-        "DerivedCoreProperties.txt",# 2009-08-26 12:39  752K
-        "DerivedNormalizationProps.txt",# 2009-08-31 14:48  737K
-        "EastAsianWidth.txt",       # 2009-06-09 19:49  779K
-        "HangulSyllableType.txt",   # 2009-05-22 18:28  50K
-        "Index.txt",                # 2009-07-09 13:56  148K
-        "Jamo.txt",                 # 2009-05-22 15:10  3.2K
-        "LineBreak.txt",            # 2009-08-17 14:24  835K
-        "NameAliases.txt",          # 2009-05-22 15:10  1.1K
-        "NamedSequences.txt",       # 2009-09-14 14:50  15K
-        "NamedSequencesProv.txt",   # 2009-09-14 14:50  2.5K
-        "NamesList.html",           # 2009-09-15 17:01  21K
-        "NamesList.txt",            # 2009-09-04 12:28  1.0M
-        "NormalizationCorrections.txt", # 2009-05-22 16:07  2.0K
-        "NormalizationTest.txt",    # 2009-08-24 16:03  2.2M
-        "PropList.txt",             # 2009-08-24 16:02  90K
-        "PropertyAliases.txt",      # 2009-08-24 19:00  5.9K
-        "PropertyValueAliases.txt", # 2009-08-24 19:00  36K
-        "ReadMe.txt",               # 2009-09-30 18:33  410
-        "Scripts.txt",              # 2009-08-24 16:03  119K
-        "SpecialCasing.txt",        # 2009-09-22 20:05  16K
-        "StandardizedVariants.html",# 2009-09-28 18:25  33K
-        "StandardizedVariants.txt", # 2008-09-18 19:45  7.5K
-        "UnicodeData.txt",          # 2009-08-17 13:38  1.2M
-        "Unihan.zip",               # 2009-08-31 15:58  5.9M
-    ]
-
-    EXPECTEDFIELDS = 15
-    #FILENAME = "ucd.nounihan.flat.xml"
-    #FILENAME2 = "ucd.unihan.flat.xml"
-    _TYPES = [ ]
-
-    def __init__(self):
-        """Load and provide access to the Unicode database.
-        A lot of the data is in Python lib unicodedata, but not all, afaict.
-        The official site provides the data in XML and in a CSV-ish form using
-        ";" delimiters, "#" comments, and special meaning for indented lines.
-        I'm going with the XML.
-
-        https://www.unicode.org/Public/5.2.0/ucdxml/
-        https://www.unicode.org/reports/tr44/
-        """
-        self.version = None
-        self.charEntries = {}
-
-    def readUdbXml(self, path:str):
-        #FILENAME = "ucd.nounihan.flat.xml"
-        #FILENAME2 = "ucd.unihan.flat.xml"
-        _TYPES = [ ]
-        #charEntries = {}
-
-        lastCpInt = 0
-        docEl = xml.dom.minidom.parse(path)
-        for groupEl in docEl.eachElement("group"):
-            groupProperties = {}
-            for aname, avalue in groupEl.attributes.items():
-                assert aname in UnicodeProperties
-                groupProperties[aname] = avalue
-            groupObj = UdbEntry(groupProperties)
-            assert "cp" not in groupObj
-
-            for charEl in groupEl.childNodes:
-                # TODO: stash name-alias child elements?
-                if (charEl.nodeName != "char"): continue
-                charProperties = groupProperties.copy()
-                for aname, avalue in charEl.attributes.items():
-                    assert aname in UnicodeProperties
-                    charProperties[aname] = avalue
-                cpInt = int(charProperties["cp"], 16)
-                assert cpInt > lastCpInt
-                lastCpInt = cpInt
-                self.charEntries[cpInt] = UdbEntry(charProperties)
-
-    def readUdbTextish(self, path:str):
-        #charEntries = {}
-        ufh = codecs.open(path, "rb", encoding="utf-8")
-        lastN = 0
-        recnum = 0
-        for recnum, rec in enumerate(ufh.readlines()):
-            if (rec[0] in "@#"): continue
-            assert rec.isascii(), "UnicodeData not all ASCII"
-            if rec.strip() == "": continue
-            fields = rec.split(";")
-            if (len(fields) != UnicodeDBAccess.EXPECTEDFIELDS):
-                log(0, "Record %d: expected %d fields but found %d: '%s'\n" %
-                    (recnum, UnicodeDBAccess.EXPECTEDFIELDS, len(fields), rec))
-                continue
-            n = int(fields[0], 16)
-            assert n > lastN
-            lastN = n
-            self.charEntries[n] = UdbEntry(fields)
-        return recnum
-
 
 ###############################################################################
 # Shorthand used by classes Sebastian and CharInfo
@@ -645,6 +345,7 @@ class CharInfo:
         "NFD":         ( P, X,    0,   str,  unicodedata.normalize("NFD", chr(0xE2)) ),
         "NFKC":        ( P, X,    0,   str,  unicodedata.normalize("NFKC", chr(0xE2)) ),
         "NFKD":        ( P, X,    0,   str,  unicodedata.normalize("NFKD", chr(0xE2)) ),
+        "DECOMP":      ( P, c,    0,   str,  unicodedata.decomposition(chr(0xE2)) ),
 
         "EAWIDTH":     ( P, X,    0,   float, "" ),
         "WIDTH":       ( P, X,    0,   float, "" ),
@@ -688,6 +389,10 @@ class CharInfo:
     }
 
     def __init__(self, wh):
+        """Only the code point and literal are set up front. Everything
+        else is calculated the first time it is asked for (see
+        __getattr__() and CharInfo.__computers__), and then kept.
+        """
         self.ERROR = None
         if (isinstance(wh, int)):
             self.n = wh
@@ -695,7 +400,24 @@ class CharInfo:
         else:
             self.c = wh
             self.n = ord(wh)
-        self.setCharInfo()
+
+    def __getattr__(self, k):
+        """Only called when k isn't already set, so computes each lazy
+        field at most once.
+        """
+        if (k not in CharInfo.__infoItems__ and k not in CharInfo.__computers__):
+            raise AttributeError("Unknown character property '%s'." % (k))
+        computer = CharInfo.__computers__.get(k)
+        val = computer(self) if computer else None
+        setattr(self, k, val)
+        return val
+
+    @staticmethod
+    def isCheap(k:str) -> bool:
+        """Is this field calculated directly from the code point (as opposed
+        to needing a library call or lookup)? Cheap ones aren't worth caching.
+        """
+        return (k in CharInfo.__infoItems__ and CharInfo.__infoItems__[k][1] == C)
 
     def setProp(self, k, value):
         if (k not in CharInfo.__infoItems__ and
@@ -716,44 +438,23 @@ class CharInfo:
     @property
     def PLANENUMBER(self):
         return self.n >> 16
-    def PLANENAME(self):
-        pnum = self.n >> 16
-        if (pnum == 0):    pname = "Basic Multilingual"
-        elif (pnum == 1):  pname = "Supplementary Multilingual"
-        elif (pnum == 2):  pname = "Supplementary Ideographic"
-        elif (pnum == 16): pname = "Supplementary Private Use Area B"
-        elif (pnum == 15): pname = "Supplementary Private Use Area A"
-        elif (pnum == 14): pname = "Supplementary Special-purpose"
-        elif (pnum >= 3):  pname = "Unassigned"
-        else: pname = "-UNKNOWN-"
-        return pname
-
-    @property
-    def JARGON(self):
-        if (self.c in unixJargon): return unixJargon[self.c]
-        return None
 
     @property
     def SLASH0(self): return "\\x{%x}" % (self.n)
     @property
     def SLASH2(self):
         if (self.n <= 0xFF): return "\\x%02x" % (self.n)
-        return getFallback(self)
+        return getFallback(self.n)
     @property
     def SLASH4(self):
         if (self.n <= 0xFFFF): return "\\u%04x" % (self.n)
-        return getFallback(self)
+        return getFallback(self.n)
     @property
     def SLASH8(self): return "\\U%08x" % (self.n)
     @property
     def DECENTITY(self): return "&#%4d;" % (self.n)
     @property
     def HEXENTITY(self): return "&#x%04x;" % (self.n)
-    @property
-    def NAMEDENTITY(self):
-        nam = codePointToDatum(self.n, "entNamed")
-        if (nam): return nam
-        return getFallback(self)
 
     @property
     def BININT(self):                       # 0342
@@ -767,92 +468,115 @@ class CharInfo:
     def DECINT(self): return "%d" % (self.n)
     @property
     def HEXINT(self): return "0x%04x" % (self.n)
+    @property
+    def UPLUS(self): return "U+%04x" % (self.n)
 
     @property
     def UTF8(self):
         buf = "\\x"
-        myBytes = self.c.encode("utf-8")
+        myBytes = self.c.encode("utf-8", errors="surrogatepass")
         for b in myBytes: buf += "%02x" % (b)
         return buf
 
     @property
-    def URL(self): urlquote(self.c.encode("utf-8"))
+    def URI(self): return urlquote(self.c.encode("utf-8", errors="surrogatepass"))
+    @property
+    def URL(self): return self.URI
 
     @property
     def MNEMONIC(self):
         if (self.n <= 0x20): return C0names[self.n]
         if (0x80 <= self.n <= 0x9F): return C1names[self.n-0x80]
-        return getFallback(self)
+        return getFallback(self.n)
 
     @property
     def CONTROLPIC(self):
         if (self.n <= 0x20): return chr(0x2400+self.n)
-        return getFallback(self)
+        return getFallback(self.n)
 
     ###########################################################################
+    # Fields that need a library call or lookup. These are only calculated
+    # when first asked for (see __getattr__()).
     #
-    # pylint: disable=W0201
+    def getUNAME(self):
+        nam = unicodedata.name(self.c, None)
+        if (not nam):  # Includes private use chars.
+            self.ERROR = "Cannot find name for U+%05x." % (self.n)
+            nam = "[???]"
+        return nam
+
+    def getPLANENAME(self):
+        pnum = self.n >> 16
+        if (pnum == 0):    pname = "Basic Multilingual"
+        elif (pnum == 1):  pname = "Supplementary Multilingual"
+        elif (pnum == 2):  pname = "Supplementary Ideographic"
+        elif (pnum == 16): pname = "Supplementary Private Use Area B"
+        elif (pnum == 15): pname = "Supplementary Private Use Area A"
+        elif (pnum == 14): pname = "Supplementary Special-purpose"
+        elif (pnum >= 3):  pname = "Unassigned"
+        else: pname = "-UNKNOWN-"
+        return pname
+
+    def getCATEGORYNAME(self):
+        return Categories.get(self.CATEGORYABBR)
+
+    def getNAMEDENTITY(self):
+        if (self.n in codepoint2name): return "&%s;" % (codepoint2name[self.n])
+        return getFallback(self.n)
+
+    def getJARGON(self):
+        if (self.c in unixJargon): return unixJargon[self.c]
+        return None
+
+    __computers__ = {
+        "UNAME":        getUNAME,
+        "UNORM":        lambda self: self.UNAME.replace(" ", "_"),
+        "SCRIPTNAME":   lambda self: myCodepoint2script(self.n),
+        "BLOCKNAME":    lambda self: myCodepoint2block(self.n),
+        "PLANENAME":    getPLANENAME,
+        "CATEGORYABBR": lambda self: unicodedata.category(self.c),
+        "CATEGORYNAME": getCATEGORYNAME,
+        "JARGON":       getJARGON,
+        "NAMEDENTITY":  getNAMEDENTITY,
+
+        "DECOMP":       lambda self: unicodedata.decomposition(self.c),
+        "NFC":          lambda self: unicodedata.normalize("NFC",  self.c),
+        "NFD":          lambda self: unicodedata.normalize("NFD",  self.c),
+        "NFKC":         lambda self: unicodedata.normalize("NFKC", self.c),
+        "NFKD":         lambda self: unicodedata.normalize("NFKD", self.c),
+
+        "EAWIDTH":      lambda self: unicodedata.east_asian_width(self.c),
+        "NUMERICVALUE": lambda self: unicodedata.numeric(self.c, None),
+
+        # TODO: Add XIDENTSTART, XIDENTCONTINUE
+        "ISURI":        lambda self: CharDisplay.okInURI(self.n),
+        "ISFPI":        lambda self: CharDisplay.okInFPI(self.n),
+        "ISNUMERIC":    lambda self: self.NUMERICVALUE is not None,
+        "ISBIDI":       lambda self: unicodedata.bidirectional(self.c),
+        "ISCOMBINING":  lambda self: unicodedata.combining(self.c) != 0,
+        "ISCOMBINED":   lambda self: self.DECOMP != "",
+        "ISMIRROR":     lambda self: bool(unicodedata.mirrored(self.c)),
+        # TODO: Add MIRROROF
+    }
+
+    ###########################################################################
     #
     def setCharInfo(self):
-        """Gather a lot of info about the given code point, and store
-        in self.xxxx
+        """Calculate all the fields now, rather than as they're asked for.
         See https://docs.python.org/2/library/unicodedata.html
         """
         n = self.n
-        if (n > 0xFFFFF):
+        if (n > 0x10FFFF):
             self.ERROR = "[Out of range]"
-            return charInfo
+            return self
 
         if (n == 0xEFBFBD):
             self.ERROR = "UTF-8 of U+FFFD (Replacement Character)"
-            return charInfo
-
-        self.NAME = unicodedata.name(self.c, None)
-        if (not self.NAME):  # Includes private use chars.
-            self.ERROR = "Cannot find name for U+%05x." % (n)
-            self.NAME = "[???]"
-
-        self.SCRIPTNAME = myCodepoint2script(n)
-        self.BLOCKNAME = myCodepoint2block(n)
-
-        self.NUMVAL = unicodedata.numeric(self.c, None)
-        self.CATEGORYABBR = unicodedata.category(self.c)
-        self.CATEGORYNAME = None
-        if (self.CATEGORYNAME in unicodeCategories):
-            self.CATEGORYNAME = unicodeCategories[self.CATEGORYNAME][1]
-
-        # Alternate forms
-        buf = "\\x"
-        myBytes = self.c.encode("utf-8")
-        for b in myBytes: buf += "%02x" % (b)
-        self.UTF = buf
-        self.URI = urlquote(self.c.encode("utf-8"))
-        self.HEXENTITY = "&#x%05x;" % (n)
-        self.DECENTITY = "&#%d;" % (n)
-        #print("type: %s" % (type(codepoint2name)))
-        if (n in codepoint2name):
-            self.NAMEDENTITY = "  &%s;" % (codepoint2name[n])
-        else:
-            self.NAMEDENTITY = None
-
-        # Properties
-        #
-        # TODO: Add XIDENTSTART, XIDENTCONTINUE
-        self.ISFPI = CharDisplay.okInFPI(self.n)
-        self.ISURI = CharDisplay.okInURI(self.n)
-        self.ISBIDI = unicodedata.bidirectional(self.c)
-        self.COMBINING = unicodedata.combining(self.c)
-        self.EAWIDTH = unicodedata.east_asian_width(self.c)
-        self.ISMIRROR = unicodedata.mirrored(self.c)
-        # TODO: Add MIRROROF
-
-        self.DECOMP = unicodedata.decomposition(self.c)
-        self.NFC = unicodedata.normalize("NFC",  self.c)
-        self.NFKC = unicodedata.normalize("NFKC", self.c)
-        self.NFD = unicodedata.normalize("NFD",  self.c)
-        self.NFKD = unicodedata.normalize("NFKD", self.c)
+            return self
 
-        return charInfo
+        for k in CharInfo.__computers__:
+            getattr(self, k)
+        return self
 
 
 ###############################################################################
@@ -923,6 +647,60 @@ for k0, v0 in __mnemonicMap__.items():
             (v0, iiLen))
     __name2mnemonic__[v0] = k0
 
+
+###############################################################################
+# The field registry: maps each field name, and each mnemonic, straight to
+# a (name, accessor, cheap) triple, so codePointToDatum() is one lookup.
+# An accessor takes a CharInfo and returns the value. "cheap" fields are
+# calculated from a fresh CharInfo rather than going through the cache.
+#
+__fieldRegistry__ = {}
+
+def registerField(name:str, accessor=None, mnemonic:str=None,
+    info:Tuple=None) -> None:
+    """Add (or replace) a field that can be used in strfchr() formats.
+    @param name: The long name, as used in "%{name}".
+    @param accessor: Function to get the value from a CharInfo. Default:
+        the CharInfo attribute of the same name.
+    @param mnemonic: Optional single character, as used in "%x".
+    @param info: (P/F, calc, Seb, type, example) as in CharInfo.__infoItems__.
+        Required if the name isn't already there.
+    """
+    if (info is not None):
+        if (len(info) != 5):
+            raise KeyError("Field '%s': info must have 5 items, not %d." %
+                (name, len(info)))
+        CharInfo.__infoItems__[name] = info
+    elif (name not in CharInfo.__infoItems__):
+        raise KeyError("Field '%s' is not in __infoItems__; pass info." % (name))
+    if (mnemonic and __mnemonicMap__.get(mnemonic, name) != name):
+        raise KeyError("Mnemonic '%s' is already used for '%s'." %
+            (mnemonic, __mnemonicMap__[mnemonic]))
+    if (accessor is None): accessor = attrgetter(name)
+
+    entry = (name, accessor, CharInfo.isCheap(name))
+    __fieldRegistry__[name] = entry
+    if (mnemonic):
+        __mnemonicMap__[mnemonic] = name
+        __name2mnemonic__[name] = mnemonic
+        __fieldRegistry__[mnemonic] = entry
+
+def lookupField(what:str) -> Tuple:
+    """Get the (name, accessor, cheap) entry for a field name or mnemonic.
+    """
+    try:
+        return __fieldRegistry__[what]
+    except KeyError as e:
+        raise KeyError("Unknown datum code '%s'." % (what)) from e
+
+for k0 in list(CharInfo.__infoItems__.keys()):
+    registerField(k0, mnemonic=__name2mnemonic__.get(k0))
+registerField("TEX", lambda cinfo: getTexEquivalent(cinfo.n),
+    info=( F, X, 0, str, "{\\^a}" ))
+registerField("WIDTH", lambda cinfo: getCharWidth(cinfo.n))
+registerField("FOLD", lambda cinfo: getCaseFold(cinfo.n),
+    info=( P, X, 0, str, "ss" ))
+
 # Selected Unicode combining chars
 # https://github.com/sderose/Charsets/Unicode/asPython/blob/master/combining.py
 #
@@ -1096,136 +874,368 @@ def entityToTex(eref:str) -> str:
 def strfchr(n, fmt:str) -> str:
     """Make something from a character or code point, kind of like strftime().
     Replace instances of %x, %%, and %{name} with the right data.
+    The format is only parsed the first time it is seen (see compileFormat()).
     """
-    if (isinstance(n, str)): n = ord(n[0])
-    cmapper = partial(mapperFunc, theCodepoint=n)
-    return re.sub(r"%({[^}]+}|.)", cmapper, fmt)
+    return compileFormat(fmt).render(n)
 
-def mapperFunc(mat, theCodepoint:int) -> str:
-    fmtCode = mat.group(1)
-    if (fmtCode == "%"): return "%"
-    try:
-        val = codePointToDatum(theCodepoint, what=fmtCode)
-    except KeyError as e:
-        lg.critical("KeyError for code point 0x%04x: %s" % (theCodepoint, e))
-        sys.exit()
-    return val
+class CompiledFormat:
+    """A strfchr() format string, parsed once into a list of pieces.
+    Each piece is either a literal string, or an accessor that takes a
+    code point and returns the field's value. Adjacent literals (including
+    the "%" from "%%") are merged, so rendering is just a walk of the list.
+    """
+    fieldExpr = re.compile(r"%({[^}]+}|.)")
+
+    def __init__(self, fmt:str):
+        self.fmt = fmt
+        self.pieces = []
+        self.fieldNames = []
+        self.fieldAt = {}  # Index in pieces -> field name
+        lastEnd = 0
+        for mat in re.finditer(CompiledFormat.fieldExpr, fmt):
+            self.addLiteral(fmt[lastEnd:mat.start()])
+            lastEnd = mat.end()
+            fmtCode = mat.group(1)
+            if (fmtCode == "%"):
+                self.addLiteral("%")
+                continue
+            if (fmtCode.startswith("{")): fmtCode = fmtCode[1:-1]
+            fmtCode = lookupField(fmtCode)[0]
+            self.fieldNames.append(fmtCode)
+            self.fieldAt[len(self.pieces)] = fmtCode
+            self.pieces.append(makeDatumGetter(fmtCode))
+        self.addLiteral(fmt[lastEnd:])
+
+    def addLiteral(self, s:str) -> None:
+        if (not s): return
+        if (self.pieces and isinstance(self.pieces[-1], str)):
+            self.pieces[-1] += s
+        else:
+            self.pieces.append(s)
+
+    def render(self, n, pieces:list=None) -> str:
+        """Apply the format to one character or code point.
+        """
+        if (isinstance(n, str)): n = ord(n[0])
+        if (pieces is None): pieces = self.pieces
+        buf = []
+        try:
+            for piece in pieces:
+                if (isinstance(piece, str)):
+                    buf.append(piece)
+                else:
+                    val = piece(n)
+                    buf.append(val if isinstance(val, str) else str(val))
+        except KeyError as e:
+            lg.critical("KeyError for code point 0x%04x: %s" % (n, e))
+            sys.exit()
+        return "".join(buf)
+
+    def renderRange(self, first:int, end:int, ofh=None,
+        batchSize:int=4096) -> int:
+        """Apply the format to each code point from first up to (but not
+        including) end, writing one line each to ofh (default: stdout).
+        Lines are written in batches, so ofh should be well buffered.
+        Fields that are constant across an aligned run of code points
+        (see __runFields__) are only looked up once per run.
+        Returns the number of lines written.
+        """
+        if (ofh is None): ofh = sys.stdout
+        pieces = self.runPieces()
+        nDone = 0
+        buf = []
+        for n in range(first, end):
+            buf.append(self.render(n, pieces))
+            if (len(buf) >= batchSize):
+                buf.append("")
+                ofh.write("\n".join(buf))
+                nDone += len(buf) - 1
+                buf = []
+        if (buf):
+            buf.append("")
+            ofh.write("\n".join(buf))
+            nDone += len(buf) - 1
+        return nDone
+
+    def runPieces(self) -> list:
+        """Return a copy of the pieces, with accessors for fields that are
+        constant across runs of code points (see __runFields__) wrapped in
+        a RunMemo, for rendering consecutive code points.
+        """
+        pieces = self.pieces.copy()
+        for i, name in self.fieldAt.items():
+            if (name in __runFields__):
+                pieces[i] = RunMemo(pieces[i], __runFields__[name])
+        return pieces
+
+    def renderStream(self, ifh, ofh=None, chunkSize:int=1<<16,
+        maxMemo:int=1<<16) -> int:
+        """Read text from ifh in chunks of chunkSize characters, and write
+        a line for each character to ofh (default: stdout), giving its column
+        within its line, code point, literal, and this format applied to it.
+        The latter parts are kept for each distinct code point seen (up to
+        maxMemo of them), so repeated characters are only rendered once.
+        Output is flushed after each chunk, so this works in a pipeline.
+        Returns the number of characters processed.
+        """
+        if (ofh is None): ofh = sys.stdout
+        memo = {}
+        nDone = 0
+        col = 0
+        while (True):
+            chunk = ifh.read(chunkSize)
+            if (not chunk): break
+            buf = []
+            for c in chunk:
+                try:
+                    rendered = memo[c]
+                except KeyError:
+                    if (len(memo) >= maxMemo): memo.clear()
+                    n = ord(c)
+                    rendered = memo[c] = "U+%04x '%s': %s" % (
+                        n, c, self.render(n))
+                buf.append("  %2d: %s\n" % (col, rendered))
+                col = 0 if (c == "\n") else col + 1
+            ofh.write("".join(buf))
+            ofh.flush()
+            nDone += len(chunk)
+        return nDone
+
+# Fields whose value cannot change within an aligned run of code points,
+# with the number of low-order bits that vary within the run. Unicode
+# blocks always start and end on multiples of 16.
+#
+__runFields__ = {
+    "PLANENUMBER":  16,
+    "PLANENAME":    16,
+    "BLOCKNAME":     4,
+}
+
+class RunMemo:
+    """Wrap a field accessor so it is only called again when the code point
+    moves into a different run (as given by its high-order bits).
+    """
+    def __init__(self, accessor, shift:int):
+        self.accessor = accessor
+        self.shift = shift
+        self.lastRun = None
+        self.lastVal = None
+
+    def __call__(self, n:int):
+        run = n >> self.shift
+        if (run != self.lastRun):
+            self.lastVal = self.accessor(n)
+            self.lastRun = run
+        return self.lastVal
+
+__formatCache__ = {}
+
+def compileFormat(fmt:str) -> CompiledFormat:
+    """Parse a strfchr() format string into a reusable CompiledFormat.
+    Formats are kept, so repeated calls with the same string are cheap.
+    """
+    if (fmt not in __formatCache__):
+        __formatCache__[fmt] = CompiledFormat(fmt)
+    return __formatCache__[fmt]
 
 
 ###############################################################################
+# Export tables covering (ranges of) the whole codespace, one row per code
+# point, with one column per field in a format. The range is cut into
+# shards, which can be rendered in parallel (each worker process keeps its
+# own caches); they are always written in order, so the output is the same
+# no matter how many jobs are used.
 #
-__cinfoCache__ = {}
+EXPORT_FORMATS = [ "ndjson", "csv", "tsv" ]
+MAX_CP = 0x110000
+
+def exportShard(fmt:str, first:int, end:int, outFormat:str="ndjson",
+    filters:List[Tuple[str, str]]=None) -> Tuple[str, int]:
+    """Render code points from first up to (not including) end, as rows of
+    the fields in `fmt` (its literal parts are ignored). If `filters` are
+    given, only code points where each (field, value) matches are included.
+    Returns the text and the number of rows.
+    """
+    cfmt = compileFormat(fmt)
+    pieces = cfmt.runPieces()
+    names = [ cfmt.fieldAt[i] for i in sorted(cfmt.fieldAt) ]
+    getters = [ pieces[i] for i in sorted(cfmt.fieldAt) ]
+    tests = [ (makeDatumGetter(name), value) for name, value in (filters or []) ]
+
+    buf = io.StringIO()
+    if (outFormat != "ndjson"):
+        writer = csv.writer(buf, delimiter="\t" if outFormat == "tsv" else ",",
+            lineterminator="\n")
+    nRows = 0
+    for n in range(first, end):
+        if (tests and not all(str(get(n)) == value for get, value in tests)):
+            continue
+        vals = [ get(n) for get in getters ]
+        if (outFormat == "ndjson"):
+            buf.write(json.dumps({ name: (val if isinstance(val,
+                (str, int, float, bool, type(None))) else str(val))
+                for name, val in zip(names, vals) }, ensure_ascii=False))
+            buf.write("\n")
+        else:
+            writer.writerow([ "" if val is None else str(val) for val in vals ])
+        nRows += 1
+    return buf.getvalue(), nRows
+
+def exportShardStar(shardArgs:Tuple) -> Tuple[str, int]:
+    return exportShard(*shardArgs)
+
+def exportRange(fmt:str, first:int=0, end:int=MAX_CP, ofh=None,
+    outFormat:str="ndjson", filters:List[Tuple[str, str]]=None,
+    jobs:int=1, shardSize:int=0x1000) -> int:
+    """Write a table of the fields in `fmt` for code points from first up to
+    (not including) end, to ofh (default: stdout), as NDJSON (one object per
+    line), CSV, or TSV (these two with a header row of field names).
+    With jobs > 1, shards of shardSize code points are rendered in a pool
+    of that many processes. Returns the number of rows written.
+    """
+    if (outFormat not in EXPORT_FORMATS):
+        raise KeyError("Unknown export format '%s' (use one of %s)." %
+            (outFormat, EXPORT_FORMATS))
+    if (ofh is None): ofh = sys.stdout
+    cfmt = compileFormat(fmt)  # Reports bad fields before any work is done
+    for f in (filters or []):
+        if (len(f) != 2):
+            raise KeyError("Filter %s is not a (field, value) pair." % (repr(f)))
+        lookupField(f[0])
+
+    if (outFormat != "ndjson"):
+        csv.writer(ofh, delimiter="\t" if outFormat == "tsv" else ",",
+            lineterminator="\n").writerow(
+            [ cfmt.fieldAt[i] for i in sorted(cfmt.fieldAt) ])
+    shards = [ (fmt, s, min(s + shardSize, end), outFormat, filters)
+        for s in range(first, end, shardSize) ]
+    nRows = 0
+    if (jobs <= 1 or len(shards) <= 1):
+        results = map(exportShardStar, shards)
+        for text, n in results:
+            ofh.write(text)
+            nRows += n
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            for text, n in pool.map(exportShardStar, shards):
+                ofh.write(text)
+                nRows += n
+    return nRows
+
+
+###############################################################################
+#
+class CharInfoCache:
+    """Keep per-code-point CharInfo objects for re-use, up to
+    maxSize entries, discarding the least-recently-used ones beyond that
+    (maxSize <= 0 means no limit). Counts hits, misses, and evictions,
+    which can be retrieved via getStats().
+    """
+    def __init__(self, maxSize:int=8192, loader=None):
+        self.maxSize = maxSize
+        self.loader = loader or CharInfo
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __contains__(self, codePoint:int) -> bool:
+        return codePoint in self.entries
+
+    def __getitem__(self, codePoint:int):
+        try:
+            cinfo = self.entries[codePoint]
+        except KeyError:
+            self.misses += 1
+            cinfo = self.entries[codePoint] = self.loader(codePoint)
+            self.trim()
+            return cinfo
+        self.hits += 1
+        self.entries.move_to_end(codePoint)
+        return cinfo
+
+    def trim(self) -> None:
+        if (self.maxSize <= 0): return
+        while (len(self.entries) > self.maxSize):
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def setMaxSize(self, maxSize:int) -> None:
+        self.maxSize = maxSize
+        self.trim()
+
+    def clear(self) -> None:
+        self.entries.clear()
+        self.hits = self.misses = self.evictions = 0
+
+    def prewarm(self, first:int, end:int) -> int:
+        """Load the code points from first up to (not including) end, unless
+        already present. Doesn't count as hits or misses. Returns the number
+        of entries loaded.
+        """
+        if (self.maxSize > 0): end = min(end, first + self.maxSize)
+        nLoaded = 0
+        for n in range(first, end):
+            if (n in self.entries): continue
+            self.entries[n] = self.loader(n)
+            nLoaded += 1
+        self.trim()
+        return nLoaded
+
+    def prewarmBlock(self, codePoint:int) -> int:
+        """Load the whole Unicode block that contains the given code point.
+        """
+        first, end = blockRange(codePoint)
+        return self.prewarm(first, end)
+
+    def getStats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            "size":      len(self.entries),
+            "maxSize":   self.maxSize,
+            "hits":      self.hits,
+            "misses":    self.misses,
+            "evictions": self.evictions,
+            "hitRate":   (self.hits / lookups) if lookups else 0.0,
+        }
+
+def blockRange(codePoint:int) -> Tuple[int, int]:
+    """Return the first code point of the block containing codePoint, and
+    the code point just after it. Blocks start and end on multiples of 16.
+    """
+    bname = myCodepoint2block(codePoint)
+    first = codePoint & ~0xF
+    while (first > 0 and myCodepoint2block(first - 16) == bname):
+        first -= 16
+    end = (codePoint | 0xF) + 1
+    while (end < 0x110000 and myCodepoint2block(end) == bname):
+        end += 16
+    return first, end
+
+# Shared by everything that goes through strfchr() or codePointToDatum().
+__cinfoCache__ = CharInfoCache()
 
 def codePointToDatum(codePoint:int, what:str) -> str:
     """Given a character's code point, and what mnemonic or named
     form/property you want, get that value.
     """
-    if (codePoint in __cinfoCache__):
-        cinfo = __cinfoCache__[codePoint]
-    else:
-        cinfo = __cinfoCache__[codePoint] = getCharInfo(codePoint)
-
-    # Allow mnemonics
-    if (what in __mnemonicMap__): what = __mnemonicMap__[what]
-
-    if (what == "LITERAL"):                # ...
-        return chr(codePoint)
-
-    elif (what == "SLASH0"):               # \\x{e2}
-        return "\\x{%x}" % (codePoint)
-    elif (what == "SLASH2"):               # \\xe2
-        if (codePoint <= 0xFF): return "\\x%02x" % (codePoint)
-        return codePoint
-    elif (what == "SLASH4"):               # \\u00e2
-        if (codePoint <= 0xFFFF): return "\\u%04x" % (codePoint)
-        return getFallback(codePoint)
-    elif (what == "SLASH8"):               # \\U000000e2
-        return "\\U%08x" % (codePoint)
-
-    elif (what == "DECENTITY"):            # &#226;
-        return "&#%4d;" % (codePoint)
-    elif (what == "HEXENTITY"):            # &#xe2;
-        return "&#x%04x;" % (codePoint)
-    elif (what == "NAMEDENTITY"):          # &acirc;
-        nam = cinfo["NAMEDENTITY"]
-        if (nam): return nam
-        return getFallback(codePoint)
-    elif (what == "BININT"):               # 0342
-        assert False, "binary decoding not yet supported."
-        #if   (codePoint <= 0xFF): return "%08b" % (codePoint)
-        #elif (codePoint <= 0xFFFF): return "%016b" % (codePoint)
-        #return "%020b" % (codePoint)
-    elif (what == "OCTINT"):               # 0342
-        return "%o" % (codePoint)
-    elif (what == "DECINT"):               # 226
-        return "%d" % (codePoint)
-    elif (what == "HEXINT"):               # 0x00e2
-        return "0x%04x" % (codePoint)
-
-    elif (what == "UNAME"):                # LATIN SMALL LETTER A WITH CIRCUMFLEX
-        return cinfo["name"]
-    elif (what == "UNORM"):                # LATIN_SMALL_LETTER_A_WITH_CIRCUMFLEX
-        return cinfo["name"].replace(" ", "_")
-    elif (what == "UPLUS"):                # U+00E2
-        return "U+%04x" % (codePoint)
-
-    elif (what == "UTF8"):                 # \\xc3\\xa2
-        return cinfo["utf8"]
-    elif (what == "TEX"):                  # {\\^a} # TODO
-        return getTexEquivalent(codePoint)
-    elif (what == "URI"):                  # %c3%a2
-        return cinfo["URI"]
-
-    # On to non-representations (properties)
-    #
-    elif (what == "BLOCKNAME"):        # "General Punctuation" ),
-        return cinfo["BLOCKNAME"]
-    elif (what == "CATEGORYABBR"):     # "Po" ),
-        return cinfo["CATEGORYABBR"]
-    elif (what == "CATEGORYNAME"):     # "Punctuation, Other" ),
-        return cinfo["CATEGORYNAME"]
-    elif (what == "PLANENUMBER"):      # "0" ),
-        return cinfo["PLANENUMBER"]
-    elif (what == "PLANENAME"):        # "Basic Multilingual" ),
-        return cinfo["PLANENAME"]
-    elif (what == "SCRIPTNAME"):       # "Common" ),
-        return cinfo["SCRIPTNAME"]
-
-    elif (what == "EAWIDTH"):          # "A" ),
-        return cinfo["EAWIDTH"]
-    elif (what == "WIDTH"):            # "" ),
-        return cinfo["WIDTH"]
-    elif (what == "NUMERICVALUE"):     # "" ),
-        return cinfo["NUMERICVALUE"]
-
-    elif (what == "ISNUMERIC"):        # "NO" ),
-        return cinfo["ISNUMERIC"]
-    elif (what == "ISBIDI"):           # "NO" ),
-        return cinfo["ISBIDI"]
-    elif (what == "ISCOMBINING"):      # "NO" ),
-        return cinfo["ISCOMBINING"]
-    elif (what == "ISCOMBINED"):       # "YES" ),
-        return cinfo["ISCOMBINED"]
-    elif (what == "ISURI"):            # "NO" ),
-        return cinfo["ISURI"]
-    elif (what == "ISMIRROR"):         # "NO" ),
-        return cinfo["ISMIRROR"]
-    elif (what == "MIRROROF"):         # "NO" ),
-        return cinfo["MIRROROF"]
-
-    elif (what == "DECOMP"):           # ... ),
-        return cinfo["DECOMP"]
-    elif (what == "NFC"):              # ... ),
-        return cinfo["NFC"]
-    elif (what == "NFD"):              # ... ),
-        return cinfo["NFD"]
-    elif (what == "NFKC"):             # ... ),
-        return cinfo["NFKC"]
-    elif (what == "NFKD"):             # ... ),
-        return cinfo["NFKD"]
+    _name, accessor, cheap = lookupField(what)
 
-    else:
-        raise KeyError("Unknown datum code '%s'." % (what))
+    # Cheap fields don't need (or merit) the cache; others are only
+    # calculated when first asked for, then kept in the cached CharInfo.
+    if (cheap): return accessor(CharInfo(codePoint))
+    return accessor(__cinfoCache__[codePoint])
+
+def makeDatumGetter(what:str):
+    """Resolve a field once, and return a function that gets its value
+    for any code point (for use by CompiledFormat).
+    """
+    _name, accessor, cheap = lookupField(what)
+    if (cheap): return lambda n: accessor(CharInfo(n))
+    return lambda n: accessor(__cinfoCache__[n])
 
 def getFallback(codePoint:int):
     # TODO Make an option for what to use here
@@ -1234,23 +1244,48 @@ def getFallback(codePoint:int):
 
 ###############################################################################
 #
-def getTexEquivalent(codePoint:int):  # TODO: Finish, move to html2latex.py
-    return "\\x{%04x}" % (codePoint)
+__texEncoder__ = None
+
+def getTexEquivalent(codePoint:int):
+    """Get the LaTeX for a character, via unicodeToTex.py (which merges the
+    `charInfo` list below, unicode.xml, and accent decompositions).
+    Characters with no LaTeX form come back as "\\x{...}".
+    """
+    global __texEncoder__
+    if (__texEncoder__ is None):
+        from unicodeToTex import TexEncoder
+        __texEncoder__ = TexEncoder(unknown="hex")
+    return __texEncoder__.texFor(codePoint)
+
+def getCharWidth(codePoint:int) -> int:
+    """Get the number of terminal columns a character takes (0, 1, or 2),
+    via displayWidth.py.
+    """
+    from displayWidth import getDisplayWidth
+    return getDisplayWidth().charWidth(codePoint)
+
+def getCaseFold(codePoint:int) -> str:
+    """Get the (full) case folding of a character, via caseFold.py.
+    """
+    from caseFold import getCaseFolder
+    return getCaseFolder().fold(chr(codePoint))
 
 # Following started from utf8tobibtex.py
+# The patterns are regexes (each for a single character); the replacements
+# are the literal LaTeX (not re.sub() templates).
 #
 charInfo = [
-    ( r"\\", r"{\\textbackslash}" ),
+    ( r"\\", r"{\textbackslash}" ),
     ( r"&", r"\&" ),
     ( r"#", r"\#" ),
     ( r"%", r"\%" ),
-    ( r"\$", r"\\\$" ),
+    ( r"\$", r"\$" ),
     ( r"~", r"\~{}" ),
-    ( r"<", r"{\\textless}" ),
-    ( r">", r"{\\textgreater}" ),
+    ( r"<", r"{\textless}" ),
+    ( r">", r"{\textgreater}" ),
     ( r"_", r"\_" ),
-    ( r"\^", r"\\\^{}" ),
-    ( r"\|", r"{\\textbar}" ),
+    ( r"\^", r"\^{}" ),
+    ( r"\|", r"{\textbar}" ),
     ( r'"', r"{\dq}" ), # Needs the babel package
     ( r"£", r"{\pounds}" ),
     ( r"©", r"{\copyright}" ),
@@ -1270,7 +1305,7 @@ charInfo = [
     ( r"Ł", r"{\L}" ),
     ( r"ł", r"{\l}" ),
     ( r"Ŋ", r"{\NG}" ),
-    ( r"ŋ", r"{\\ng}" ),
+    ( r"ŋ", r"{\ng}" ),
     ( r"Ø", r"{\O}" ),
     ( r"ø", r"{\o}" ),
     ( r"Œ", r"{\OE}" ),
@@ -1278,7 +1313,7 @@ charInfo = [
     ( r"ẞ", r"{\SS}" ),
     ( r"ß", r"{\ss}" ),
     ( r"Þ", r"{\TH}" ),
-    ( r"þ", r"{\\th}" ),
+    ( r"þ", r"{\th}" ),
  ]
 
 def showCodes():
@@ -1287,6 +1322,7 @@ def showCodes():
     Seb: In Sebastian Rahtz's db?    Type: datatype of value\n""")
     print("  code:  name             P/F Calc Seb  Type  Example")
     for k, v in CharInfo.__infoItems__.items():
+        if (k not in __fieldRegistry__): continue
         try:
             mn = "%" + __name2mnemonic__[k]
         except KeyError:
@@ -1314,6 +1350,23 @@ if __name__ == "__main__":
         except ImportError:
             parser = argparse.ArgumentParser(description=descr)
 
+        parser.add_argument(
+            "--cacheSize", type=anyInt, metavar="N", default=8192,
+            help="Keep info for at most this many code points (0: no limit).")
+        parser.add_argument(
+            "--cacheStats", action="store_true",
+            help="At the end, report character-info cache statistics.")
+        parser.add_argument(
+            "--chunkSize", type=anyInt, metavar="N", default=1<<16,
+            help="When reading stdin, read this many characters at a time.")
+        parser.add_argument(
+            "--export", type=str, metavar="F", choices=EXPORT_FORMATS,
+            help="Write a table (%s) of the fields in --format, for --min "
+            "to --max (default: the whole codespace)." % (", ".join(EXPORT_FORMATS)))
+        parser.add_argument(
+            "--filter", type=str, metavar="FIELD=V", action="append",
+            help="With --export, only include code points where the field "
+            "has this value (repeatable).")
         parser.add_argument(
             "--format", "-f", type=str, metavar="F", default=DFT_FORMAT,
             help="Specify what to print, using %%_ and/or %%{___} codes.")
@@ -1323,6 +1376,9 @@ if __name__ == "__main__":
         parser.add_argument(
             "--iencoding", type=str, metavar="E", default="utf-8",
             help="Assume this character coding for input. Default: utf-8.")
+        parser.add_argument(
+            "--jobs", "-j", type=anyInt, metavar="N", default=os.cpu_count() or 1,
+            help="With --export, render in this many processes.")
         parser.add_argument(
             "--max", type=anyInt, metavar="N",
             help="If this and --min are set, show codepoints in that range.")
@@ -1362,22 +1418,54 @@ if __name__ == "__main__":
         showCodes()
         sys.exit()
 
-    if (args.min and args.max):
-        for n0 in range(args.min, args.max):
-            print(strfchr(n0, fmt=args.format))
+    __cinfoCache__.setMaxSize(args.cacheSize)
+    if (args.cacheStats):
+        import atexit
+        atexit.register(lambda: sys.stderr.write(
+            "Cache: %s\n" % (__cinfoCache__.getStats())))
+
+    try:
+        cfmt = compileFormat(args.format)
+    except KeyError as e0:
+        lg.critical("Bad --format '%s': %s" % (args.format, e0))
+        sys.exit()
+
+    ofh0 = open(sys.stdout.fileno(), "w", encoding="utf-8",
+        errors="backslashreplace", buffering=1<<20, closefd=False)
+
+    if (args.export):
+        for f0 in (args.filter or []):
+            if ("=" not in f0):
+                lg.critical("Bad --filter '%s' (use FIELD=VALUE)." % (f0))
+                sys.exit(1)
+        filters0 = [ tuple(f.split("=", 1)) for f in (args.filter or []) ]
+        try:
+            exportRange(args.format,
+                0 if args.min is None else args.min,
+                MAX_CP if args.max is None else args.max,
+                ofh0, outFormat=args.export, filters=filters0, jobs=args.jobs)
+        except KeyError as e0:
+            lg.critical("Bad --filter: %s" % (e0))
+        ofh0.close()
+        sys.exit()
+
+    if (args.min is not None and args.max is not None):
+        cfmt.renderRange(args.min, args.max, ofh0)
+        ofh0.close()
         sys.exit()
 
     if (args.codePoints):
         for n0 in args.codePoints:
             if (len(n0)==1): n0 = ord(n0)
             else: n0 = int(n0, 0)
-            print(strfchr(n0, fmt=args.format))
+            ofh0.write(cfmt.render(n0) + "\n")
+        ofh0.close()
         sys.exit()
 
     if (sys.stdin.isatty()):
         print("Format string in effect is: %s" % (args.format))
         print("Enter some text (^D to exit)...")
-    for rec0 in sys.stdin.readlines():
-        for i0, c0 in enumerate(rec0):
-            n0 = ord(c0)
-            print("  %2d: U+%04x '%s': %s" % (i0, n0, c0, strfchr(n0, fmt=args.format)))
+        args.chunkSize = 1  # So each line shows up as it's typed.
+    ifh0 = codecs.getreader(args.iencoding)(sys.stdin.buffer)
+    cfmt.renderStream(ifh0, ofh0, chunkSize=args.chunkSize)
+    ofh0.close()
@@ -0,0 +1,348 @@
+#!/usr/bin/env python3
+#
+# unicodeToTex.py: Convert Unicode text to LaTeX, in one pass.
+# 2026-10-17: Written by Steven J. DeRose.
+#
+import sys
+import os
+import re
+import codecs
+import unicodedata
+from typing import Dict, IO
+import logging
+
+import strfchr
+from charDB import readUnicodeXml, DEFAULT_UNICODE_XML
+
+lg = logging.getLogger("unicodeToTex")
+
+__metadata__ = {
+    "title"        : "unicodeToTex",
+    "description"  : "Convert Unicode text to LaTeX, in one pass.",
+    "rightsHolder" : "Steven J. DeRose",
+    "creator"      : "http://viaf.org/viaf/50334488",
+    "type"         : "http://purl.org/dc/dcmitype/Software",
+    "language"     : "Python 3.7",
+    "created"      : "2026-10-17",
+    "modified"     : "2026-10-17",
+    "publisher"    : "http://github.com/sderose",
+    "license"      : "https://creativecommons.org/licenses/by-sa/3.0/"
+}
+__version__ = __metadata__["modified"]
+
+descr = """
+=Name=
+
+unicodeToTex: Convert Unicode text to LaTeX, in one pass.
+
+
+=Description=
+
+Convert a whole document (say, a large bibliography) so that special
+characters are expressed as LaTeX:
+
+    unicodeToTex.py refs.txt > refs.bib
+
+All the sources of mappings are merged, once, into a single table indexed
+by code point, and the text is then converted with `str.translate()`, a
+chunk at a time (see `--chunkSize`). So the time is linear in the size of
+the input, no matter how many mappings there are. The mappings come from
+(earliest first, which win over later ones):
+
+* The `charInfo` list in `strfchr.py` (TeX specials such as "&" and "%",
+and letters such as "ß" or "Ø").
+
+* The "latex" form of each character in Sebastian Rahtz et al's
+`unicode.xml` (see `charNameConvert.py`), or its "mathlatex" form (put in
+"$...$") if it has no "latex" one. This is read from `--unicodeXml`
+(default: `~/.strfchr/unicode.xml`), if it's there.
+
+* For anything else, its canonical decomposition (NFD): a letter plus
+accents that TeX has commands for (`strfchr.py`'s `__texDiacritics__`
+and `__unicodeCombining__`) becomes like `{\\'{e}}`. These are only worked
+out for characters actually seen (and then kept).
+
+* Characters still left over are copied as-is (for XeLaTeX or LuaLaTeX),
+or written as `\\char"XXXX` or `\\x{XXXX}` (see `--unknown`).
+
+With `--noSpecials`, the ASCII characters are left alone (for input that
+already contains TeX markup). By default the input is first NFC-normalized,
+so decomposed accents are found; a chunk is never split inside a combining
+sequence.
+
+
+=Related Commands=
+
+`strfchr.py` (whose TEX field, "%{TEX}", uses this), `charNameConvert.py`.
+
+
+=Known bugs and Limitations=
+
+A combining accent with no base character before it (say, at the start
+of the input) goes on an empty group, like `\\'{}`.
+
+Accents on "i" and "j" use the letter itself, not `\\i` or `\\j`.
+
+Math-only characters are put in separate "$...$", even when adjacent.
+
+
+=History=
+
+* 2026-10-17: Written by Steven J. DeRose. Take `charInfo` replacements
+literally. Put accents that NFC can't compose on their base character (even if
+that is itself accented).
+
+
+=Rights=
+
+Copyright 2026-10-17 by Steven J. DeRose. This work is licensed under a
+Creative Commons Attribution-Share-alike 3.0 unported license.
+See [http://creativecommons.org/licenses/by-sa/3.0/] for more information.
+
+For the most recent version, see [http://www.derose.net/steve/utilities]
+or [https://github.com/sderose].
+
+
+=Options=
+"""
+
+verbose = 0
+def log(lvl:int, msg:str) -> None:
+    if (verbose >= lvl): sys.stderr.write(msg+"\n")
+
+UNKNOWN_FORMATS = {
+    "keep":     None,
+    "char":     "\\char\"%04X{}",
+    "hex":      "\\x{%04x}",
+}
+
+def charInfoTable() -> Dict[int, str]:
+    """Turn strfchr's `charInfo` list of (regex, replacement) pairs into a
+    dict from code point to replacement. The patterns are all single
+    (sometimes escaped) characters; the replacements are literal LaTeX.
+    """
+    table = {}
+    for pat, repl in strfchr.charInfo:
+        c = pat[1:] if pat.startswith("\\") else pat
+        assert len(c) == 1, "Unexpected charInfo pattern '%s'." % (pat)
+        table[ord(c)] = repl
+    return table
+
+def accentCommands() -> Dict[str, str]:
+    """Map each combining character that TeX has an accent command for, to
+    the command's name (like "'" or "u").
+    """
+    accents = {}
+    for cp, (tex, _name) in strfchr.__unicodeCombining__.items():
+        accents[chr(cp)] = tex[1:]
+    for td in strfchr.__texDiacritics__:
+        accents[td[2]] = td[3].strip().lstrip("\\")
+    return accents
+
+def braceCommand(tex:str) -> str:
+    """Protect a command that ends in a letter (like "\\textbullet") from
+    swallowing a following letter.
+    """
+    if (re.match(r"\\[a-zA-Z]+$", tex)): return "{%s}" % (tex)
+    return tex
+
+
+###############################################################################
+#
+class TexTable(dict):
+    """A str.translate() table (code point -> replacement) that works out
+    the NFD fallback (or the --unknown form) for a character the first time
+    translate() asks for it, and keeps the answer.
+    """
+    def __init__(self, encoder:"TexEncoder", mappings:Dict[int, str]):
+        super().__init__(mappings)
+        self.encoder = encoder
+
+    def __missing__(self, cp:int) -> str:
+        val = self.encoder.fallbackFor(cp)
+        self[cp] = val
+        return val
+
+class TexEncoder:
+    def __init__(self, unicodeXmlPath:str=DEFAULT_UNICODE_XML,
+        asciiSpecials:bool=True, unknown:str="keep", normalize:bool=True):
+        if (unknown not in UNKNOWN_FORMATS):
+            raise KeyError("Unknown --unknown value '%s' (use one of %s)." %
+                (unknown, list(UNKNOWN_FORMATS.keys())))
+        self.unknownFormat = UNKNOWN_FORMATS[unknown]
+        self.normalize = normalize
+        self.accents = accentCommands()
+        # A character plus combining accents that NFC left separate.
+        self.accentSeqExpr = re.compile("(.)([%s]+)" %
+            ("".join(re.escape(c) for c in sorted(self.accents))))
+
+        mappings = {}
+        specials = charInfoTable()
+        # Bases that can carry a TeX accent: ASCII letters, and letters like
+        # "Ø" that have text-mode commands.
+        self.accentable = set(c for c in range(0x80) if chr(c).isalpha())
+        self.accentable.update(cp for cp in specials if cp >= 0x80)
+        if (unicodeXmlPath and os.path.exists(unicodeXmlPath)):
+            mathOnly = {}
+            for cp, kind, _eSet, value in readUnicodeXml(unicodeXmlPath):
+                if (cp < 0x80 or not value): continue
+                if (kind == "latex"): mappings.setdefault(cp, braceCommand(value))
+                elif (kind == "mathlatex"): mathOnly.setdefault(cp, "$%s$" % (value))
+            for cp, value in mathOnly.items():
+                mappings.setdefault(cp, value)
+            log(1, "Loaded %d LaTeX forms from '%s'." % (len(mappings), unicodeXmlPath))
+        for cp, value in specials.items():
+            if (cp < 0x80 and not asciiSpecials): continue
+            mappings[cp] = value
+        if (asciiSpecials is False):
+            for cp in range(0x80): mappings[cp] = chr(cp)
+        else:
+            for cp in range(0x80): mappings.setdefault(cp, chr(cp))
+        self.table = TexTable(self, mappings)
+
+    def fallbackFor(self, cp:int) -> str:
+        """Find a form for a character not in any of the lists: via its
+        decomposition if possible, otherwise per `unknown`.
+        """
+        c = chr(cp)
+        decomp = unicodedata.normalize("NFD", c)
+        if (decomp != c):
+            accented = self.accentedFor(decomp[0], decomp[1:])
+            if (accented is not None): return accented
+        if (c in self.accents):  # A lone combining character
+            return "\\%s{}" % (self.accents[c])
+        if (self.unknownFormat is None): return c
+        return self.unknownFormat % (cp)
+
+    def accentedFor(self, base:str, marks:str) -> str:
+        """Return the form for a base character with combining accents (like
+        `{\\'{e}}`), or None if the base can't take TeX accents or any of
+        the accents has no TeX command.
+        """
+        if (ord(base) not in self.accentable
+            or not all(d in self.accents for d in marks)): return None
+        inner = self.table[ord(base)]
+        for d in marks:
+            inner = "\\%s{%s}" % (self.accents[d], inner)
+        return "{%s}" % (inner)
+
+    def encodeAccentSeq(self, mat:re.Match) -> str:
+        """Handle a character followed by combining accents. The whole
+        sequence is decomposed, so that for a precomposed base (like "ę"
+        plus an acute), all the accents nest on the bare letter.
+        """
+        decomp = unicodedata.normalize("NFD", mat.group())
+        accented = self.accentedFor(decomp[0], decomp[1:])
+        if (accented is None): return mat.group().translate(self.table)
+        return accented
+
+    def texFor(self, cp:int) -> str:
+        return self.table[cp]
+
+    def encode(self, s:str) -> str:
+        """Convert a string. Any base character still followed by combining
+        accents (after NFC, if normalizing) gets them as TeX accents, rather
+        than the accents going on empty groups after it.
+        """
+        if (self.normalize): s = unicodedata.normalize("NFC", s)
+        if (not self.accentSeqExpr.search(s)): return s.translate(self.table)
+        parts = []
+        done = 0
+        for mat in self.accentSeqExpr.finditer(s):
+            parts.append(s[done:mat.start()].translate(self.table))
+            parts.append(self.encodeAccentSeq(mat))
+            done = mat.end()
+        parts.append(s[done:].translate(self.table))
+        return "".join(parts)
+
+    def encodeStream(self, ifh:IO, ofh:IO=None, chunkSize:int=1<<16) -> int:
+        """Read text from ifh a chunk at a time, and write it, converted, to
+        ofh (default: stdout). If normalizing, any combining characters at the
+        end of a chunk are held back for the next, so a sequence is never
+        split. Returns the number of characters read.
+        """
+        if (ofh is None): ofh = sys.stdout
+        nRead = 0
+        carry = ""
+        while (True):
+            chunk = ifh.read(chunkSize)
+            if (not chunk): break
+            nRead += len(chunk)
+            chunk = carry + chunk
+            carry = ""
+            if (self.normalize):
+                cut = len(chunk)
+                while (cut > 0 and unicodedata.combining(chunk[cut-1])): cut -= 1
+                if (cut > 0):
+                    chunk, carry = chunk[:cut-1], chunk[cut-1:]
+            ofh.write(self.encode(chunk))
+        if (carry): ofh.write(self.encode(carry))
+        return nRead
+
+
+###############################################################################
+# Main
+#
+if __name__ == "__main__":
+    import argparse
+
+    def processOptions() -> argparse.Namespace:
+        try:
+            from BlockFormatter import BlockFormatter
+            parser = argparse.ArgumentParser(
+                description=descr, formatter_class=BlockFormatter)
+        except ImportError:
+            parser = argparse.ArgumentParser(description=descr)
+
+        parser.add_argument(
+            "--chunkSize", type=int, metavar="N", default=1<<16,
+            help="Read this many characters at a time.")
+        parser.add_argument(
+            "--iencoding", type=str, metavar="E", default="utf-8",
+            help="Assume this character coding for input. Default: utf-8.")
+        parser.add_argument(
+            "--noNormalize", action="store_true",
+            help="Don't NFC-normalize the input first.")
+        parser.add_argument(
+            "--noSpecials", action="store_true",
+            help="Leave ASCII characters (like &, %%, and \\) alone.")
+        parser.add_argument(
+            "--quiet", "-q", action="store_true",
+            help="Suppress most messages.")
+        parser.add_argument(
+            "--unicodeXml", type=str, metavar="PATH", default=DEFAULT_UNICODE_XML,
+            help="Get LaTeX forms from here. Default: %s." % (DEFAULT_UNICODE_XML))
+        parser.add_argument(
+            "--unknown", type=str, choices=UNKNOWN_FORMATS.keys(), default="keep",
+            help="What to do with characters there's no LaTeX for.")
+        parser.add_argument(
+            "--verbose", "-v", action="count", default=0,
+            help="Add more messages (repeatable).")
+        parser.add_argument(
+            "--version", action="version", version=__version__,
+            help="Display version information, then exit.")
+
+        parser.add_argument(
+            "files", type=str, nargs=argparse.REMAINDER,
+            help="Path(s) to input file(s)")
+
+        args0 = parser.parse_args()
+        if (lg and args0.verbose):
+            logging.basicConfig(level=logging.INFO - args0.verbose)
+        return(args0)
+
+    args = processOptions()
+    verbose = args.verbose
+
+    encoder = TexEncoder(unicodeXmlPath=args.unicodeXml,
+        asciiSpecials=not args.noSpecials, unknown=args.unknown,
+        normalize=not args.noNormalize)
+    ofh0 = open(sys.stdout.fileno(), "w", encoding="utf-8", buffering=1<<20,
+        closefd=False)
+    if (not args.files):
+        encoder.encodeStream(codecs.getreader(args.iencoding)(sys.stdin.buffer),
+            ofh0, chunkSize=args.chunkSize)
+    for path0 in args.files:
+        with codecs.open(path0, "rb", encoding=args.iencoding) as ifh0:
+            encoder.encodeStream(ifh0, ofh0, chunkSize=args.chunkSize)
+    ofh0.close()
@@ -0,0 +1,493 @@
+#!/usr/bin/env python3
+#
+# wordBreak.py: Find word boundaries (UAX #29), for big texts and streams.
+# 2026-10-17: Written by Steven J. DeRose.
+#
+import sys
+import os
+import re
+import codecs
+import unicodedata
+from typing import Dict, IO, Iterator, List, Tuple
+import logging
+
+from UnicodeDBAccess import TwoStageTable
+from graphemeClusters import GraphemeSegmenter, roughGraphemeClass
+
+lg = logging.getLogger("wordBreak")
+
+__metadata__ = {
+    "title"        : "wordBreak",
+    "description"  : "Find word boundaries (UAX #29), for big texts and streams.",
+    "rightsHolder" : "Steven J. DeRose",
+    "creator"      : "http://viaf.org/viaf/50334488",
+    "type"         : "http://purl.org/dc/dcmitype/Software",
+    "language"     : "Python 3.7",
+    "created"      : "2026-10-17",
+    "modified"     : "2026-10-17",
+    "publisher"    : "http://github.com/sderose",
+    "license"      : "https://creativecommons.org/licenses/by-sa/3.0/"
+}
+__version__ = __metadata__["modified"]
+
+descr = """
+=Name=
+
+wordBreak: Find word boundaries (UAX #29), for big texts and streams.
+
+
+=Description=
+
+Split text into words the way the Unicode Word Boundaries algorithm
+[https://www.unicode.org/reports/tr29/] does, which (unlike splitting on
+spaces or `\\w+`) keeps "can't", "3.14", "e.g", "U.S.A", "foo_bar", and
+"カタカナ" (katakana) together, handles combining marks and format characters
+inside words, and keeps emoji ZWJ sequences and flags whole:
+
+    ws = WordSegmenter()
+    ws.boundaries("Don't panic, 3.14!")     # [ 5, 6, 11, 12, 13, 17, 18 ]
+    for start, end in ws.iterWords(s): ...  # Just the segments with letters
+                                            # or digits ("Don't", "panic", "3.14")
+
+Each character has a Word_Break class (the "WB" property: ALetter,
+Hebrew_Letter, Katakana, Numeric, MidLetter, MidNum, MidNumLet,
+Single_Quote, Double_Quote, ExtendNumLet, Extend, Format, ZWJ, WSegSpace,
+Regional_Indicator, CR, LF, Newline, or Other). As in `lineBreak.py`, the
+string is turned into a byte string of class codes with one
+`str.translate()`, and most decisions are a lookup in a flat pair table.
+
+The rules that look ahead (WB6, WB7b, and WB12: "a" × "." only if a letter
+follows) are done by a small state machine rather than regex backtracking:
+the break before a MidLetter (etc.) is held as "pending", and settled when
+the next (non-Extend/Format) character arrives. So each character is
+looked at once, and the time is linear in the length of the text. Runs of
+letters or digits, which can't have boundaries inside, are skipped over
+with one (non-backtracking) regex match.
+
+The classes come from, in order of preference:
+
+* `WordBreakProperty.txt` (see `--wbFile`; by default
+`~/.strfchr/ucd/WordBreakProperty.txt`, if it's there), plus
+Extended_Pictographic from `emoji-data.txt` in the same directory.
+
+* The "WB" (and if loaded, "ExtPict") properties of a loaded
+`UnicodeDBAccess`, via `WordSegmenter.fromUcd(udb)`.
+
+* A rough guess from Python's `unicodedata`.
+
+For streams, `iterStreamBoundaries()` reads a chunk at a time and only
+processes text up to the last newline in hand (there is always a boundary
+at a line end, and no rule looks across one), so memory use doesn't depend
+on the size of the input.
+
+As a command, writes the words of the input one per line (or with
+`--offsets`, all the boundary offsets; or with `--count`, the number of
+words in each file, like `wc -w`):
+
+    wordBreak.py --count *.txt
+
+
+=Related Commands=
+
+`graphemeClusters.py`, `lineBreak.py`, `UnicodeDBAccess.py`,
+`UnicodeLists/sentenceBoundary.py`, `changeCase`, `countByCase`.
+
+
+=Known bugs and Limitations=
+
+Like UAX #29 itself (without a dictionary), this doesn't find words
+within Thai, Lao, Khmer, or Myanmar text, and makes each ideograph and
+Hiragana character a separate segment.
+
+Extended_Pictographic is only noticed (for WB3c) on characters whose
+Word_Break is Other.
+
+
+=History=
+
+* 2026-10-17: Written by Steven J. DeRose.
+
+
+=Rights=
+
+Copyright 2026-10-17 by Steven J. DeRose. This work is licensed under a
+Creative Commons Attribution-Share-alike 3.0 unported license.
+See [http://creativecommons.org/licenses/by-sa/3.0/] for more information.
+
+For the most recent version, see [http://www.derose.net/steve/utilities]
+or [https://github.com/sderose].
+
+
+=Options=
+"""
+
+verbose = 0
+def log(lvl:int, msg:str) -> None:
+    if (verbose >= lvl): sys.stderr.write(msg+"\n")
+
+DEFAULT_WB_PATH = os.path.expanduser("~/.strfchr/ucd/WordBreakProperty.txt")
+
+# Short WB values as in the UCD XML (note that "EX" is ExtendNumLet, and
+# "Extend" is Extend); EP is added here for Extended_Pictographic.
+CLASSES = [ "XX", "CR", "LF", "NL", "Extend", "FO", "ZWJ", "WSegSpace",
+    "LE", "HL", "KA", "NU", "MB", "ML", "MN", "SQ", "DQ", "EX", "RI", "EP" ]
+CLASS_CODES = { cls: i for i, cls in enumerate(CLASSES) }
+NCLASSES = len(CLASSES)
+(XX, CR, LF, NL, EXTEND, FO, ZWJ, WSEGSPACE,
+    LE, HL, KA, NU, MB, ML, MN, SQ, DQ, EX, RI, EP) = range(NCLASSES)
+
+# Long names (as in WordBreakProperty.txt), and pre-Unicode-11 values.
+LONG_CLASSES = {
+    "Other": "XX", "Newline": "NL", "Format": "FO", "ALetter": "LE",
+    "Hebrew_Letter": "HL", "Katakana": "KA", "Numeric": "NU",
+    "MidNumLet": "MB", "MidLetter": "ML", "MidNum": "MN",
+    "Single_Quote": "SQ", "Double_Quote": "DQ", "ExtendNumLet": "EX",
+    "Regional_Indicator": "RI", "E_Base": "EP", "E_Base_GAZ": "EP",
+    "Glue_After_Zwj": "EP", "E_Modifier": "Extend",
+    "EB": "EP", "EBG": "EP", "GAZ": "EP", "EM": "Extend",
+}
+
+AHLETTER = ( LE, HL )
+WORD_CLASSES = ( LE, HL, KA, NU, EX )
+
+BREAK, JOIN, DEFER = range(3)
+
+def pairAction(a:int, b:int) -> int:
+    """Say whether there's a boundary between significant (not Extend,
+    Format, or ZWJ) characters of classes a and b: BREAK, JOIN, or DEFER
+    (it depends on what comes next).
+    """
+    if (a in AHLETTER and b in AHLETTER): return JOIN             # WB5
+    if (a == HL and b == SQ): return JOIN                         # WB7a
+    if (a in AHLETTER and b in (ML, MB, SQ)): return DEFER        # WB6
+    if (a == HL and b == DQ): return DEFER                        # WB7b
+    if (a == NU and b == NU): return JOIN                         # WB8
+    if (a in AHLETTER and b == NU): return JOIN                   # WB9
+    if (a == NU and b in AHLETTER): return JOIN                   # WB10
+    if (a == NU and b in (MN, MB, SQ)): return DEFER              # WB12
+    if (a == KA and b == KA): return JOIN                         # WB13
+    if (a in WORD_CLASSES and b == EX): return JOIN               # WB13a
+    if (a == EX and b in WORD_CLASSES): return JOIN               # WB13b
+    return BREAK                                                  # WB999
+
+def tripleJoins(a:int, mid:int, b:int) -> bool:
+    """Whether a deferred boundary on each side of `mid` is off (WB6/7,
+    WB7b/c, WB11/12).
+    """
+    if (a in AHLETTER and mid in (ML, MB, SQ) and b in AHLETTER): return True
+    if (a == HL and mid == DQ and b == HL): return True
+    if (a == NU and mid in (MN, MB, SQ) and b == NU): return True
+    return False
+
+def makePairTable() -> bytes:
+    return bytes(pairAction(a, b)
+        for a in range(NCLASSES) for b in range(NCLASSES))
+
+def makeTripleTable() -> bytes:
+    return bytes(tripleJoins(a, mid, b) for a in range(NCLASSES)
+        for mid in range(NCLASSES) for b in range(NCLASSES))
+
+def makeRunExpr() -> re.Pattern:
+    """Make a regex over class-code strings that matches a run of one class
+    that has no boundaries inside (and after which the state is the same as
+    after its first character), or else any one code.
+    """
+    quiet = bytes([ LE, HL, KA, NU, EX, WSEGSPACE ])
+    return re.compile(b"([%s])\\1*|." % (re.escape(quiet)), re.DOTALL)
+
+ROUGH_CLASSES = {
+    0x000D: "CR", 0x000A: "LF", 0x000B: "NL", 0x000C: "NL", 0x0085: "NL",
+    0x2028: "NL", 0x2029: "NL", 0x200C: "Extend", 0x200D: "ZWJ",
+    0x0022: "DQ", 0x0027: "SQ", 0x00A0: "XX", 0x2007: "XX", 0x202F: "EX",
+    0x003A: "ML", 0x00B7: "ML", 0x0387: "ML", 0x05F4: "ML", 0x2027: "ML",
+    0xFE13: "ML", 0xFE55: "ML", 0xFF1A: "ML",
+    0x002E: "MB", 0x2018: "MB", 0x2019: "MB", 0x2024: "MB", 0xFE52: "MB",
+    0xFF07: "MB", 0xFF0E: "MB",
+    0x002C: "MN", 0x003B: "MN", 0x037E: "MN", 0x0589: "MN", 0x060C: "MN",
+    0x060D: "MN", 0x066C: "MN", 0x07F8: "MN", 0x2044: "MN", 0xFE10: "MN",
+    0xFE14: "MN", 0xFE50: "MN", 0xFE54: "MN", 0xFF0C: "MN", 0xFF1B: "MN",
+}
+
+ROUGH_RANGES = [
+    (0x05D0, 0x05F2, "HL"), (0xFB1D, 0xFB4F, "HL"),
+    (0x3031, 0x3035, "KA"), (0x309B, 0x309C, "KA"), (0x30A0, 0x30FF, "KA"),
+    (0x31F0, 0x31FF, "KA"), (0x32D0, 0x32FE, "KA"), (0x3300, 0x3357, "KA"),
+    (0xFF66, 0xFF9D, "KA"),
+    (0x0E00, 0x0EFF, "XX"), (0x1000, 0x109F, "XX"), (0x1780, 0x17FF, "XX"),
+    (0x3040, 0x309F, "XX"),
+]
+
+ROUGH_CATEGORY_CLASSES = {
+    "Mn": "Extend", "Me": "Extend", "Mc": "Extend", "Cf": "FO",
+    "Nd": "NU", "Pc": "EX", "Zs": "WSegSpace",
+    "Lu": "LE", "Ll": "LE", "Lt": "LE", "Lm": "LE", "Lo": "LE", "Nl": "LE",
+}
+
+def roughWordBreakClass(cp:int) -> str:
+    """Guess a character's word-break class from unicodedata.
+    """
+    if (cp in ROUGH_CLASSES): return ROUGH_CLASSES[cp]
+    gcb = roughGraphemeClass(cp)
+    if (gcb == "RI" or gcb == "EP"): return gcb
+    if (gcb == "EX"): return "Extend"
+    for first, last, cls in ROUGH_RANGES:
+        if (first <= cp <= last):
+            if (cls == "HL" and not chr(cp).isalpha()): break
+            return cls
+    c = chr(cp)
+    cat = unicodedata.category(c)
+    cls = ROUGH_CATEGORY_CLASSES.get(cat, "XX")
+    if (cls == "LE" and cat == "Lo" and unicodedata.east_asian_width(c) == "W"
+        and not (0xAC00 <= cp <= 0xD7A3 or 0x1100 <= cp <= 0x11FF
+        or 0x3130 <= cp <= 0x318F)):
+        return "XX"  # Ideographs (but not Hangul)
+    return cls
+
+
+###############################################################################
+#
+class ClassTable(dict):
+    """A str.translate() table mapping each character to a one-character
+    string whose code is its word-break class code, worked out the first
+    time translate() asks.
+    """
+    def __init__(self, ws:"WordSegmenter"):
+        super().__init__()
+        self.ws = ws
+
+    def __missing__(self, cp:int) -> str:
+        val = self[cp] = chr(self.ws.classCodeFor(cp))
+        return val
+
+class WordSegmenter:
+    def __init__(self, wbPath:str=None, wbTable:TwoStageTable=None,
+        extPictTable:TwoStageTable=None):
+        """Set up to find boundaries. The classes come from `wbTable` (a
+        TwoStageTable of "WB" values) if given, else from `wbPath` (or
+        DEFAULT_WB_PATH if it's there), a copy of WordBreakProperty.txt
+        (and emoji-data.txt next to it); else they're guessed.
+        """
+        if (wbTable is None):
+            if (wbPath is None and os.path.isfile(DEFAULT_WB_PATH)):
+                wbPath = DEFAULT_WB_PATH
+            if (wbPath):
+                wbTable = GraphemeSegmenter.readPropertyFile(wbPath)
+                if (extPictTable is None):
+                    extPictTable = GraphemeSegmenter.readPropertyFile(
+                        os.path.join(os.path.dirname(wbPath), "emoji-data.txt"),
+                        "Extended_Pictographic")
+        self.wbTable = wbTable
+        self.extPictTable = extPictTable
+        self.pairs = makePairTable()
+        self.triples = makeTripleTable()
+        self.runExpr = makeRunExpr()
+        self.classTable = ClassTable(self)
+
+    @staticmethod
+    def fromUcd(udb) -> "WordSegmenter":
+        """Use the "WB" (and if loaded, "ExtPict") property of a loaded
+        UnicodeDBAccess.
+        """
+        columns = udb.charEntries.columns
+        return WordSegmenter(wbTable=udb.compileTable("WB"),
+            extPictTable=udb.compileTable("ExtPict") if "ExtPict" in columns else None)
+
+    def classFor(self, cp:int) -> str:
+        """Return the word-break class of a character (one of CLASSES).
+        """
+        if (self.wbTable is None): return roughWordBreakClass(cp)
+        cls = self.wbTable.lookup(cp) or "XX"
+        cls = LONG_CLASSES.get(cls, cls)
+        if (cls == "XX" and self.extPictTable is not None
+            and self.extPictTable.lookup(cp) in ("Y", True)):
+            return "EP"
+        return cls
+
+    def classCodeFor(self, cp:int) -> int:
+        return CLASS_CODES.get(self.classFor(cp), XX)
+
+    def classCodes(self, s:str) -> bytes:
+        return s.translate(self.classTable).encode("latin-1")
+
+    def iterCodeBoundaries(self, codes:bytes) -> Iterator[int]:
+        """Generate the boundary offsets (after the start) for a byte string
+        of class codes, ending with its length.
+        """
+        n = len(codes)
+        if (n == 0): return
+        pairs = self.pairs
+        triples = self.triples
+        cur = codes[0]
+        prevChar = prev = cur   # Previous character, and previous significant one
+        prev2 = XX              # Significant character before `prev`
+        pending = -1            # Offset of a deferred boundary
+        nRI = 1 if cur == RI else 0
+        for mat in self.runExpr.finditer(codes, 1):
+            i = mat.start()
+            cur = codes[i]
+            if (prevChar == CR and cur == LF):                  # WB3
+                prevChar = prev = cur
+                continue
+            if (prevChar in (CR, LF, NL) or cur in (CR, LF, NL)):   # WB3a, WB3b
+                if (pending >= 0):
+                    yield pending
+                    pending = -1
+                yield i
+                prevChar = prev = cur
+                prev2 = XX
+                nRI = 1 if cur == RI else 0
+                continue
+            if (cur == WSEGSPACE and prevChar == WSEGSPACE):    # WB3d
+                continue
+            if (cur in (EXTEND, FO, ZWJ)):                      # WB4
+                prevChar = cur
+                continue
+            joined = triples[(prev2 * NCLASSES + prev) * NCLASSES + cur]
+            if (pending >= 0):
+                if (not joined): yield pending
+                pending = -1
+            if (joined):
+                pass
+            elif (cur == EP and prevChar == ZWJ):               # WB3c
+                pass
+            elif (cur == RI and prev == RI and nRI % 2 == 1):   # WB15, WB16
+                pass
+            else:
+                action = pairs[prev * NCLASSES + cur]
+                if (action == DEFER): pending = i
+                elif (action == BREAK): yield i
+            nRI = nRI + 1 if cur == RI else 0
+            prev2 = prev
+            prevChar = prev = cur
+        if (pending >= 0): yield pending
+        yield n
+
+    def iterBoundaries(self, s:str) -> Iterator[int]:
+        """Generate the offset where each segment ends, so ending with len(s).
+        """
+        return self.iterCodeBoundaries(self.classCodes(s))
+
+    def boundaries(self, s:str) -> List[int]:
+        return list(self.iterBoundaries(s))
+
+    def iterSegments(self, s:str) -> Iterator[Tuple[int, int]]:
+        """Generate (start, end) for every segment (words, and the spaces
+        and punctuation between them).
+        """
+        start = 0
+        for end in self.iterBoundaries(s):
+            yield start, end
+            start = end
+
+    def iterWords(self, s:str) -> Iterator[Tuple[int, int]]:
+        """Generate (start, end) for just the segments that start with a
+        letter, digit, or connector like "_" (including ideographs).
+        """
+        codes = self.classCodes(s)
+        start = 0
+        for end in self.iterCodeBoundaries(codes):
+            if (codes[start] in WORD_CLASSES or s[start].isalnum()):
+                yield start, end
+            start = end
+
+    def countWords(self, s:str) -> int:
+        n = 0
+        for _start, _end in self.iterWords(s): n += 1
+        return n
+
+    def iterStreamBoundaries(self, ifh:IO, chunkSize:int=1<<16) -> Iterator[int]:
+        """Like iterBoundaries(), but over a text stream, with offsets from
+        the start of the stream. Text is processed up to the last newline
+        read so far, since no rule looks across a line end.
+        """
+        base = 0
+        pending = ""
+        while (True):
+            chunk = ifh.read(chunkSize)
+            if (chunk):
+                pending += chunk
+                cut = pending.rfind("\n") + 1
+                if (cut == 0): continue
+            else:
+                cut = len(pending)
+            if (cut):
+                for offset in self.iterBoundaries(pending[:cut]):
+                    yield base + offset
+                base += cut
+                pending = pending[cut:]
+            if (not chunk): break
+
+    def getStats(self) -> Dict:
+        return { "charsSeen": len(self.classTable) }
+
+
+###############################################################################
+# Main
+#
+if __name__ == "__main__":
+    import argparse
+
+    def processOptions() -> argparse.Namespace:
+        try:
+            from BlockFormatter import BlockFormatter
+            parser = argparse.ArgumentParser(
+                description=descr, formatter_class=BlockFormatter)
+        except ImportError:
+            parser = argparse.ArgumentParser(description=descr)
+
+        parser.add_argument(
+            "--count", action="store_true",
+            help="Just show the number of words in each file.")
+        parser.add_argument(
+            "--iencoding", type=str, metavar="E", default="utf-8",
+            help="Assume this character coding for input. Default: utf-8.")
+        parser.add_argument(
+            "--offsets", action="store_true",
+            help="List all the boundary offsets (characters from the start "
+            "of the input).")
+        parser.add_argument(
+            "--quiet", "-q", action="store_true",
+            help="Suppress most messages.")
+        parser.add_argument(
+            "--verbose", "-v", action="count", default=0,
+            help="Add more messages (repeatable).")
+        parser.add_argument(
+            "--version", action="version", version=__version__,
+            help="Display version information, then exit.")
+        parser.add_argument(
+            "--wbFile", type=str, metavar="PATH", default=None,
+            help="Get word-break classes from this WordBreakProperty.txt. "
+            "Default: %s if it's there, else a rough guess." % (DEFAULT_WB_PATH))
+
+        parser.add_argument(
+            "files", type=str, nargs=argparse.REMAINDER,
+            help="Path(s) to input file(s)")
+
+        args0 = parser.parse_args()
+        if (lg and args0.verbose):
+            logging.basicConfig(level=logging.INFO - args0.verbose)
+        return(args0)
+
+    def doOneFile(path:str, fh) -> int:
+        if (args.offsets):
+            for offset0 in ws0.iterStreamBoundaries(fh): print(offset0)
+            return 0
+        nWords = 0
+        for rec in fh:
+            if (args.count):
+                nWords += ws0.countWords(rec)
+                continue
+            for start, end in ws0.iterWords(rec):
+                print(rec[start:end])
+        if (args.count): print("%d\t%s" % (nWords, path))
+        return nWords
+
+    args = processOptions()
+    verbose = args.verbose
+
+    ws0 = WordSegmenter(wbPath=args.wbFile)
+    if (not args.files):
+        doOneFile("[stdin]", codecs.getreader(args.iencoding)(sys.stdin.buffer))
+    for path0 in args.files:
+        with codecs.open(path0, "rb", encoding=args.iencoding) as fh0:
+            doOneFile(path0, fh0)